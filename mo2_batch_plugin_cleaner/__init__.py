@@ -5,8 +5,8 @@
 
 import mobase  # type: ignore
 
-from mo2_batch_plugin_cleaner import plugin
+from mo2_batch_plugin_cleaner import tool
 
 
 def createPlugin() -> mobase.IPluginTool:
-    return plugin.CleanerPlugin()
\ No newline at end of file
+    return tool.CleanerPlugin()
\ No newline at end of file
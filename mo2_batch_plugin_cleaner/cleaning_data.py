@@ -4,23 +4,26 @@
 # https://github.com/tkoopman/MO2-Batch-Plugin-Cleaner
 
 import binascii
-import csv
+import codecs
 import enum
+import hashlib
+import json
 import logging
+import mmap
 import re
 import os
 import site
 import traceback
 
-site.addsitedir(os.path.join(os.path.dirname(__file__), "lib"))
-
-from yaml import Dumper
-
-
 from pathlib import Path
-from typing import Any, Callable
+from typing import IO, TYPE_CHECKING, Any, Callable
+
+# PyYAML is bundled in lib/. Only the path is added here, it is imported the
+# first time LOOT data is read.
+site.addsitedir(os.path.join(os.path.dirname(__file__), "lib"))
 
-import yaml
+if TYPE_CHECKING:
+    from yaml import Dumper
 
 
 def convert_to_int(value: Any, default: int = 0) -> int:
@@ -43,24 +46,23 @@ class crc32:
 
     @staticmethod
     def from_file(filename: str | Path, chunk_size: int = 16384) -> "crc32":
-        if isinstance(filename, str):
-            filename = Path(filename)
-        if not filename.is_file():
-            return crc32(0)
-
+        # No is_file() first, callers usually know the file is there and
+        # open() fails just as well if it is not.
         try:
             with open(filename, "rb") as file:
                 crc = 0
                 while chunk := file.read(chunk_size):
                     crc = binascii.crc32(chunk, crc)
                 return crc32(crc & 0xFFFFFFFF)
+        except (FileNotFoundError, IsADirectoryError):
+            return crc32(0)
         except Exception as e:
             logging.error(f'Error calculating CRC of "{filename}"')
             logging.error(traceback.format_exception(e))
             return crc32(0)
 
     @staticmethod
-    def crc32_presenter(dumper: Dumper, data: "crc32"):
+    def crc32_presenter(dumper: "Dumper", data: "crc32"):
         return dumper.represent_int(str(data))  # type: ignore
 
     def __str__(self) -> str:
@@ -191,6 +193,8 @@ class CsvData:
             logging.debug(f'File "{filename}" not found.')
             return crc_data
 
+        import csv
+
         try:
             with open(filename, "r", encoding='utf-8') as csvFile:
                 reader = csv.DictReader(csvFile)
@@ -218,6 +222,8 @@ class CsvData:
         filename: str | Path,
         only_source: source | None = source.USER,
     ) -> None:
+        import csv
+
         try:
             with open(filename, "w", newline="", encoding='utf-8') as csvFile:
                 writer = csv.DictWriter(
@@ -254,6 +260,26 @@ prelude:
 plugins:
 """
 
+    @staticmethod
+    def load_yaml(stream: Any) -> Any:
+        import yaml
+
+        # Another plugin may have imported a PyYAML without the markless loader.
+        loader = getattr(yaml.loader, "MarklessBaseLoader", None)
+        if loader is None:
+            return yaml.load(stream, Loader=yaml.loader.BaseLoader)
+
+        try:
+            return yaml.load(stream, Loader=loader)
+        except yaml.YAMLError:
+            pass
+
+        # Marks are only needed to report where the YAML is broken, so parse
+        # it again with them to get a useful error.
+        if hasattr(stream, "seek"):
+            stream.seek(0)
+        return yaml.load(stream, Loader=yaml.loader.BaseLoader)
+
     @staticmethod
     def __from_raw(data: Any, source: source) -> crc_cleaning_data | None:
         if not isinstance(data, dict) or "plugins" not in data:
@@ -267,93 +293,538 @@ plugins:
 
         crc_data = crc_cleaning_data()
         for plugin in data:  # type: ignore
-            if isinstance(plugin, dict):
-                name = plugin["name"] if "name" in plugin else None  # type: ignore
-                if isinstance(name, str):
-                    for state in ["dirty", "clean"]:
-                        if state in plugin:
-                            raw_data = plugin[state]  # type: ignore
-                            if isinstance(raw_data, list):
-                                for e in raw_data:  # type: ignore
-                                    if isinstance(e, dict):
-                                        cd = cleaning_data.from_dict(e, source)
-                                        crc = e["crc"] if "crc" in e else None  # type: ignore
-                                        if cd and isinstance(crc, str):
-                                            name = name.casefold()
-                                            if name not in crc_data:
-                                                crc_data[name] = {}
-                                            crc_data[name][crc32(crc)] = cd
+            for name, crc, cd in LootData.plugin_entries(plugin, source):
+                if name not in crc_data:
+                    crc_data[name] = {}
+                crc_data[name][crc] = cd
+        return crc_data
+
+    @staticmethod
+    def plugin_entries(
+        plugin: Any, source: source
+    ) -> list[tuple[str, crc32, cleaning_data]]:
+        """
+        Returns the casefolded name, CRC and cleaning data of every dirty and
+        clean entry of a single plugin from the LOOT data.
+        """
+        entries = list[tuple[str, crc32, cleaning_data]]()
+        if isinstance(plugin, dict):
+            name = plugin["name"] if "name" in plugin else None  # type: ignore
+            if isinstance(name, str):
+                name = name.casefold()
+                for state in ["dirty", "clean"]:
+                    if state in plugin:
+                        raw_data = plugin[state]  # type: ignore
+                        if isinstance(raw_data, list):
+                            for e in raw_data:  # type: ignore
+                                if isinstance(e, dict):
+                                    cd = cleaning_data.from_dict(e, source)
+                                    crc = e["crc"] if "crc" in e else None  # type: ignore
+                                    if cd and isinstance(crc, str):
+                                        entries.append((name, crc32(crc), cd))
+        return entries
+
+    LOG_HEADER = "LOOT Masterlist Entries"
+
+    @staticmethod
+    def detect_encoding(head: bytes, sample: bytes, sample_pos: int) -> str:
+        """
+        Detects the encoding of an xEdit log from the first bytes of the file
+        and a sample of it read from sample_pos.
+
+        A BOM decides it. Otherwise UTF-16 is recognised by the NUL bytes
+        every ASCII character has, and their position gives the byte order.
+        Anything else is returned as utf-8 and may still turn out to be the
+        ANSI code page when decoded.
+        """
+        if head.startswith(codecs.BOM_UTF8):
+            return "utf-8"
+        if head.startswith(codecs.BOM_UTF16_LE):
+            return "utf-16-le"
+        if head.startswith(codecs.BOM_UTF16_BE):
+            return "utf-16-be"
+
+        # Count the NULs at even and odd file offsets.
+        start = sample_pos % 2
+        even = sample[start::2].count(0)
+        odd = sample[1 - start :: 2].count(0)
+        if even + odd > len(sample) // 4:
+            # ASCII in UTF-16 LE is the character followed by a NUL.
+            return "utf-16-le" if odd > even else "utf-16-be"
+        return "utf-8"
+
+    @staticmethod
+    def __rfind_marker(window: bytes, pos: int, marker: bytes, encoding: str) -> int:
+        found = window.rfind(marker)
+        if encoding != "utf-8":
+            # UTF-16 characters start at even offsets, anything else is the
+            # end of one character and the start of the next.
+            while found >= 0 and (pos + found) % 2:
+                found = window.rfind(marker, 0, found + len(marker) - 1)
+        return found
+
+    @staticmethod
+    def read_log_tail(
+        logFile: Path | IO[bytes], chunk_size: int = 65536
+    ) -> tuple[bytes, str] | None:
+        """
+        Reads the xEdit log backwards from the end, a chunk at a time, until the
+        last LOOT Masterlist Entries header is found. The log can also be a
+        seekable binary stream.
+
+        Returns the bytes from the header to the end of the file and the
+        encoding detected from the start of the file and the last chunk, or
+        None if the log has no header.
+        """
+        if isinstance(logFile, Path):
+            with open(logFile, "rb") as file:
+                return LootData.read_log_tail(file, chunk_size)
+
+        file = logFile
+        file.seek(0)
+        head = file.read(len(codecs.BOM_UTF8))
+        end = pos = file.seek(0, os.SEEK_END)
+        encoding = marker = None
+        overlap = b""
+        while pos > 0:
+            size = min(chunk_size, pos)
+            pos -= size
+            file.seek(pos)
+            chunk = file.read(size)
+            if encoding is None or marker is None:
+                encoding = LootData.detect_encoding(head, chunk, pos)
+                marker = LootData.LOG_HEADER.encode(encoding)
+            # Include the start of the chunks after this one so a header
+            # split between them is still found.
+            window = chunk + overlap
+            found = LootData.__rfind_marker(window, pos, marker, encoding)
+            if found >= 0:
+                if pos + size == end:
+                    return chunk[found:], encoding
+                file.seek(pos + found)
+                return file.read(), encoding
+            overlap = window[: len(marker) - 1]
+        return None
+
+    # A line of the LOOT Masterlist Entries xEdit writes: indent, whether it
+    # starts a list item, key and value.
+    XEDIT_LINE = re.compile(r"( *)(- )?(<<|\w+):(?: +(.*?))? *")
+    XEDIT_CRC = re.compile(r"0x[0-9A-Fa-f]{1,8}")
+
+    @staticmethod
+    def __xEdit_scalar(value: str | None) -> str | None:
+        if not value:
+            return None
+        if value[0] == "'":
+            inner = value[1:-1]
+            if len(value) < 2 or value[-1] != "'" or "'" in inner.replace("''", ""):
+                return None
+            return inner.replace("''", "'")
+        # Anything YAML would read as more than a plain string.
+        if value[0] in "\"&*!|>%@`{[#" or " #" in value or ": " in value:
+            return None
+        return value
+
+    @staticmethod
+    def parse_xEdit_entries(
+        entries: str, source: source
+    ) -> crc_cleaning_data | None:
+        """
+        Parses the LOOT Masterlist Entries block of an xEdit log without the
+        YAML loader.
+
+        Only the fixed layout xEdit writes is understood, returns None for
+        anything else so the caller can fall back to the YAML loader.
+        """
+        items = list[tuple[str, dict[str, str]]]()
+        name: str | None = None
+        state: str | None = None
+        entry: dict[str, str] | None = None
+
+        for line in entries.splitlines():
+            if not line.strip():
+                continue
+            match = LootData.XEDIT_LINE.fullmatch(line)
+            if not match:
+                return None
+            indent = len(match[1])
+            item = match[2] is not None
+            key: str = match[3]
+            value: str | None = match[4]
+
+            if indent == 2 and item and key == "name":
+                name = LootData.__xEdit_scalar(value)
+                if name is None:
+                    return None
+                state = entry = None
+            elif indent == 4 and not item and key in ["dirty", "clean"]:
+                if name is None or value is not None:
+                    return None
+                state = key
+                entry = None
+            elif state and (
+                (indent == 6 and item) or (indent == 8 and not item and entry is not None)
+            ):
+                if item:
+                    entry = {}
+                    items.append((name, entry))  # type: ignore
+                if key == "<<":
+                    # The prelude's quickClean and reqManualFix add nothing.
+                    if not value or value[0] != "*":
+                        return None
+                else:
+                    scalar = LootData.__xEdit_scalar(value)
+                    if scalar is None:
+                        return None
+                    entry[key] = scalar  # type: ignore
+            else:
+                return None
+
+        crc_data = crc_cleaning_data()
+        for name, e in items:
+            crc = e["crc"] if "crc" in e else None
+            if crc is None:
+                continue
+            if not LootData.XEDIT_CRC.fullmatch(crc):
+                return None
+            cd = cleaning_data.from_dict(e, source)
+            if cd:
+                if name not in crc_data:
+                    crc_data[name] = {}
+                crc_data[name][crc32(crc)] = cd
         return crc_data
 
     @staticmethod
-    def from_xEdit_log(logFile: str | Path) -> crc_cleaning_data | None:
+    def decode_log_tail(raw_data: bytes, encoding: str) -> tuple[str, str]:
+        """
+        Decodes what read_log_tail returned. Returns the text and the
+        encoding the log was written in.
+        """
+        try:
+            return raw_data.decode(encoding), encoding
+        except UnicodeDecodeError:
+            # Not valid UTF-8, so the log was written in the ANSI code page.
+            if encoding == "utf-8":
+                encoding = "cp1252"
+            return raw_data.decode(encoding, errors="replace"), encoding
+
+    @staticmethod
+    def xEdit_entries(logFile: str | Path | IO[bytes]) -> str | None:
+        """
+        Returns the LOOT Masterlist Entries block at the end of an xEdit log,
+        the last one if it has more than one.
+        """
         if isinstance(logFile, str):
             logFile = Path(logFile)
 
-        if logFile.is_file():
-            # 根据文件名确定编码方式
-            filename_lower = str(logFile).lower()
-            text = None
-            
-            # 定义要尝试的编码列表
-            if "exception" in filename_lower:
-                # SSEEditException 和 SSEEditQuickAutoCleanException 优先尝试 UTF-16 BOM 编码
-                encodings_to_try = ['utf-16', 'utf-16-le', 'utf-8', 'cp1252', 'latin1']
-            else:
-                # SSEEdit_log 优先尝试 UTF-8 编码，然后是系统默认编码
-                encodings_to_try = ['utf-8', 'cp1252', 'latin1', 'utf-16', 'utf-16-le']
-            
-            # 尝试各种编码
-            for encoding in encodings_to_try:
-                try:
-                    with open(logFile, "r", encoding=encoding) as file:
-                        text = file.read()
-                        file.close()
-                    break  # 如果成功，跳出循环
-                except UnicodeDecodeError:
-                    continue  # 如果失败，尝试下一个编码
-                except Exception as e:
-                    logging.debug(f'Error reading file with encoding {encoding}: {e}')
-                    continue
-            
-            # 如果所有编码都失败了，尝试二进制模式读取并忽略错误
-            if text is None:
-                try:
-                    with open(logFile, "rb") as file:
-                        raw_data = file.read()
-                        file.close()
-                    # 尝试用 'replace' 错误处理方式解码
-                    text = raw_data.decode('utf-8', errors='replace')
-                except Exception as e:
-                    logging.error(f'Failed to read file in any encoding: {e}')
-            
-            if text:
-                lme = re.search(
-                    r"LOOT Masterlist Entries[\r\n]+((?:  .*[\r\n]+)+)",
-                    text,
-                    0,
-                )
-                if lme:
-                    extractedYaml = LootData.PRELUDE + lme.group(1)
-                    raw = yaml.load(extractedYaml, Loader=yaml.loader.BaseLoader)
-                    return LootData.__from_raw(raw, source.USER)
+        if isinstance(logFile, Path) and not logFile.is_file():
+            return None
+
+        # The LOOT Masterlist Entries block is at the end of the log, so
+        # only that part of the file is read.
+        tail = None
+        try:
+            tail = LootData.read_log_tail(logFile)
+        except Exception as e:
+            logging.error(f'Error reading "{logFile}"')
+            logging.error(traceback.format_exception(e))
+        if not tail:
+            return None
+
+        text, _ = LootData.decode_log_tail(*tail)
+        lme = re.match(r"LOOT Masterlist Entries[\r\n]+((?:  .*[\r\n]+)+)", text, 0)
+        return lme.group(1) if lme else None
+
+    @staticmethod
+    def yaml_entries(entries: str, source: source) -> crc_cleaning_data | None:
+        """
+        Parses the LOOT Masterlist Entries block of an xEdit log with the
+        YAML loader.
+        """
+        raw = LootData.load_yaml(LootData.PRELUDE + entries)
+        return LootData.__from_raw(raw, source)
+
+    @staticmethod
+    def from_xEdit_log(logFile: str | Path | IO[bytes]) -> crc_cleaning_data | None:
+        entries = LootData.xEdit_entries(logFile)
+        if entries is not None:
+            crc_data = LootData.parse_xEdit_entries(entries, source.USER)
+            if crc_data is not None:
+                return crc_data
+
+            # Not laid out the way xEdit writes it, so leave it to YAML.
+            return LootData.yaml_entries(entries, source.USER)
 
         logging.error(f'No LOOT cleaning data found in xEdit log file "{logFile}".')
         return None
 
     @staticmethod
-    def load(filename: str) -> "crc_cleaning_data | None":
+    def load(
+        filename: str, index: "MasterlistIndex | None" = None
+    ) -> "crc_cleaning_data | None":
         if not Path(filename).is_file():
             logging.debug(f'File "{filename}" not found.')
             return None
 
+        if index:
+            try:
+                signature = index.signature
+                if index.update() is not None:
+                    if index.signature != signature:
+                        index.save()
+                    return index.data()
+            except Exception as e:
+                logging.error(f'Error updating the index of "{filename}"')
+                logging.error(traceback.format_exception(e))
+
         try:
-            with open(filename, "r", encoding='utf-8') as file:
-                text = file.read()
-                file.close()
-                raw = yaml.load(text, Loader=yaml.loader.BaseLoader)
+            # Let the YAML reader decode the mapped file lazily rather than
+            # holding the whole master list in memory as bytes and text.
+            with open(filename, "rb") as file, mmap.mmap(
+                file.fileno(), 0, access=mmap.ACCESS_READ
+            ) as data:
+                raw = LootData.load_yaml(data)
                 logging.debug(f'Read LOOT master list file "{filename}".')
                 return LootData.__from_raw(raw, source.LOOT)
         except Exception as e:
             logging.error(f'Error reading "{filename}"')
             logging.error(traceback.format_exception(e))
+
+
+class MasterlistIndex:
+    """
+    Cache of the cleaning data read from a LOOT masterlist, kept per
+    top-level plugin block together with a hash of the block's text.
+
+    When the masterlist changes only the blocks whose hash is new are parsed
+    again, and the names affected by the change are reported so callers can
+    update just those plugins.
+    """
+
+    VERSION = 1
+
+    PLUGINS_KEY = re.compile(rb"^plugins:[ \t]*(?:#[^\n]*)?\r?$", re.M)
+    FIRST_ENTRY = re.compile(rb"^( *)-(?=[ \r\n])", re.M)
+    TOP_LEVEL_KEY = re.compile(rb"^[^\s#-]", re.M)
+    # An anchor defined in a plugin block may be used by other blocks, so
+    # such blocks can not be parsed on their own.
+    ANCHOR = re.compile(rb"(?:^|[ \[{,])&[^\s,\[\]{}]+")
+
+    def __init__(self, filename: str | Path, masterlist: str | Path) -> None:
+        self.filename = Path(filename)
+        self.masterlist = Path(masterlist)
+        self.signature: list[int] | None = None
+        self.header: str | None = None
+        # (hash, defines an anchor, [(name, crc, cleaning data)]) in file order
+        self.blocks = list[tuple[str, bool, list[tuple[str, crc32, cleaning_data]]]]()
+
+    @staticmethod
+    def load(filename: str | Path, masterlist: str | Path) -> "MasterlistIndex":
+        index = MasterlistIndex(filename, masterlist)
+        if not index.filename.is_file():
+            return index
+
+        try:
+            with open(index.filename, "r", encoding="utf-8") as file:
+                raw = json.load(file)
+            if raw["version"] == MasterlistIndex.VERSION:
+                index.signature = raw["signature"]
+                index.header = raw["header"]
+                index.blocks = [
+                    (
+                        block_hash,
+                        anchors,
+                        [
+                            (
+                                name,
+                                crc32(crc),
+                                cleaning_data(itm, udr, nav, source.LOOT),
+                            )
+                            for name, crc, itm, udr, nav in entries
+                        ],
+                    )
+                    for block_hash, anchors, entries in raw["blocks"]
+                ]
+        except Exception as e:
+            logging.error(f'Error reading "{index.filename}"')
+            logging.error(traceback.format_exception(e))
+            index = MasterlistIndex(filename, masterlist)
+
+        return index
+
+    def save(self) -> None:
+        raw = {
+            "version": MasterlistIndex.VERSION,
+            "signature": self.signature,
+            "header": self.header,
+            "blocks": [
+                [
+                    block_hash,
+                    anchors,
+                    [
+                        [name, str(crc), cd.itm, cd.udr, cd.nav]
+                        for name, crc, cd in entries
+                    ],
+                ]
+                for block_hash, anchors, entries in self.blocks
+            ],
+        }
+        try:
+            os.makedirs(self.filename.parent, exist_ok=True)
+            temp = self.filename.with_suffix(".tmp")
+            with open(temp, "w", encoding="utf-8") as file:
+                json.dump(raw, file, separators=(",", ":"))
+            os.replace(temp, self.filename)
+        except Exception as e:
+            logging.error(f'Error writing to "{self.filename}"')
+            logging.error(traceback.format_exception(e))
+
+    def data(self) -> crc_cleaning_data:
+        crc_data = crc_cleaning_data()
+        for _, _, entries in self.blocks:
+            for name, crc, cd in entries:
+                if name not in crc_data:
+                    crc_data[name] = {}
+                crc_data[name][crc] = cd
+        return crc_data
+
+    @staticmethod
+    def split(data: Any) -> tuple[int, list[tuple[int, int]], int] | None:
+        """
+        Finds the top-level plugin blocks of a masterlist. Returns where the
+        first block starts, the (start, end) of each block and where the
+        plugins section ends, or None if there is no block style plugins
+        list.
+        """
+        key = MasterlistIndex.PLUGINS_KEY.search(data)
+        if not key:
+            return None
+
+        first = MasterlistIndex.FIRST_ENTRY.search(data, key.end())
+        if not first:
+            return None
+
+        end = MasterlistIndex.TOP_LEVEL_KEY.search(data, key.end())
+        section_end = end.start() if end else len(data)
+        if first.start() >= section_end:
+            return None
+
+        entry = re.compile(rb"^" + first.group(0), re.M)
+        starts = [
+            match.start()
+            for match in entry.finditer(data, first.start(), section_end)
+        ]
+        return (
+            first.start(),
+            list(zip(starts, starts[1:] + [section_end])),
+            section_end,
+        )
+
+    def update(self) -> set[str] | None:
+        """
+        Brings the index up to date with the masterlist.
+
+        Returns the casefolded names of the plugins whose data may have
+        changed, or None if the masterlist could not be split into blocks.
+        """
+        stat = os.stat(self.masterlist)
+        signature = [stat.st_size, stat.st_mtime_ns]
+        if signature == self.signature:
+            return set()
+
+        with open(self.masterlist, "rb") as file, mmap.mmap(
+            file.fileno(), 0, access=mmap.ACCESS_READ
+        ) as data:
+            split = MasterlistIndex.split(data)
+            if not split:
+                return None
+
+            first, spans, section_end = split
+            header = data[:first]
+            header_hash = MasterlistIndex.hash(header + data[section_end:])
+            hashes = [MasterlistIndex.hash(data[start:end]) for start, end in spans]
+            anchors = [
+                bool(MasterlistIndex.ANCHOR.search(data, start, end))
+                for start, end in spans
+            ]
+
+            old = {block_hash: block for block_hash, *block in self.blocks}
+            new_hashes = set(hashes)
+            removed = [
+                block for block in self.blocks if block[0] not in new_hashes
+            ]
+            changed = [
+                i for i, block_hash in enumerate(hashes) if block_hash not in old
+            ]
+
+            items = None
+            if (
+                header_hash == self.header
+                and len(changed) < len(spans)
+                and not any(anchors[i] for i in changed)
+                and not any(block_anchors for _, block_anchors, _ in removed)
+            ):
+                text = header + b"".join(
+                    data[spans[i][0] : spans[i][1]] for i in changed
+                )
+                if not text.endswith(b"\n"):
+                    text += b"\n"
+                try:
+                    items = LootData.load_yaml(text)["plugins"]
+                except Exception:
+                    # Most likely an alias to an anchor in an unchanged block.
+                    items = None
+                if not isinstance(items, list) or len(items) != len(changed):
+                    items = None
+
+            if items is None:
+                changed = list(range(len(spans)))
+                raw = LootData.load_yaml(data)
+                if not isinstance(raw, dict) or "plugins" not in raw:
+                    return None
+                items = raw["plugins"]
+                if not isinstance(items, list) or len(items) != len(spans):
+                    return None
+
+        parsed = dict(zip(changed, items))
+        blocks = list[tuple[str, bool, list[tuple[str, crc32, cleaning_data]]]]()
+        affected = set[str]()
+        for i, block_hash in enumerate(hashes):
+            if i in parsed:
+                entries = LootData.plugin_entries(parsed[i], source.LOOT)
+                blocks.append((block_hash, anchors[i], entries))
+                affected.update(name for name, _, _ in entries)
+            else:
+                blocks.append((block_hash, *old[block_hash]))
+        for _, _, entries in removed:
+            affected.update(name for name, _, _ in entries)
+
+        self.signature = signature
+        self.header = header_hash
+        self.blocks = blocks
+        return affected
+
+    @staticmethod
+    def hash(data: bytes) -> str:
+        return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+    def apply(self, crc_data: crc_cleaning_data, names: set[str]) -> None:
+        """
+        Replaces the LOOT entries of the given plugins in crc_data, which
+        may also hold user data, with the ones from this index. User entries
+        are kept and take precedence, as they do when the data is loaded.
+        """
+        loot = self.data()
+        for name in names:
+            current = crc_data[name] if name in crc_data else {}
+            updated = {
+                crc: cd for crc, cd in current.items() if cd.source != source.LOOT
+            }
+            if name in loot:
+                for crc, cd in loot[name].items():
+                    if crc not in updated:
+                        updated[crc] = cd
+            if updated:
+                crc_data[name] = updated
+            elif name in crc_data:
+                del crc_data[name]
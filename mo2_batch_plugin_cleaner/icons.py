@@ -14,8 +14,20 @@ def icon(name: str) -> QIcon:
     """
     return QIcon(str(Path(__file__).parent / "icons" / name))
 
-CLEAN_STATE_UNKNOWN = icon("confused-face-svgrepo-com.svg")
-CLEAN_STATE_CLEAN = icon("emotion-happy-svgrepo-com.svg")
-CLEAN_STATE_DIRTY = icon("emotion-unhappy-svgrepo-com.svg")
-CLEAN_STATE_MANUAL = icon("disappointed-face-svgrepo-com.svg")
-DO_NOT_CLEAN = icon("no-entry-svgrepo-com.svg")
\ No newline at end of file
+_icon_files = {
+    "CLEAN_STATE_UNKNOWN": "confused-face-svgrepo-com.svg",
+    "CLEAN_STATE_CLEAN": "emotion-happy-svgrepo-com.svg",
+    "CLEAN_STATE_DIRTY": "emotion-unhappy-svgrepo-com.svg",
+    "CLEAN_STATE_MANUAL": "disappointed-face-svgrepo-com.svg",
+    "DO_NOT_CLEAN": "no-entry-svgrepo-com.svg",
+}
+
+def __getattr__(name: str) -> QIcon:
+    """
+    Loads the named icon the first time it is used.
+    """
+    if name not in _icon_files:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = icon(_icon_files[name])
+    globals()[name] = value
+    return value
\ No newline at end of file
@@ -1,5 +1,6 @@
 
-__all__ = ['BaseLoader', 'FullLoader', 'SafeLoader', 'Loader', 'UnsafeLoader']
+__all__ = ['BaseLoader', 'MarklessBaseLoader', 'FullLoader', 'SafeLoader',
+        'Loader', 'UnsafeLoader']
 
 from .reader import *
 from .scanner import *
@@ -18,6 +19,13 @@ class BaseLoader(Reader, Scanner, Parser, Composer, BaseConstructor, BaseResolve
         BaseConstructor.__init__(self)
         BaseResolver.__init__(self)
 
+# MarklessBaseLoader is BaseLoader without Mark objects. It saves an
+# allocation per mark on large documents, but errors do not say where the
+# problem is; load the same input with BaseLoader to get that.
+class MarklessBaseLoader(BaseLoader):
+
+    create_marks = False
+
 class FullLoader(Reader, Scanner, Parser, Composer, FullConstructor, Resolver):
 
     def __init__(self, stream):
@@ -1,5 +1,6 @@
 
 class Node(object):
+    __slots__ = ('tag', 'value', 'start_mark', 'end_mark')
     def __init__(self, tag, value, start_mark, end_mark):
         self.tag = tag
         self.value = value
@@ -24,6 +25,7 @@ class Node(object):
 
 class ScalarNode(Node):
     id = 'scalar'
+    __slots__ = ('style',)
     def __init__(self, tag, value,
             start_mark=None, end_mark=None, style=None):
         self.tag = tag
@@ -33,6 +35,7 @@ class ScalarNode(Node):
         self.style = style
 
 class CollectionNode(Node):
+    __slots__ = ('flow_style',)
     def __init__(self, tag, value,
             start_mark=None, end_mark=None, flow_style=None):
         self.tag = tag
@@ -43,7 +46,9 @@ class CollectionNode(Node):
 
 class SequenceNode(CollectionNode):
     id = 'sequence'
+    __slots__ = ()
 
 class MappingNode(CollectionNode):
     id = 'mapping'
+    __slots__ = ()
 
@@ -19,7 +19,7 @@ __all__ = ['Reader', 'ReaderError']
 
 from .error import YAMLError, Mark
 
-import codecs, re
+import codecs, mmap, re
 
 class ReaderError(YAMLError):
 
@@ -52,10 +52,17 @@ class Reader(object):
     #  - a `bytes` object,
     #  - a `str` object,
     #  - a file-like object with its `read` method returning `str`,
-    #  - a file-like object with its `read` method returning `unicode`.
+    #  - a file-like object with its `read` method returning `unicode`,
+    #  - a memory-mapped UTF-8 file (`mmap.mmap`), which is checked for
+    #    non-printable characters in one pass over the raw bytes and then
+    #    decoded lazily, a chunk at a time.
 
     # Yeah, it's ugly and slow.
 
+    # Marks are only used in error messages. Loaders that set this to False
+    # get None instead of a Mark for every token, event and node.
+    create_marks = True
+
     def __init__(self, stream):
         self.name = None
         self.stream = None
@@ -65,6 +72,8 @@ class Reader(object):
         self.pointer = 0
         self.raw_buffer = None
         self.raw_decode = None
+        self.raw_chunk_size = 4096
+        self.printable_checked = False
         self.encoding = None
         self.index = 0
         self.line = 0
@@ -77,6 +86,16 @@ class Reader(object):
             self.name = "<byte string>"
             self.raw_buffer = stream
             self.determine_encoding()
+        elif isinstance(stream, mmap.mmap):
+            self.stream = stream
+            self.name = "<memory-mapped file>"
+            self.eof = False
+            self.raw_buffer = b''
+            self.raw_decode = codecs.utf_8_decode
+            self.raw_chunk_size = 65536
+            self.encoding = 'utf-8'
+            self.check_printable_utf8(stream)
+            self.update(1)
         else:
             self.stream = stream
             self.name = getattr(stream, 'name', "<file>")
@@ -111,7 +130,25 @@ class Reader(object):
                 self.column += 1
             length -= 1
 
+    def match_run(self, pattern):
+        # Return the length of the run of characters matched by `pattern` at
+        # the current position, looking only at the already buffered text.
+        # Callers must finish the run character by character because the
+        # match stops at the end of the buffer.
+        return pattern.match(self.buffer, self.pointer).end()-self.pointer
+
+    def forward_run(self, length):
+        # A faster `forward` for buffered characters that are known to
+        # contain no line breaks.
+        if length:
+            run = self.buffer[self.pointer:self.pointer+length]
+            self.pointer += length
+            self.index += length
+            self.column += length-run.count('\uFEFF')
+
     def get_mark(self):
+        if not self.create_marks:
+            return None
         if self.stream is None:
             return Mark(self.name, self.index, self.line, self.column,
                     self.buffer, self.pointer)
@@ -143,6 +180,19 @@ class Reader(object):
             raise ReaderError(self.name, position, ord(character),
                     'unicode', "special characters are not allowed")
 
+    # The characters rejected by NON_PRINTABLE as they appear in valid UTF-8.
+    # Invalid UTF-8 is reported by the decoder later on.
+    NON_PRINTABLE_UTF8 = re.compile(b'[\x00-\x08\x0B\x0C\x0E-\x1F\x7F]'
+            b'|\xC2[\x80-\x84\x86-\x9F]|\xEF\xBF[\xBE\xBF]')
+    def check_printable_utf8(self, data):
+        match = self.NON_PRINTABLE_UTF8.search(data)
+        if match:
+            character = match.group().decode('utf-8')
+            position = len(codecs.utf_8_decode(data[:match.start()], 'replace')[0])
+            raise ReaderError(self.name, position, ord(character),
+                    'unicode', "special characters are not allowed")
+        self.printable_checked = True
+
     def update(self, length):
         if self.raw_buffer is None:
             return
@@ -150,7 +200,7 @@ class Reader(object):
         self.pointer = 0
         while len(self.buffer) < length:
             if not self.eof:
-                self.update_raw()
+                self.update_raw(self.raw_chunk_size)
             if self.raw_decode is not None:
                 try:
                     data, converted = self.raw_decode(self.raw_buffer,
@@ -166,7 +216,8 @@ class Reader(object):
             else:
                 data = self.raw_buffer
                 converted = len(data)
-            self.check_printable(data)
+            if not self.printable_checked:
+                self.check_printable(data)
             self.buffer += data
             self.raw_buffer = self.raw_buffer[converted:]
             if self.eof:
@@ -29,11 +29,14 @@ __all__ = ['Scanner', 'ScannerError']
 from .error import MarkedYAMLError
 from .tokens import *
 
+import re
+
 class ScannerError(MarkedYAMLError):
     pass
 
 class SimpleKey:
     # See below simple keys treatment.
+    __slots__ = ('token_number', 'required', 'index', 'line', 'column', 'mark')
 
     def __init__(self, token_number, required, index, line, column, mark):
         self.token_number = token_number
@@ -747,6 +750,26 @@ class Scanner:
                 or (self.peek(1) not in '\0 \t\r\n\x85\u2028\u2029'
                         and (ch == '-' or (not self.flow_level and ch in '?:')))
 
+    # Fast paths.
+    #
+    # The scanners below look at the input one character at a time through
+    # `peek` and `forward`. For the common runs of characters that cannot end
+    # a token we first match the whole run in the reader buffer with one of
+    # the patterns below, and then let the original loop finish the run. The
+    # patterns never cross a line break, so `forward_run` can be used to
+    # move past them.
+
+    SPACE_RUN = re.compile(' *')
+    BLANK_RUN = re.compile('[ \t]*')
+    LINE_RUN = re.compile('[^\x00\r\n\x85\u2028\u2029]*')
+    FLOW_NON_SPACE_RUN = re.compile('[^\'\"\\\\\x00 \t\r\n\x85\u2028\u2029]*')
+    # A ':' is only a part of a plain scalar if it is followed by a character
+    # that is already buffered and is not a terminator.
+    PLAIN_BLOCK_RUN = re.compile('(?:[^\x00 \t\r\n\x85\u2028\u2029:]'
+            '|:(?=[^\x00 \t\r\n\x85\u2028\u2029]))*')
+    PLAIN_FLOW_RUN = re.compile('(?:[^\x00 \t\r\n\x85\u2028\u2029:,?\\[\\]{}]'
+            '|:(?=[^\x00 \t\r\n\x85\u2028\u2029,\\[\\]{}]))*')
+
     # Scanners.
 
     def scan_to_next_token(self):
@@ -773,9 +796,11 @@ class Scanner:
             self.forward()
         found = False
         while not found:
+            self.forward_run(self.match_run(self.SPACE_RUN))
             while self.peek() == ' ':
                 self.forward()
             if self.peek() == '#':
+                self.forward_run(self.match_run(self.LINE_RUN))
                 while self.peek() not in '\0\r\n\x85\u2028\u2029':
                     self.forward()
             if self.scan_line_break():
@@ -1005,11 +1030,11 @@ class Scanner:
         while self.column == indent and self.peek() != '\0':
             chunks.extend(breaks)
             leading_non_space = self.peek() not in ' \t'
-            length = 0
+            length = self.match_run(self.LINE_RUN)
             while self.peek(length) not in '\0\r\n\x85\u2028\u2029':
                 length += 1
             chunks.append(self.prefix(length))
-            self.forward(length)
+            self.forward_run(length)
             line_break = self.scan_line_break()
             breaks, end_mark = self.scan_block_scalar_breaks(indent)
             if self.column == indent and self.peek() != '\0':
@@ -1186,12 +1211,12 @@ class Scanner:
         # See the specification for details.
         chunks = []
         while True:
-            length = 0
+            length = self.match_run(self.FLOW_NON_SPACE_RUN)
             while self.peek(length) not in '\'\"\\\0 \t\r\n\x85\u2028\u2029':
                 length += 1
             if length:
                 chunks.append(self.prefix(length))
-                self.forward(length)
+                self.forward_run(length)
             ch = self.peek()
             if not double and ch == '\'' and self.peek(1) == '\'':
                 chunks.append('\'')
@@ -1228,11 +1253,11 @@ class Scanner:
     def scan_flow_scalar_spaces(self, double, start_mark):
         # See the specification for details.
         chunks = []
-        length = 0
+        length = self.match_run(self.BLANK_RUN)
         while self.peek(length) in ' \t':
             length += 1
         whitespaces = self.prefix(length)
-        self.forward(length)
+        self.forward_run(length)
         ch = self.peek()
         if ch == '\0':
             raise ScannerError("while scanning a quoted scalar", start_mark,
@@ -1260,6 +1285,7 @@ class Scanner:
                     and self.peek(3) in '\0 \t\r\n\x85\u2028\u2029':
                 raise ScannerError("while scanning a quoted scalar", start_mark,
                         "found unexpected document separator", self.get_mark())
+            self.forward_run(self.match_run(self.BLANK_RUN))
             while self.peek() in ' \t':
                 self.forward()
             if self.peek() in '\r\n\x85\u2028\u2029':
@@ -1282,10 +1308,14 @@ class Scanner:
         #if indent == 0:
         #    indent = 1
         spaces = []
+        if self.flow_level:
+            run = self.PLAIN_FLOW_RUN
+        else:
+            run = self.PLAIN_BLOCK_RUN
         while True:
-            length = 0
             if self.peek() == '#':
                 break
+            length = self.match_run(run)
             while True:
                 ch = self.peek(length)
                 if ch in '\0 \t\r\n\x85\u2028\u2029'    \
@@ -1300,7 +1330,7 @@ class Scanner:
             self.allow_simple_key = False
             chunks.extend(spaces)
             chunks.append(self.prefix(length))
-            self.forward(length)
+            self.forward_run(length)
             end_mark = self.get_mark()
             spaces = self.scan_plain_spaces(indent, start_mark)
             if not spaces or self.peek() == '#' \
@@ -1313,11 +1343,11 @@ class Scanner:
         # The specification is really confusing about tabs in plain scalars.
         # We just forbid them completely. Do not use tabs in YAML!
         chunks = []
-        length = 0
+        length = self.match_run(self.SPACE_RUN)
         while self.peek(length) in ' ':
             length += 1
         whitespaces = self.prefix(length)
-        self.forward(length)
+        self.forward_run(length)
         ch = self.peek()
         if ch in '\r\n\x85\u2028\u2029':
             line_break = self.scan_line_break()
@@ -0,0 +1,100 @@
+# Created by GoriRed
+# Version: 1.2
+# License: CC-BY-NC
+# https://github.com/tkoopman/MO2-Batch-Plugin-Cleaner
+
+import os
+
+from pathlib import Path
+from typing import Iterable
+
+import mobase  # type: ignore
+
+PLUGIN_EXTENSIONS = (".esp", ".esm", ".esl")
+
+
+class load_order:
+    """
+    What Plugins.All needs from MO2's plugin list, read once per plugin into
+    parallel lists in priority order.
+
+    Only active plugins are kept, as inactive ones can't be cleaned, so their
+    state is the only thing read for them.
+    """
+
+    __slots__ = ("names", "priorities", "origins", "hasNoRecords")
+
+    def __init__(self, plugin_list: mobase.IPluginList) -> None:
+        active = list[tuple[int, str, str, bool]]()
+        for name in plugin_list.pluginNames():
+            if plugin_list.state(name) != mobase.PluginState.ACTIVE:
+                continue
+            active.append(
+                (
+                    plugin_list.priority(name),
+                    name,
+                    plugin_list.origin(name),
+                    plugin_list.hasNoRecords(name),
+                )
+            )
+        active.sort(key=lambda x: x[0])
+
+        self.priorities = [p for p, _, _, _ in active]
+        self.names = [n for _, n, _, _ in active]
+        self.origins = [o for _, _, o, _ in active]
+        self.hasNoRecords = [r for _, _, _, r in active]
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+
+class plugin_files:
+    """
+    The plugin files in each directory plugins are loaded from, read with one
+    os.scandir per directory, so finding a plugin and its size and time
+    needs no system call per plugin. On Windows the scan returns both, on
+    other systems the time costs one stat of only the plugins looked up.
+    """
+
+    __slots__ = ("__files",)
+
+    def __init__(self, directories: Iterable[tuple[str, Path]]) -> None:
+        # origin -> casefolded file name -> directory entry
+        self.__files = dict[str, dict[str, os.DirEntry[str]]]()
+        for origin, directory in directories:
+            if origin in self.__files:
+                continue
+            files = dict[str, os.DirEntry[str]]()
+            try:
+                with os.scandir(directory) as entries:
+                    for entry in entries:
+                        if entry.name.lower().endswith(PLUGIN_EXTENSIONS):
+                            files[entry.name.casefold()] = entry
+            except OSError:
+                # A missing mod folder just has no plugins.
+                pass
+            self.__files[origin] = files
+
+    def find(self, origin: str, name: str) -> os.DirEntry[str] | None:
+        """
+        Returns the file of the plugin loaded from origin, if it is there.
+        """
+        files = self.__files.get(origin)
+        entry = files.get(name.casefold()) if files else None
+        if entry is None or not entry.is_file():
+            return None
+        return entry
+
+    def signature(self, origin: str, name: str) -> tuple[str, int, int] | None:
+        """
+        Returns the path, size and modified time of a plugin's file, which
+        change whenever the file is rewritten.
+        """
+        entry = self.find(origin, name)
+        if entry is None:
+            return None
+        try:
+            stat = entry.stat()
+        except OSError:
+            return None
+        return (entry.path, stat.st_size, stat.st_mtime_ns)
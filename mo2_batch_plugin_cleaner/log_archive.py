@@ -0,0 +1,344 @@
+# Created by GoriRed
+# Version: 1.2
+# License: CC-BY-NC
+# https://github.com/tkoopman/MO2-Batch-Plugin-Cleaner
+
+import gzip
+import json
+import logging
+import os
+import shutil
+import threading
+import time
+import traceback
+
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import IO, Any, Callable
+
+
+class LogArchive:
+    """
+    The xEdit logs kept after cleaning, gzip compressed, together with a
+    manifest of what is in the archive so listing it needs neither a
+    directory scan nor any decompression.
+
+    Changes to the manifest are appended to a journal, which is only merged
+    into the manifest once it has grown as long as the manifest, so adding
+    or opening a log never rewrites the whole manifest.
+
+    Logs are compressed on a background thread. After each one the archive
+    is pruned to its age and size caps, removing the least recently used
+    logs first.
+    """
+
+    VERSION = 1
+    MANIFEST = "manifest.json"
+    JOURNAL = "manifest.journal"
+    # Journal lines always allowed before merging it into the manifest.
+    JOURNAL_MIN = 1000
+    SUFFIX = ".log.gz"
+    # Logs given a time stamped name but not compressed yet.
+    PENDING = ".log"
+
+    # One archive per directory, so logs still being compressed are not
+    # picked up again by the next cleaning run.
+    __archives: dict[Path, "LogArchive"] = {}
+
+    @staticmethod
+    def get(
+        directory: str | Path, max_bytes: int = 0, max_age: float = 0
+    ) -> "LogArchive":
+        """
+        Returns the archive in directory. max_bytes caps the total compressed
+        size and max_age, in seconds, the age of the logs kept. 0 means no cap.
+        """
+        directory = Path(directory).resolve()
+        archive = LogArchive.__archives.get(directory)
+        if archive is None:
+            archive = LogArchive(directory)
+            LogArchive.__archives[directory] = archive
+        archive.max_bytes = max_bytes
+        archive.max_age = max_age
+        return archive
+
+    def __init__(
+        self, directory: str | Path, max_bytes: int = 0, max_age: float = 0
+    ) -> None:
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        # file name -> plugin, crc, size, original size, created and used time
+        self.entries = dict[str, dict[str, Any]]()
+        self.__journal_lines = 0
+        self.__lock = threading.Lock()
+        self.__executor = ThreadPoolExecutor(1, "LogArchive")
+        # Called on the worker thread with the name, manifest entry and path of
+        # every log added.
+        self.listeners = list[Callable[[str, dict[str, Any], Path], None]]()
+        # Logs waiting for the worker, so adopting a directory twice does not
+        # compress them twice.
+        self.__queued = set[Path]()
+        os.makedirs(self.directory, exist_ok=True)
+        self.__load()
+
+        # Logs left behind when MO2 closed before they were compressed.
+        self.adopt(self.directory)
+
+    def __load(self) -> None:
+        manifest = self.directory / LogArchive.MANIFEST
+        if manifest.is_file():
+            try:
+                with open(manifest, "r", encoding="utf-8") as file:
+                    raw = json.load(file)
+                if raw["version"] == LogArchive.VERSION:
+                    self.entries = raw["entries"]
+                    self.__replay()
+                    return
+            except Exception as e:
+                logging.error(f'Error reading "{manifest}"')
+                logging.error(traceback.format_exception(e))
+
+        # No usable manifest, so rebuild it from the files themselves.
+        for path in self.directory.glob(f"*{LogArchive.SUFFIX}"):
+            plugin, crc = LogArchive.split_name(path.name[: -len(LogArchive.SUFFIX)])
+            stat = path.stat()
+            self.entries[path.name] = {
+                "plugin": plugin,
+                "crc": crc,
+                "size": stat.st_size,
+                "original": None,
+                "created": stat.st_mtime,
+                "used": stat.st_mtime,
+            }
+        self.__save()
+
+    def __replay(self) -> None:
+        """
+        Applies the changes journaled since the manifest was last written.
+        """
+        journal = self.directory / LogArchive.JOURNAL
+        try:
+            with open(journal, "r", encoding="utf-8") as file:
+                lines = file.readlines()
+        except FileNotFoundError:
+            return
+
+        for line in lines:
+            try:
+                change = json.loads(line)
+            except ValueError:
+                # Cut short when MO2 closed while it was being written.
+                continue
+            name = change["name"]
+            if "entry" in change:
+                self.entries[name] = change["entry"]
+            elif "used" in change:
+                if name in self.entries:
+                    self.entries[name]["used"] = change["used"]
+            else:
+                self.entries.pop(name, None)
+        self.__journal_lines = len(lines)
+
+    def __journal(self, changes: list[dict[str, Any]], merge: bool = True) -> None:
+        """
+        Appends changes to the journal, or if merge is set writes the whole
+        manifest instead once the journal is as long as the manifest. Call
+        with the lock held.
+        """
+        if not changes:
+            return
+        self.__journal_lines += len(changes)
+        if merge and self.__journal_lines > max(
+            LogArchive.JOURNAL_MIN, len(self.entries)
+        ):
+            self.__save()
+            return
+
+        journal = self.directory / LogArchive.JOURNAL
+        try:
+            with open(journal, "a", encoding="utf-8") as file:
+                file.writelines(
+                    json.dumps(change, separators=(",", ":")) + "\n"
+                    for change in changes
+                )
+        except Exception as e:
+            logging.error(f'Error writing to "{journal}"')
+            logging.error(traceback.format_exception(e))
+
+    def __save(self) -> None:
+        manifest = self.directory / LogArchive.MANIFEST
+        try:
+            temp = manifest.with_suffix(".tmp")
+            with open(temp, "w", encoding="utf-8") as file:
+                json.dump(
+                    {"version": LogArchive.VERSION, "entries": self.entries},
+                    file,
+                    separators=(",", ":"),
+                )
+            os.replace(temp, manifest)
+            # Replaying the journal over the new manifest would change
+            # nothing, so it doesn't matter if this is not reached.
+            try:
+                os.remove(self.directory / LogArchive.JOURNAL)
+            except FileNotFoundError:
+                pass
+            self.__journal_lines = 0
+        except Exception as e:
+            logging.error(f'Error writing to "{manifest}"')
+            logging.error(traceback.format_exception(e))
+
+    @staticmethod
+    def split_name(stem: str) -> tuple[str, str | None]:
+        """
+        Returns the plugin and CRC of a log named by
+        PluginProgressWindow.log_file_name, with or without a time stamp.
+        """
+        head, sep, tail = stem.rpartition("_")
+        if sep and tail.isdigit():
+            stem = head
+        plugin, sep, crc = stem.rpartition("_")
+        if sep and crc.startswith("0x"):
+            return plugin, crc
+        if sep and crc == "None":
+            return plugin, None
+        return stem, None
+
+    def add(self, logFile: str | Path) -> "Future[None] | None":
+        """
+        Compresses a log into the archive in the background and removes it.
+
+        The log may be on another drive. It is only given a time stamped name
+        in its own directory here, which is a rename even then, so the same
+        log name can be used again straight away.
+        """
+        logFile = Path(logFile)
+        if not logFile.is_file():
+            return None
+
+        if not logFile.stem.rpartition("_")[2].isdigit():
+            pending = logFile.with_name(
+                f"{logFile.stem}_{time.time_ns()}{LogArchive.PENDING}"
+            )
+            try:
+                os.replace(logFile, pending)
+            except Exception as e:
+                logging.error(f'Error renaming "{logFile}" for the log archive')
+                logging.error(traceback.format_exception(e))
+                return None
+            logFile = pending
+
+        with self.__lock:
+            if logFile in self.__queued:
+                return None
+            self.__queued.add(logFile)
+        return self.__executor.submit(self.__compress, logFile)
+
+    def adopt(self, directory: str | Path) -> None:
+        """
+        Adds the uncompressed logs found in a directory.
+        """
+        for logFile in Path(directory).glob("*.log"):
+            self.add(logFile)
+
+    def __compress(self, pending: Path) -> None:
+        stem = pending.stem
+        name = f"{stem}{LogArchive.SUFFIX}"
+        target = self.directory / name
+        try:
+            temp = target.with_suffix(".tmp")
+            with open(pending, "rb") as src, gzip.open(temp, "wb", 6) as dst:
+                shutil.copyfileobj(src, dst, 1 << 20)
+            os.replace(temp, target)
+            original = pending.stat().st_size
+            os.remove(pending)
+        except Exception as e:
+            logging.error(f'Error compressing "{pending}"')
+            logging.error(traceback.format_exception(e))
+            return
+        finally:
+            with self.__lock:
+                self.__queued.discard(pending)
+
+        plugin, crc = LogArchive.split_name(stem)
+        now = time.time()
+        with self.__lock:
+            self.entries[name] = {
+                "plugin": plugin,
+                "crc": crc,
+                "size": target.stat().st_size,
+                "original": original,
+                "created": now,
+                "used": now,
+            }
+            changes = [{"name": name, "entry": self.entries[name]}]
+            changes += ({"name": removed} for removed in self.__prune())
+            self.__journal(changes)
+            entry = dict(self.entries[name]) if name in self.entries else None
+
+        if entry:
+            for listener in self.listeners:
+                listener(name, entry, target)
+
+    def __prune(self) -> set[str]:
+        """
+        Removes the logs over the age and size caps. Returns their names.
+        """
+        removed = set[str]()
+        if self.max_age:
+            oldest = time.time() - self.max_age
+            removed.update(n for n, e in self.entries.items() if e["created"] < oldest)
+
+        if self.max_bytes:
+            total = sum(e["size"] for n, e in self.entries.items() if n not in removed)
+            for name, entry in sorted(
+                self.entries.items(), key=lambda item: item[1]["used"]
+            ):
+                if total <= self.max_bytes:
+                    break
+                if name not in removed:
+                    removed.add(name)
+                    total -= entry["size"]
+
+        for name in removed:
+            del self.entries[name]
+            try:
+                os.remove(self.directory / name)
+            except FileNotFoundError:
+                pass
+            except Exception as e:
+                logging.error(f'Error removing "{name}" from the log archive')
+                logging.error(traceback.format_exception(e))
+        return removed
+
+    def logs(self, plugin: str | None = None) -> list[tuple[str, dict[str, Any]]]:
+        """
+        Returns the archived logs, of one plugin if given, newest first.
+        """
+        with self.__lock:
+            entries = [
+                (name, dict(entry))
+                for name, entry in self.entries.items()
+                if plugin is None or entry["plugin"].casefold() == plugin.casefold()
+            ]
+        entries.sort(key=lambda item: item[1]["created"], reverse=True)
+        return entries
+
+    def open(self, name: str) -> IO[bytes]:
+        """
+        Opens an archived log for reading, which counts as using it.
+        """
+        with self.__lock:
+            if name not in self.entries:
+                raise FileNotFoundError(name)
+            path = self.directory / name
+            if not path.is_file():
+                del self.entries[name]
+                self.__journal([{"name": name}], merge=False)
+                raise FileNotFoundError(path)
+            used = time.time()
+            self.entries[name]["used"] = used
+            # Opened on the GUI thread, so the manifest is left for the worker
+            # to merge the journal into.
+            self.__journal([{"name": name, "used": used}], merge=False)
+        return gzip.open(path, "rb")
@@ -8,19 +8,28 @@
 # License: CC-BY-NC
 # https://github.com/tkoopman/MO2-Batch-Plugin-Cleaner
 
+from concurrent.futures import Future, ThreadPoolExecutor, wait
 import enum
+import hashlib
+import json
 import logging
 import os
 from pathlib import Path
 import sys
+import tempfile
+import time
+import traceback
 import typing
 
 from PyQt6.QtCore import (
     QAbstractTableModel,
+    QEventLoop,
+    QFileSystemWatcher,
     QModelIndex,
     QPoint,
     QSortFilterProxyModel,
     Qt,
+    QTimer,
 )
 from PyQt6.QtGui import QAction, QIcon
 from PyQt6.QtWidgets import QDialog, QMenu, QMessageBox, QWidget
@@ -29,9 +38,25 @@ import mobase  # type: ignore
 from . import ui_main_screen
 from . import icons
 from . import cleaning_data
+from . import scheduler
+from . import xedit_batch
+from . import xedit_log
+from .load_order import load_order, plugin_files
+from .log_archive import LogArchive
+from .record_store import RecordStore
 from .cleaning_data import crc32, crc_cleaning_data, source
+from .tool import CleanerPlugin, gameInfo
 
 
+# Plugins are hashed in batches of this many on this many threads while the
+# cleaning data loads, as hashing mostly waits on the disk.
+HASH_BATCH = 64
+HASH_WORKERS = min(8, (os.cpu_count() or 1) + 4)
+# How long load() blocks waiting for a stage before yielding to the caller.
+LOAD_WAIT = 0.005
+# Version of the file Plugins.save_snapshot() writes.
+SNAPSHOT_VERSION = 1
+
 launchOptions = [
     "-IKnowWhatImDoing",
     "-QuickAutoClean",
@@ -48,86 +73,6 @@ class keep_logs(enum.IntEnum):
     ALL = 5
 
 
-class GameInfo(typing.TypedDict):
-    xEditName: str
-    xEditSwitch: str
-    LootFolder: str | None
-
-
-gameInfo: dict[str, GameInfo] = {
-    "Oblivion": {
-        "xEditName": "TES4Edit",
-        "xEditSwitch": "-tes4",
-        "LootFolder": "Oblivion",
-    },
-    "Nehrim": {
-        "xEditName": "TES4Edit",
-        "xEditSwitch": "-tes4",
-        "LootFolder": "Nehrim",
-    },
-    "Fallout3": {
-        "xEditName": "FO3Edit",
-        "xEditSwitch": "-fo3",
-        "LootFolder": "Fallout3",
-    },
-    "FalloutNV": {
-        "xEditName": "FNVEdit",
-        "xEditSwitch": "-fnv",
-        "LootFolder": "FalloutNV",
-    },
-    "TTW": {
-        "xEditName": "FNVEdit",
-        "xEditSwitch": "-fnv",
-        "LootFolder": None,
-    },
-    "Skyrim": {
-        "xEditName": "TES5Edit",
-        "xEditSwitch": "-tes5",
-        "LootFolder": "Skyrim",
-    },
-    "SkyrimSE": {
-        "xEditName": "SSEEdit",
-        "xEditSwitch": "-sse",
-        "LootFolder": "Skyrim Special Edition",
-    },
-    "SkyrimVR": {
-        "xEditName": "TES5VREdit",
-        "xEditSwitch": "-tes5vr",
-        "LootFolder": "Skyrim VR",
-    },
-    "Enderal": {
-        "xEditName": "EnderalEdit",
-        "xEditSwitch": "-enderal",
-        "LootFolder": "Enderal",
-    },
-    "EnderalSE": {
-        "xEditName": "EnderalSEEdit",
-        "xEditSwitch": "-enderalse",
-        "LootFolder": "Enderal Special Edition",
-    },
-    "Fallout4": {
-        "xEditName": "FO4Edit",
-        "xEditSwitch": "-fo4",
-        "LootFolder": "Fallout4",
-    },
-    "Fallout4VR": {
-        "xEditName": "FO4VREdit",
-        "xEditSwitch": "-fo4vr",
-        "LootFolder": "Fallout4VR",
-    },
-    "Fallout76": {
-        "xEditName": "FO76Edit",
-        "xEditSwitch": "-fo76",
-        "LootFolder": None,
-    },
-    "Starfield": {
-        "xEditName": "SF1Edit",
-        "xEditSwitch": "-sf1",
-        "LootFolder": "Starfield",
-    },
-}
-
-
 def to_int(value: typing.Any, default: int = 0) -> int:
     try:
         return int(value)
@@ -149,18 +94,51 @@ class plugin_type(enum.Enum):
     OTHER = enum.auto()
 
 
-class plugin(typing.TypedDict):
-    name: str
-    selected: bool
-    priority: int
-    type: plugin_type
-    origin: str
-    state: plugin_clean_state
-    hasNoRecords: bool
-    crc: crc32 | None
-    cleaning_data: cleaning_data.cleaning_data | None
-    processed: str | bool
-    ignore: bool
+class plugin:
+    """
+    One plugin in the load order. Slotted, as the models read these for every
+    cell and role each time the view repaints.
+    """
+
+    __slots__ = (
+        "name",
+        "selected",
+        "priority",
+        "type",
+        "origin",
+        "state",
+        "hasNoRecords",
+        "crc",
+        "cleaning_data",
+        "processed",
+        "ignore",
+    )
+
+    def __init__(
+        self,
+        name: str,
+        selected: bool,
+        priority: int,
+        type: plugin_type,
+        origin: str,
+        state: plugin_clean_state,
+        hasNoRecords: bool,
+        crc: crc32 | None,
+        cleaning_data: cleaning_data.cleaning_data | None,
+        processed: str | bool,
+        ignore: bool,
+    ) -> None:
+        self.name = name
+        self.selected = selected
+        self.priority = priority
+        self.type = type
+        self.origin = origin
+        self.state = state
+        self.hasNoRecords = hasNoRecords
+        self.crc = crc
+        self.cleaning_data = cleaning_data
+        self.processed = processed
+        self.ignore = ignore
 
 
 class Plugins:
@@ -174,9 +152,11 @@ class Plugins:
         cleanPrimary: bool,
         cleanCC: bool,
         cleanElse: bool,
+        loot_index: cleaning_data.MasterlistIndex | None = None,
     ) -> None:
         self.organizer = organizer
         self.crc_cleaning_data = crc_cleaning_data
+        self.loot_index = loot_index
         self.__plugins = plugins
         if isinstance(index, dict):
             self.__plugins_index = index
@@ -188,174 +168,690 @@ class Plugins:
         self.__cleanCC = cleanCC
         self.__cleanElse = cleanElse
 
+        # Changes reported by MO2 since the last refresh(), see watch().
+        self.__reconcile = False
+        self.__moves = list[tuple[str, int, int]]()
+        self.__changed = dict[str, str]()
+        # Casefolded name -> (file, size, mtime) of the plugin when it was hashed
+        self.__signatures = dict[str, tuple[str, int, int] | None]()
+        # Stage -> seconds the last load() spent in it, see load().
+        self.load_times = dict[str, float]()
+        # Whether the rows show the classification restore() took from a
+        # snapshot, rather than none yet.
+        self.__restored = False
+
     def reindex(self) -> None:
         self.__plugins_index = {
-            plugin["name"].casefold(): i for i, plugin in enumerate(self.__plugins)
+            plugin.name.casefold(): i for i, plugin in enumerate(self.__plugins)
         }
 
     @staticmethod
     def All(organizer: mobase.IOrganizer) -> "Plugins":
-        loot = gameInfo[organizer.managedGame().gameShortName()]["LootFolder"]
-        crc_cleaning_data = (
-            cleaning_data.LootData.load(
-                str(
-                    Path(os.environ["LOCALAPPDATA"])
-                    / "LOOT"
-                    / "games"
-                    / loot
-                    / "masterlist.yaml"
+        plugins = Plugins.Loading(organizer)
+        for _ in plugins.load():
+            pass
+        return plugins
+
+    @staticmethod
+    def Loading(organizer: mobase.IOrganizer) -> "Plugins":
+        """
+        Returns the active plugins in load order without hashing or
+        classifying them yet, which load() then does.
+        """
+        plugins = Plugins(
+            organizer, crc_cleaning_data(), [], None, -1, False, False, False
+        )
+        plugins.__load_settings()
+
+        # Each call into MO2 crosses into C++, so read every attribute of every
+        # plugin once and only use the snapshot from here on.
+        snapshot = load_order(organizer.pluginList())
+        for i, name in enumerate(snapshot.names):
+            plugins.__plugins.append(
+                plugins.__row(
+                    name,
+                    snapshot.priorities[i],
+                    snapshot.origins[i],
+                    snapshot.hasNoRecords[i],
+                )
+            )
+        plugins.__finish()
+        # Nothing is selected until its state is known.
+        for plugin in plugins.__plugins:
+            plugin.selected = False
+        return plugins
+
+    def load(self) -> typing.Iterator[list[int]]:
+        """
+        Loads the cleaning data on one worker thread while the plugins are
+        hashed on a pool of others, then classifies them in load order as
+        their hashes come in. Yields after each step the rows it changed, and
+        while waiting on the workers, so a dialog can show the plugins while
+        they are still being read.
+
+        Plugins restored from a snapshot are only hashed again if their file
+        changed since, and keep a selection the user changed meanwhile.
+
+        load_times then holds how long each stage took and how long loading
+        was held up waiting on it.
+        """
+        start = time.perf_counter()
+        times = self.load_times = dict[str, float]()
+        data_pool = ThreadPoolExecutor(1, "CleaningData")
+        hash_pool = ThreadPoolExecutor(HASH_WORKERS, "Hash")
+        try:
+            # Everything the worker needs from MO2 is looked up here, as the
+            # organizer is only used from the GUI thread.
+            found = self.__masterlist()
+            index_file = (
+                Path(self.organizer.pluginDataPath())
+                / CleanerPlugin.NAME()
+                / f"masterlist index {found[0]}.json"
+                if found
+                else None
+            )
+            user_file = Path(self.organizer.getPluginDataPath()) / "cleaning_data.csv"
+            data = data_pool.submit(
+                Plugins.__timed,
+                Plugins.__read_cleaning_data,
+                found[1] if found else None,
+                index_file,
+                user_file,
+            )
+
+            files = self.__files(plugin.origin for plugin in self.__plugins)
+            times["scan"] = time.perf_counter() - start
+            hash_start = time.perf_counter()
+            targets = [
+                (
+                    plugin.origin,
+                    plugin.name,
+                    self.__signatures.get(plugin.name.casefold()),
+                    plugin.crc,
+                )
+                for plugin in self.__plugins
+            ]
+            batches = [
+                hash_pool.submit(
+                    Plugins.__hash_batch, files, targets[i : i + HASH_BATCH]
+                )
+                for i in range(0, len(targets), HASH_BATCH)
+            ]
+            yield []
+
+            waited = time.perf_counter()
+            while not data.done():
+                wait([data], LOAD_WAIT)
+                yield []
+            times["cleaning data wait"] = time.perf_counter() - waited
+            times["cleaning data"], (crc_data, loot_index) = data.result()
+            self.crc_cleaning_data = crc_data
+            self.loot_index = loot_index
+
+            times["hash wait"] = 0
+            times["classify"] = 0
+            hashed = 0
+            hash_end = hash_start
+            for b, batch in enumerate(batches):
+                waited = time.perf_counter()
+                while not batch.done():
+                    wait([batch], LOAD_WAIT)
+                    yield []
+                times["hash wait"] += time.perf_counter() - waited
+                end, hashes = batch.result()
+                hash_end = max(hash_end, end)
+
+                for i, (crc, signature) in enumerate(hashes, b * HASH_BATCH):
+                    classified = time.perf_counter()
+                    plugin = self.__plugins[i]
+                    _, _, known, known_crc = targets[i]
+                    reused = signature is not None and signature == known
+                    if not reused:
+                        hashed += 1
+                    # Keep a selection the user changed, otherwise follow the state
+                    was_default = plugin.selected == self.selected_default(plugin)
+                    self.__classify(plugin, crc, signature)
+                    if was_default or not (reused and self.__restored):
+                        plugin.selected = self.selected_default(plugin)
+                    times["classify"] += time.perf_counter() - classified
+                    yield [i]
+            times["hash"] = hash_end - hash_start
+        finally:
+            data_pool.shutdown(False, cancel_futures=True)
+            hash_pool.shutdown(False, cancel_futures=True)
+
+        times["total"] = time.perf_counter() - start
+        logging.debug(
+            f"Loaded {len(self.__plugins)} plugins, {hashed} hashed, in "
+            f"{times['total'] * 1000:.0f} ms: "
+            + ", ".join(
+                f"{stage} {times[stage] * 1000:.0f} ms"
+                for stage in (
+                    "scan",
+                    "cleaning data",
+                    "cleaning data wait",
+                    "hash",
+                    "hash wait",
+                    "classify",
                 )
             )
-            if loot
-            else None
         )
-        user_data = cleaning_data.CsvData.load(
-            Path(organizer.getPluginDataPath()) / "cleaning_data.csv"
+
+    @staticmethod
+    def __timed(
+        call: typing.Callable[..., typing.Any], *args: typing.Any
+    ) -> tuple[float, typing.Any]:
+        start = time.perf_counter()
+        result = call(*args)
+        return time.perf_counter() - start, result
+
+    @staticmethod
+    def __hash_batch(
+        files: plugin_files,
+        targets: list[
+            tuple[str, str, tuple[str, int, int] | None, crc32 | None]
+        ],
+    ) -> tuple[float, list[tuple[crc32 | None, tuple[str, int, int] | None]]]:
+        """
+        Hashes plugins on a worker thread. Returns when it finished and the
+        CRC and file signature of each.
+        """
+        hashes = [Plugins.__hash(files, *target) for target in targets]
+        return time.perf_counter(), hashes
+
+    @staticmethod
+    def __hash(
+        files: plugin_files,
+        origin: str,
+        name: str,
+        known: tuple[str, int, int] | None = None,
+        known_crc: crc32 | None = None,
+    ) -> tuple[crc32 | None, tuple[str, int, int] | None]:
+        """
+        Returns the CRC and file signature of a plugin, reusing known_crc if
+        the file still has the known signature it was hashed with.
+        """
+        signature = files.signature(origin, name)
+        if signature is not None and signature == known:
+            return known_crc, signature
+        file = files.find(origin, name)
+        crc = crc32.from_file(file.path) if file else None
+        return crc, signature
+
+    def __masterlist(self) -> tuple[str, Path] | None:
+        """
+        Returns the LOOT folder of the game and its masterlist, if LOOT
+        supports the game.
+        """
+        loot = gameInfo[self.organizer.managedGame().gameShortName()]["LootFolder"]
+        if not loot:
+            return None
+        return loot, (
+            Path(os.environ["LOCALAPPDATA"])
+            / "LOOT"
+            / "games"
+            / loot
+            / "masterlist.yaml"
         )
+
+    @staticmethod
+    def __read_cleaning_data(
+        masterlist: Path | None, index_file: Path | None, user_file: Path
+    ) -> tuple[crc_cleaning_data, cleaning_data.MasterlistIndex | None]:
+        """
+        Reads the LOOT masterlist, through its index if given, and the user's
+        cleaning data. Runs on a worker thread, so only takes paths and only
+        returns what it read.
+        """
+        loot_index = None
+        crc_cleaning_data = None
+        if masterlist:
+            if index_file:
+                loot_index = cleaning_data.MasterlistIndex.load(index_file, masterlist)
+            crc_cleaning_data = cleaning_data.LootData.load(
+                str(masterlist), loot_index
+            )
+        user_data = cleaning_data.CsvData.load(user_file)
         if crc_cleaning_data:
             crc_cleaning_data.update_data(user_data)
         else:
             crc_cleaning_data = user_data
+        return crc_cleaning_data, loot_index
+
+    def __fingerprint(self) -> dict[str, typing.Any]:
+        """
+        What the classification of the plugins depends on besides their
+        files: the load order and the versions of the LOOT masterlist and the
+        user's cleaning data.
+        """
+        order = hashlib.blake2b(digest_size=16)
+        for plugin in self.__plugins:
+            order.update(
+                f"{plugin.name}\0{plugin.priority}\0{plugin.origin}\0"
+                f"{plugin.hasNoRecords}\n".encode()
+            )
+        found = self.__masterlist()
+        return {
+            "game": self.organizer.managedGame().gameShortName(),
+            "load_order": order.hexdigest(),
+            "masterlist": Plugins.__stat(found[1]) if found else None,
+            "user_data": Plugins.__stat(
+                Path(self.organizer.getPluginDataPath()) / "cleaning_data.csv"
+            ),
+        }
 
-        plugin_list = organizer.pluginList()
-
-        plugins = [
-            (name, plugin_list.priority(name)) for name in plugin_list.pluginNames()
+    @staticmethod
+    def __stat(path: Path) -> list[int] | None:
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        return [stat.st_size, stat.st_mtime_ns]
+
+    def save_snapshot(self, filename: str | Path) -> None:
+        """
+        Writes the plugins with their CRCs, file signatures and cleaning data
+        to filename, so the next MO2 session can restore() them.
+        """
+        rows = [
+            [
+                plugin.name,
+                int(plugin.crc) if plugin.crc is not None else None,
+                self.__signatures.get(plugin.name.casefold()),
+                (
+                    [cd.itm, cd.udr, cd.nav, cd.source.name]
+                    if (cd := plugin.cleaning_data)
+                    else None
+                ),
+            ]
+            for plugin in self.__plugins
         ]
-        plugins.sort(key=lambda x: x[1])
-        plugins = [name for name, _ in plugins]
+        raw = {
+            "version": SNAPSHOT_VERSION,
+            "fingerprint": self.__fingerprint(),
+            "plugins": rows,
+        }
+        filename = Path(filename)
+        try:
+            os.makedirs(filename.parent, exist_ok=True)
+            temp = filename.with_suffix(".tmp")
+            with open(temp, "w", encoding="utf-8") as file:
+                json.dump(raw, file, separators=(",", ":"))
+            os.replace(temp, filename)
+        except Exception as e:
+            logging.error(f'Error writing to "{filename}"')
+            logging.error(traceback.format_exception(e))
+
+    def restore(self, filename: str | Path) -> bool:
+        """
+        Takes the CRCs of the plugins from a snapshot written by
+        save_snapshot(), which load() then only checks against the signature
+        of each file instead of hashing it again.
+
+        If the load order, masterlist and user cleaning data are also the
+        same as then, the plugins are shown as they were classified straight
+        away, and True is returned.
+        """
+        filename = Path(filename)
+        if not filename.is_file():
+            return False
 
-        plugins_data = list[plugin]()
-        plugins_index = dict[str, int]()
+        try:
+            with open(filename, "r", encoding="utf-8") as file:
+                raw = json.load(file)
+            if raw["version"] != SNAPSHOT_VERSION:
+                return False
+            rows = {row[0].casefold(): row for row in raw["plugins"]}
+            current = raw["fingerprint"] == self.__fingerprint()
+        except Exception as e:
+            logging.error(f'Error reading "{filename}"')
+            logging.error(traceback.format_exception(e))
+            return False
 
-        primaryPlugins = [
-            name.casefold() for name in organizer.managedGame().primaryPlugins()
-        ]
-        DLCPlugins = [name.casefold() for name in organizer.managedGame().DLCPlugins()]
-        CCPlugins = [name.casefold() for name in organizer.managedGame().CCPlugins()]
+        for plugin in self.__plugins:
+            name_cf = plugin.name.casefold()
+            row = rows.get(name_cf)
+            if row is None or row[1] is None or row[2] is None:
+                continue
+            _, crc, signature, cd = row
+            plugin.crc = crc32(crc)
+            self.__signatures[name_cf] = tuple(signature)  # type: ignore
+            if current:
+                plugin.cleaning_data = (
+                    cleaning_data.cleaning_data(cd[0], cd[1], cd[2], source[cd[3]])
+                    if cd
+                    else None
+                )
+                plugin.state = Plugins.__clean_state(
+                    plugin.hasNoRecords, plugin.cleaning_data
+                )
+                plugin.selected = self.selected_default(plugin)
 
-        cleanPrimary = bool(organizer.pluginSetting(CleanerPlugin.NAME(), "clean_beth"))
-        cleanCC = bool(organizer.pluginSetting(CleanerPlugin.NAME(), "clean_cc"))
-        cleanElse = bool(organizer.pluginSetting(CleanerPlugin.NAME(), "clean_else"))
-        firstDynamic = str(
+        self.__restored = current
+        logging.debug(
+            f'Restored {"" if current else "the CRCs of "}{len(self.__plugins)} '
+            f'plugins from "{filename}".'
+        )
+        return current
+
+    def __load_settings(self) -> None:
+        organizer = self.organizer
+        game = organizer.managedGame()
+        self.__primaryPlugins = {name.casefold() for name in game.primaryPlugins()}
+        self.__DLCPlugins = {name.casefold() for name in game.DLCPlugins()}
+        self.__CCPlugins = {name.casefold() for name in game.CCPlugins()}
+        self.__mod_list = organizer.modList()
+        self.__dataDirectory = Path(game.dataDirectory().absolutePath())
+        self.__overwriteDirectory = Path(organizer.overwritePath())
+
+        self.__cleanPrimary = bool(
+            organizer.pluginSetting(CleanerPlugin.NAME(), "clean_beth")
+        )
+        self.__cleanCC = bool(organizer.pluginSetting(CleanerPlugin.NAME(), "clean_cc"))
+        self.__cleanElse = bool(
+            organizer.pluginSetting(CleanerPlugin.NAME(), "clean_else")
+        )
+        self.__firstDynamic = str(
             organizer.pluginSetting(CleanerPlugin.NAME(), "first_dynamic")
         )
-        firstDynamicFound = -1
 
         ignored = str(organizer.pluginSetting(CleanerPlugin.NAME(), "do_not_clean"))
-
         if ignored:
-            ignored = [name.casefold().strip() for name in ignored.split(",")]
+            self.__ignored = {name.casefold().strip() for name in ignored.split(",")}
         else:
-            ignored = list[str]()
+            self.__ignored = set[str]()
 
-        for plugin_name in plugins:
-            if plugin_list.state(plugin_name) != mobase.PluginState.ACTIVE:
-                # Can't clean inactive plugins
-                continue
-
-            plugin_name_cf = plugin_name.casefold()
-            origin = organizer.pluginList().origin(plugin_name)
-            mod = organizer.modList().getMod(origin)
+    def __files(self, origins: typing.Iterable[str]) -> plugin_files:
+        """
+        Scans the directory of each origin once for the plugins in it.
+        """
 
+        def directory(origin: str) -> Path:
             if origin == "data":
-                directory = Path(
-                    organizer.managedGame().dataDirectory().absolutePath()
-                )
+                return self.__dataDirectory
             elif origin == "overwrite":
-                directory = Path(organizer.overwritePath())
-            else:
-                directory = Path(mod.absolutePath())
-            filename = directory / plugin_name
+                return self.__overwriteDirectory
+            return Path(self.__mod_list.getMod(origin).absolutePath())
 
-            crc = crc32.from_file(filename) if Path(filename).is_file() else None
-            hasNoRecords = plugin_list.hasNoRecords(plugin_name)
-            cd = crc_cleaning_data.find(plugin_name, crc)
+        return plugin_files(
+            (origin, directory(origin)) for origin in dict.fromkeys(origins)
+        )
 
-            pluginType = (
-                plugin_type.CC
-                if plugin_name_cf in CCPlugins
+    def __row(
+        self,
+        plugin_name: str,
+        priority: int,
+        origin: str,
+        hasNoRecords: bool,
+        files: plugin_files | None = None,
+    ) -> plugin:
+        """
+        Classifies one plugin, and hashes it if given the files to find it in.
+        Its selection is set by __finish.
+        """
+        plugin_name_cf = plugin_name.casefold()
+        pluginType = (
+            plugin_type.CC
+            if plugin_name_cf in self.__CCPlugins
+            else (
+                plugin_type.DLC
+                if plugin_name_cf in self.__DLCPlugins
                 else (
-                    plugin_type.DLC
-                    if plugin_name_cf in DLCPlugins
-                    else (
-                        plugin_type.PRIMARY
-                        if plugin_name_cf in primaryPlugins
-                        else plugin_type.OTHER
-                    )
+                    plugin_type.PRIMARY
+                    if plugin_name_cf in self.__primaryPlugins
+                    else plugin_type.OTHER
                 )
             )
+        )
+
+        row = plugin(
+            name=plugin_name,
+            selected=False,
+            priority=priority,
+            type=pluginType,
+            origin=origin,
+            state=Plugins.__clean_state(hasNoRecords, None),
+            hasNoRecords=hasNoRecords,
+            crc=None,
+            cleaning_data=None,
+            processed=False,
+            ignore=plugin_name_cf in self.__ignored,
+        )
+        if files is not None:
+            self.__resolve(row, files)
+        return row
+
+    def __resolve(self, plugin: plugin, files: plugin_files) -> None:
+        """
+        Hashes a plugin and finds its cleaning data and state.
+        """
+        self.__classify(plugin, *Plugins.__hash(files, plugin.origin, plugin.name))
 
-            state = (
-                plugin_clean_state.CLEAN
-                if hasNoRecords
+    def __classify(
+        self,
+        plugin: plugin,
+        crc: crc32 | None,
+        signature: tuple[str, int, int] | None,
+    ) -> None:
+        """
+        Finds the cleaning data and state of a hashed plugin.
+        """
+        plugin.crc = crc
+        self.__signatures[plugin.name.casefold()] = signature
+        plugin.cleaning_data = self.crc_cleaning_data.find(plugin.name, plugin.crc)
+        plugin.state = Plugins.__clean_state(plugin.hasNoRecords, plugin.cleaning_data)
+
+    def __finish(self) -> None:
+        """
+        Puts the plugins in priority order and resets their selection to the
+        default for the current settings.
+        """
+        self.__plugins.sort(key=lambda x: x.priority)
+        self.reindex()
+
+        first = self[self.__firstDynamic] if self.__firstDynamic else None
+        self.first_dynamic = first.priority if first else -1
+        for plugin in self.__plugins:
+            plugin.ignore = plugin.name.casefold() in self.__ignored
+            plugin.selected = self.selected_default(plugin)
+            plugin.processed = False
+
+    def watch(self) -> None:
+        """
+        Keeps track of the changes MO2 reports to the plugin and mod lists, so
+        refresh() can bring this instance up to date the next time the tool is
+        opened. MO2 can't unregister these, so only call it once per instance.
+        """
+        plugin_list = self.organizer.pluginList()
+        plugin_list.onRefreshed(self.__on_refreshed)
+        plugin_list.onPluginMoved(self.__on_plugin_moved)
+        plugin_list.onPluginStateChanged(self.__on_plugin_state_changed)
+        mod_list = self.organizer.modList()
+        mod_list.onModInstalled(self.__on_mod_installed)
+        mod_list.onModRemoved(self.__on_mod_removed)
+
+    # MO2 may call these while a dialog is showing the plugins, so they only
+    # record what changed and refresh() applies it.
+    def __on_refreshed(self) -> None:
+        self.__reconcile = True
+
+    def __on_plugin_moved(self, name: str, oldPriority: int, newPriority: int) -> None:
+        self.__moves.append((name, oldPriority, newPriority))
+
+    def __on_plugin_state_changed(self, states: dict[str, mobase.PluginState]) -> None:
+        self.invalidate(states.keys())
+
+    def __on_mod_installed(self, mod: mobase.IModInterface) -> None:
+        self.__on_mod_removed(mod.name())
+
+    def __on_mod_removed(self, name: str) -> None:
+        # The mod's plugins may now come from another mod, or nowhere.
+        self.invalidate(p.name for p in self.__plugins if p.origin == name)
+        self.__reconcile = True
+
+    def invalidate(self, names: typing.Iterable[str]) -> None:
+        """
+        Hashes and classifies these plugins again on the next refresh().
+        """
+        for name in names:
+            self.__changed[name.casefold()] = name
+
+    def refresh(self) -> None:
+        """
+        Brings an instance kept from an earlier display() up to date with the
+        changes MO2 reported since, hashing only the plugins that changed.
+        """
+        self.__load_settings()
+        self.update_loot_data()
+        plugin_list = self.organizer.pluginList()
+        rows = {p.name.casefold(): p for p in self.__plugins}
+
+        if self.__reconcile:
+            # MO2 only says something changed, so compare the whole load order
+            # and rehash the plugins whose file is not the one hashed before.
+            snapshot = load_order(plugin_list)
+            files = self.__files(snapshot.origins)
+            current = dict[str, plugin]()
+            for i, name in enumerate(snapshot.names):
+                name_cf = name.casefold()
+                row = rows.get(name_cf)
+                signature = self.__signatures.get(name_cf)
+                if (
+                    row is None
+                    or name_cf in self.__changed
+                    or row.origin != snapshot.origins[i]
+                    or signature is None
+                    or files.signature(snapshot.origins[i], name) != signature
+                ):
+                    row = self.__row(
+                        name,
+                        snapshot.priorities[i],
+                        snapshot.origins[i],
+                        snapshot.hasNoRecords[i],
+                        files,
+                    )
+                else:
+                    row.priority = snapshot.priorities[i]
+                    if row.hasNoRecords != snapshot.hasNoRecords[i]:
+                        row.hasNoRecords = snapshot.hasNoRecords[i]
+                        row.state = Plugins.__clean_state(
+                            row.hasNoRecords, row.cleaning_data
+                        )
+                current[name_cf] = row
+            rows = current
+        else:
+            # Moving one plugin shifts every plugin between its old and new
+            # priority by one.
+            for name, oldPriority, newPriority in self.__moves:
+                step = -1 if oldPriority < newPriority else 1
+                low, high = sorted((oldPriority, newPriority))
+                for row in rows.values():
+                    if low <= row.priority <= high:
+                        row.priority += step
+                row = rows.get(name.casefold())
+                if row:
+                    row.priority = newPriority
+
+            active = list[tuple[str, int, str, bool]]()
+            for name_cf, name in self.__changed.items():
+                rows.pop(name_cf, None)
+                if plugin_list.state(name) == mobase.PluginState.ACTIVE:
+                    active.append(
+                        (
+                            name,
+                            plugin_list.priority(name),
+                            plugin_list.origin(name),
+                            plugin_list.hasNoRecords(name),
+                        )
+                    )
+            files = self.__files(origin for _, _, origin, _ in active)
+            for name, priority, origin, hasNoRecords in active:
+                rows[name.casefold()] = self.__row(
+                    name, priority, origin, hasNoRecords, files
+                )
+
+        for name_cf in set(self.__signatures) - rows.keys():
+            del self.__signatures[name_cf]
+        self.__reconcile = False
+        self.__moves.clear()
+        self.__changed.clear()
+        self.__plugins = list(rows.values())
+        self.__finish()
+
+    @staticmethod
+    def __clean_state(
+        hasNoRecords: bool, cd: cleaning_data.cleaning_data | None
+    ) -> plugin_clean_state:
+        return (
+            plugin_clean_state.CLEAN
+            if hasNoRecords
+            else (
+                plugin_clean_state.UNKNOWN
+                if cd is None
                 else (
-                    plugin_clean_state.UNKNOWN
-                    if cd is None
+                    plugin_clean_state.CLEAN
+                    if cd.is_clean()
                     else (
-                        plugin_clean_state.CLEAN
-                        if cd.is_clean()
+                        plugin_clean_state.DIRTY
+                        if cd.is_auto_cleanable()
                         else (
-                            plugin_clean_state.DIRTY
-                            if cd.is_auto_cleanable()
-                            else (
-                                plugin_clean_state.REQUIRES_MANUAL
-                                if cd.requires_manual_fix()
-                                else plugin_clean_state.UNKNOWN
-                            )
+                            plugin_clean_state.REQUIRES_MANUAL
+                            if cd.requires_manual_fix()
+                            else plugin_clean_state.UNKNOWN
                         )
                     )
                 )
             )
+        )
 
-            if plugin_name == firstDynamic:
-                firstDynamicFound = plugin_list.priority(plugin_name)
-
-            ignore = plugin_name_cf in ignored
-            priority = plugin_list.priority(plugin_name)
-            selected = Plugins.__selected_default(
-                ignore,
-                state,
-                priority,
-                pluginType,
-                firstDynamicFound,
-                cleanPrimary,
-                cleanCC,
-                cleanElse,
+    def update_loot_data(self) -> list[int]:
+        """
+        Re-reads the LOOT masterlist after it has changed, updating only the
+        plugins whose entries changed. Returns the rows of those plugins.
+        """
+        if not self.loot_index:
+            return []
+
+        try:
+            names = self.loot_index.update()
+        except Exception as e:
+            logging.error(f'Error updating from "{self.loot_index.masterlist}"')
+            logging.error(traceback.format_exception(e))
+            return []
+
+        if names is None:
+            logging.error(
+                f'Could not find the plugin entries in "{self.loot_index.masterlist}"'
             )
+            return []
+
+        self.loot_index.save()
+        self.loot_index.apply(self.crc_cleaning_data, names)
+
+        rows = list[int]()
+        for name in names:
+            if name not in self.__plugins_index:
+                continue
 
-            data = plugin(
-                {
-                    "name": plugin_name,
-                    "selected": selected,
-                    "priority": priority,
-                    "type": pluginType,
-                    "origin": origin,
-                    "state": state,
-                    "hasNoRecords": hasNoRecords,
-                    "crc": crc,
-                    "cleaning_data": cd,
-                    "processed": False,
-                    "ignore": ignore,
-                }
+            row = self.__plugins_index[name]
+            plugin = self.__plugins[row]
+            # Keep a selection the user changed, otherwise follow the new state
+            was_default = plugin.selected == self.selected_default(plugin)
+            plugin.cleaning_data = self.crc_cleaning_data.find(
+                plugin.name, plugin.crc
             )
+            plugin.state = Plugins.__clean_state(
+                plugin.hasNoRecords, plugin.cleaning_data
+            )
+            if was_default:
+                plugin.selected = self.selected_default(plugin)
+            rows.append(row)
 
-            plugins_index[plugin_name_cf] = len(plugins_data)
-            plugins_data.append(data)
-
-        return Plugins(
-            organizer,
-            crc_cleaning_data,
-            plugins_data,
-            plugins_index,
-            firstDynamicFound,
-            cleanPrimary,
-            cleanCC,
-            cleanElse,
-        )
+        logging.debug(f"LOOT masterlist changed, updated {len(rows)} plugins.")
+        return rows
 
     def get_ignored(self) -> list[str]:
-        return sorted([plugin["name"] for plugin in self.__plugins if plugin["ignore"]])
+        return sorted([plugin.name for plugin in self.__plugins if plugin.ignore])
 
     @staticmethod
     def __selected_default(
@@ -388,10 +884,10 @@ class Plugins:
 
     def selected_default(self, plugin: plugin) -> bool:
         return Plugins.__selected_default(
-            plugin["ignore"],
-            plugin["state"],
-            plugin["priority"],
-            plugin["type"],
+            plugin.ignore,
+            plugin.state,
+            plugin.priority,
+            plugin.type,
             self.first_dynamic,
             self.__cleanPrimary,
             self.__cleanCC,
@@ -399,21 +895,16 @@ class Plugins:
         )
 
     @staticmethod
-    def Selected(plugins: "Plugins") -> "Plugins":
-        selected_plugins = [
-            plugin for plugin in plugins.__plugins if plugin["selected"]
-        ]
-
-        selected_plugins.sort(key=lambda x: x["priority"])
-        return Plugins(
-            plugins.organizer,
-            plugins.crc_cleaning_data,
-            selected_plugins,
-            None,
-            plugins.first_dynamic,
-            plugins.__cleanPrimary,
-            plugins.__cleanCC,
-            plugins.__cleanElse,
+    def Selected(plugins: "Plugins") -> "PluginsView":
+        return plugins.view(lambda plugin: plugin.selected)
+
+    def view(self, predicate: typing.Callable[[plugin], bool]) -> "PluginsView":
+        """
+        Returns the plugins predicate is true for, in priority order, without
+        copying them. E.g. view(lambda p: p.origin == mod) for one mod's.
+        """
+        return PluginsView(
+            self, [i for i, plugin in enumerate(self.__plugins) if predicate(plugin)]
         )
 
     def __getitem__(self, value: str | int) -> plugin | None:
@@ -434,21 +925,113 @@ class Plugins:
         return iter(self.__plugins)
 
     def indexOf(self, plugin: plugin) -> int:
-        name = plugin["name"].casefold()
+        name = plugin.name.casefold()
         if name in self.__plugins_index:
             return self.__plugins_index[name]
         return -1
 
+    def file(self, plugin: plugin) -> str | None:
+        """
+        Returns the path of the file the plugin was hashed from, if found.
+        """
+        signature = self.__signatures.get(plugin.name.casefold())
+        return signature[0] if signature else None
+
+    def session(self, plugin: plugin) -> list[tuple[str, bool]]:
+        """
+        Returns the plugins xEdit loads to clean plugin, in load order: its
+        masters, their masters and itself, each with whether it is light.
+        """
+        plugin_list = self.organizer.pluginList()
+        names = {plugin.name.casefold(): plugin.name}
+        pending = [plugin.name]
+        while pending:
+            for master in plugin_list.masters(pending.pop()):
+                if master.casefold() not in names:
+                    names[master.casefold()] = master
+                    pending.append(master)
+
+        # Only newer MO2 versions know the light flag, .esl are always light.
+        isLightFlagged = getattr(plugin_list, "isLightFlagged", None)
+        return [
+            (
+                name,
+                name.lower().endswith(".esl")
+                or bool(isLightFlagged and isLightFlagged(name)),
+            )
+            for name in sorted(names.values(), key=plugin_list.priority)
+        ]
+
+
+class PluginsView:
+    """
+    Some of the rows of a Plugins, kept as row numbers. The rows themselves
+    and the name index are the parent's, so a view costs nothing but the
+    list of row numbers. Only valid until the parent is refreshed.
+    """
+
+    def __init__(self, parent: Plugins, rows: list[int]) -> None:
+        self.parent = parent
+        self.__rows = rows
+        # Parent row -> row in this view, built the first time it is needed.
+        self.__positions: dict[int, int] | None = None
+
+    @property
+    def organizer(self) -> mobase.IOrganizer:
+        return self.parent.organizer
+
+    @property
+    def crc_cleaning_data(self) -> crc_cleaning_data:
+        return self.parent.crc_cleaning_data
+
+    @property
+    def rows(self) -> list[int]:
+        """
+        The parent's row numbers of the plugins in this view.
+        """
+        return self.__rows
+
+    def __getitem__(self, value: str | int) -> plugin | None:
+        if isinstance(value, str):
+            plugin = self.parent[value]
+            if plugin is not None and self.indexOf(plugin) >= 0:
+                return plugin
+        elif 0 <= value < len(self.__rows):
+            return self.parent[self.__rows[value]]
+
+        return None
+
+    def __len__(self) -> int:
+        return len(self.__rows)
+
+    def __iter__(self) -> typing.Iterator[plugin]:
+        return (self.parent[row] for row in self.__rows)  # type: ignore
+
+    def indexOf(self, plugin: plugin) -> int:
+        if self.__positions is None:
+            self.__positions = {row: i for i, row in enumerate(self.__rows)}
+        return self.__positions.get(self.parent.indexOf(plugin), -1)
+
+    def file(self, plugin: plugin) -> str | None:
+        return self.parent.file(plugin)
+
+    def session(self, plugin: plugin) -> list[tuple[str, bool]]:
+        return self.parent.session(plugin)
+
 
 class plugin_select_model(QAbstractTableModel):
-    def __init__(self, plugins: Plugins, parent: QWidget | None = None) -> None:
+    def __init__(
+        self, plugins: Plugins, parent: QWidget | None = None, rows: int | None = None
+    ) -> None:
         super().__init__()
         self.__plugins = plugins
+        # Rows the view knows about, fewer than plugins has while loading.
+        self.__rows = len(plugins) if rows is None else rows
 
     def flags(self, index: QModelIndex) -> Qt.ItemFlag:
         if index.isValid():
             p = self.__plugins[index.row()]
-            if p and p["ignore"]:
+            if p and p.ignore:
                 return Qt.ItemFlag.ItemIsEnabled | Qt.ItemFlag.ItemIsSelectable
             return (
                 Qt.ItemFlag.ItemIsEnabled
@@ -465,12 +1048,12 @@ class plugin_select_model(QAbstractTableModel):
     ) -> QModelIndex:
         plugin = self.__plugins[row]
         if plugin:
-            return self.createIndex(row, column, plugin["name"])
+            return self.createIndex(row, column, plugin.name)
 
         return QModelIndex()
 
     def rowCount(self, parent: QModelIndex | None = None) -> int:
-        return len(self.__plugins)
+        return self.__rows
 
     def columnCount(self, parent: QModelIndex | None = None) -> int:
         return 4
@@ -502,74 +1085,75 @@ class plugin_select_model(QAbstractTableModel):
         if not plugin:
             return None
 
-        if index.column() == 0:
+        column = index.column()
+        if column == 0:
             if role == Qt.ItemDataRole.CheckStateRole:
                 return (
                     Qt.CheckState.Checked
-                    if plugin["selected"]
+                    if plugin.selected
                     else Qt.CheckState.Unchecked
                 )
 
             if role in {Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.EditRole}:
-                return plugin["name"]
+                return plugin.name
 
             if role == Qt.ItemDataRole.ToolTipRole:
                 return (
                     "主插件"
-                    if plugin["type"] == plugin_type.PRIMARY
+                    if plugin.type == plugin_type.PRIMARY
                     else (
                         "DLC插件"
-                        if plugin["type"] == plugin_type.DLC
+                        if plugin.type == plugin_type.DLC
                         else (
                             "创作俱乐部插件"
-                            if plugin["type"] == plugin_type.CC
-                            else f"模组: {plugin['origin']}"
+                            if plugin.type == plugin_type.CC
+                            else f"模组: {plugin.origin}"
                         )
                     )
                 )
 
-        elif index.column() == 1:
+        elif column == 1:
             if role == Qt.ItemDataRole.DecorationRole:
-                if plugin["ignore"]:
+                if plugin.ignore:
                     return icons.DO_NOT_CLEAN
 
-                if plugin["state"] == plugin_clean_state.UNKNOWN:
+                if plugin.state == plugin_clean_state.UNKNOWN:
                     return icons.CLEAN_STATE_UNKNOWN
-                elif plugin["state"] == plugin_clean_state.CLEAN:
+                elif plugin.state == plugin_clean_state.CLEAN:
                     return icons.CLEAN_STATE_CLEAN
-                elif plugin["state"] == plugin_clean_state.DIRTY:
+                elif plugin.state == plugin_clean_state.DIRTY:
                     return icons.CLEAN_STATE_DIRTY
-                elif plugin["state"] == plugin_clean_state.REQUIRES_MANUAL:
+                elif plugin.state == plugin_clean_state.REQUIRES_MANUAL:
                     return icons.CLEAN_STATE_MANUAL
             if role == Qt.ItemDataRole.ToolTipRole:
-                if plugin["state"] == plugin_clean_state.UNKNOWN:
+                if plugin.state == plugin_clean_state.UNKNOWN:
                     return "未知清理状态"
-                elif plugin["state"] == plugin_clean_state.CLEAN:
+                elif plugin.state == plugin_clean_state.CLEAN:
                     return (
                         "干净 [无记录]"
-                        if plugin["hasNoRecords"]
+                        if plugin.hasNoRecords
                         else (
                             "干净 [LOOT主列表]"
-                            if plugin["cleaning_data"]
-                            and plugin["cleaning_data"].source == source.LOOT
+                            if plugin.cleaning_data
+                            and plugin.cleaning_data.source == source.LOOT
                             else "干净 [用户数据]"
                         )
                     )
-                elif plugin["state"] == plugin_clean_state.DIRTY:
+                elif plugin.state == plugin_clean_state.DIRTY:
                     return (
                         "脏 [需要清理] [LOOT主列表]"
-                        if plugin["cleaning_data"]
-                        and plugin["cleaning_data"].source == source.LOOT
+                        if plugin.cleaning_data
+                        and plugin.cleaning_data.source == source.LOOT
                         else "脏 [需要清理] [用户数据]"
                     )
-                elif plugin["state"] == plugin_clean_state.REQUIRES_MANUAL:
+                elif plugin.state == plugin_clean_state.REQUIRES_MANUAL:
                     return "需要手动清理"
-        elif index.column() == 2:
+        elif column == 2:
             if role in {Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.EditRole}:
-                return plugin["priority"]
-        elif index.column() == 3:
+                return plugin.priority
+        elif column == 3:
             if role in {Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.EditRole}:
-                return str(plugin["crc"])
+                return str(plugin.crc)
         else:
             return None
 
@@ -587,23 +1171,51 @@ class plugin_select_model(QAbstractTableModel):
             value = value == Qt.CheckState.Checked.value
             plugin = self.__plugins[index.data()]
             if plugin:
-                plugin["selected"] = value
+                plugin.selected = value
 
                 # 只触发当前单元格的更新，不影响其他单元格
                 self.dataChanged.emit(index, index, [Qt.ItemDataRole.CheckStateRole])
 
         return True
 
+    def sync(self, rows: list[int]) -> None:
+        """
+        Shows the plugins added since the last call and updates the given rows.
+        """
+        count = len(self.__plugins)
+        if count > self.__rows:
+            self.beginInsertRows(QModelIndex(), self.__rows, count - 1)
+            self.__rows = count
+            self.endInsertRows()
+        self.update_rows(rows)
+
+    def update_rows(self, rows: list[int]) -> None:
+        for row in rows:
+            self.dataChanged.emit(
+                self.index(row, 0),
+                self.index(row, self.columnCount() - 1),
+                [
+                    Qt.ItemDataRole.CheckStateRole,
+                    Qt.ItemDataRole.DecorationRole,
+                    Qt.ItemDataRole.ToolTipRole,
+                ],
+            )
+
 
 class PluginSelectWindow(QDialog):
-    def __init__(self, plugins: Plugins, parent: QWidget | None = None) -> None:
+    def __init__(
+        self,
+        plugins: Plugins,
+        parent: QWidget | None = None,
+        loading: typing.Iterator[list[int]] | None = None,
+    ) -> None:
         super().__init__(parent)
         self.__main_screen = ui_main_screen.Ui_main_screen()
         self.__main_screen.setupUi(self)  # type: ignore
         # 应用样式
         self.setStyleSheet("QDialog {\n    background-color: #f5f5f5;\n}\nQLineEdit {\n    border: 2px solid #ddd;\n    border-radius: 5px;\n    padding: 5px;\n    background-color: white;\n    font-size: 12px;\n}\nQLineEdit:focus {\n    border: 2px solid #4CAF50;\n}\nQTableView {\n    background-color: white;\n    border: 1px solid #ddd;\n    border-radius: 5px;\n    gridline-color: #eee;\n    font-size: 12px;\n}\nQTableView::item {\n    padding: 5px;\n}\nQTableView::item:selected {\n    background-color: #e3f2fd;\n}\nQHeaderView::section {\n    background-color: #f0f0f0;\n    padding: 5px;\n    border: none;\n    border-right: 1px solid #ddd;\n    border-bottom: 1px solid #ddd;\n    font-weight: bold;\n}")
         self.__plugins = plugins
-        self.__plugins_model = plugin_select_model(plugins)
+        self.__plugins_model = plugin_select_model(plugins, rows=0 if loading else None)
         self.__proxyModel = QSortFilterProxyModel()
         self.__proxyModel.setSourceModel(self.__plugins_model)
         self.__proxyModel.setSortCaseSensitivity(Qt.CaseSensitivity.CaseInsensitive)
@@ -632,6 +1244,76 @@ class PluginSelectWindow(QDialog):
         # 连接选择所有红色脸按钮
         self.__main_screen.selectDirtyButton.clicked.connect(self.select_all_dirty)  # type: ignore
 
+        # LOOT 更新主列表时只重新分类受影响的插件
+        self.__masterlist_timer = QTimer(self)
+        self.__masterlist_timer.setSingleShot(True)
+        self.__masterlist_timer.setInterval(1000)
+        self.__masterlist_timer.timeout.connect(self.masterlist_changed)  # type: ignore
+        self.__masterlist_watcher = QFileSystemWatcher(self)
+        self.__masterlist_watcher.fileChanged.connect(self.masterlist_file_changed)  # type: ignore
+
+        # 插件逐批读取，行随之出现，状态图标随之更新
+        self.loaded = loading is None
+        self.__loading = loading
+        self.__load_timer = QTimer(self)
+        self.__load_timer.setInterval(0)
+        self.__load_timer.timeout.connect(self.load_more)  # type: ignore
+        if loading is None:
+            self.load_finished()
+        else:
+            self.__main_screen.okButton.setEnabled(False)
+            self.__main_screen.selectDirtyButton.setEnabled(False)
+            self.__load_timer.start()
+
+    def load_more(self):
+        # 一帧内读取的行合并为一次模型更新
+        rows = list[int]()
+        deadline = time.perf_counter() + 0.015
+        finished = False
+        try:
+            while time.perf_counter() < deadline:
+                rows.extend(next(self.__loading))  # type: ignore
+        except StopIteration:
+            finished = True
+        except Exception as e:
+            logging.error("Error loading plugins")
+            logging.error(traceback.format_exception(e))
+            self.__load_timer.stop()
+            self.__loading = None
+            self.__plugins_model.sync(rows)
+            # 未读完的插件状态不可信，不能据此清理
+            QMessageBox.critical(
+                self,
+                "Failed to load plugins",
+                f"Loading the plugins failed, see the MO2 log for details.\n\n{e}",
+            )
+            self.reject()
+            return
+
+        self.__plugins_model.sync(rows)
+        if finished:
+            self.__load_timer.stop()
+            self.load_finished()
+
+    def load_finished(self):
+        self.loaded = True
+        self.__loading = None
+        self.__main_screen.okButton.setEnabled(True)
+        self.__main_screen.selectDirtyButton.setEnabled(True)
+        loot_index = self.__plugins.loot_index
+        if loot_index and loot_index.masterlist.is_file():
+            self.__masterlist_watcher.addPath(str(loot_index.masterlist))
+
+    def masterlist_file_changed(self, path: str):
+        # LOOT replaces the file, which removes it from the watcher
+        if path not in self.__masterlist_watcher.files() and Path(path).is_file():
+            self.__masterlist_watcher.addPath(path)
+        # Wait for LOOT to finish writing
+        self.__masterlist_timer.start()
+
+    def masterlist_changed(self):
+        self.__plugins_model.update_rows(self.__plugins.update_loot_data())
+
     def filter(self):
         filter_text = self.__main_screen.filterEdit.text()
         if filter_text:
@@ -642,14 +1324,12 @@ class PluginSelectWindow(QDialog):
     def select_all_dirty(self):
         """选择所有状态为 DIRTY (红色脸) 的插件"""
         model = self.__plugins_model
-        for row in range(model.rowCount()):
-            index = model.index(row, 0)
-            plugin_name = model.data(index, Qt.ItemDataRole.DisplayRole)
-            if plugin_name:
-                plugin = self.__plugins[plugin_name]
-                if plugin and plugin["state"] == plugin_clean_state.DIRTY and not plugin["ignore"]:
-                    # 设置为选中状态
-                    model.setData(index, Qt.CheckState.Checked.value, Qt.ItemDataRole.CheckStateRole)
+        dirty = self.__plugins.view(
+            lambda p: p.state == plugin_clean_state.DIRTY and not p.ignore
+        )
+        for row in dirty.rows:
+            # 设置为选中状态
+            model.setData(model.index(row, 0), Qt.CheckState.Checked.value, Qt.ItemDataRole.CheckStateRole)
 
     def show_context_menu(self, position: QPoint):
         context_menu = QMenu(self)
@@ -670,7 +1350,7 @@ class PluginSelectWindow(QDialog):
         if not plugin:
             return
 
-        action = QAction("允许清理" if plugin["ignore"] else "不要清理", self)
+        action = QAction("允许清理" if plugin.ignore else "不要清理", self)
         action.setToolTip("不允许清理此插件")
         action.triggered.connect(self.context_menu_toggle_ignore)  # type: ignore
         context_menu.addAction(action)  # type: ignore
@@ -696,17 +1376,17 @@ class PluginSelectWindow(QDialog):
 
         plugin = self.__plugins[index.data()]
         if plugin:
-            plugin["ignore"] = not plugin["ignore"]
+            plugin.ignore = not plugin.ignore
             self.__plugins.organizer.setPluginSetting(
                 CleanerPlugin.NAME(),
                 "do_not_clean",
                 ",".join(self.__plugins.get_ignored()),
             )
 
-            if plugin["ignore"]:
-                plugin["selected"] = False
+            if plugin.ignore:
+                plugin.selected = False
             else:
-                plugin["selected"] = self.__plugins.selected_default(plugin)
+                plugin.selected = self.__plugins.selected_default(plugin)
 
             model.dataChanged.emit(
                 index,
@@ -758,7 +1438,7 @@ class PluginSelectWindow(QDialog):
 
 
 class plugin_progress_model(QAbstractTableModel):
-    def __init__(self, plugins: Plugins, parent: QWidget | None = None) -> None:
+    def __init__(self, plugins: "Plugins | PluginsView", parent: QWidget | None = None) -> None:
         super().__init__()
         self.__plugins = plugins
 
@@ -773,7 +1453,7 @@ class plugin_progress_model(QAbstractTableModel):
     ) -> QModelIndex:
         plugin = self.__plugins[row]
         if plugin:
-            return self.createIndex(row, column, plugin["name"])
+            return self.createIndex(row, column, plugin.name)
 
         return QModelIndex()
 
@@ -808,32 +1488,33 @@ class plugin_progress_model(QAbstractTableModel):
         if not plugin:
             return None
 
-        if index.column() == 0:
+        column = index.column()
+        if column == 0:
             if role in {Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.EditRole}:
-                return plugin["name"]
+                return plugin.name
 
             if role == Qt.ItemDataRole.ToolTipRole:
                 return (
                     "主插件"
-                    if plugin["type"] == plugin_type.PRIMARY
+                    if plugin.type == plugin_type.PRIMARY
                     else (
                         "DLC插件"
-                        if plugin["type"] == plugin_type.DLC
+                        if plugin.type == plugin_type.DLC
                         else (
                             "创作俱乐部插件"
-                            if plugin["type"] == plugin_type.CC
-                            else f"模组: {plugin['origin']}"
+                            if plugin.type == plugin_type.CC
+                            else f"模组: {plugin.origin}"
                         )
                     )
                 )
-        elif index.column() == 1:
+        elif column == 1:
             if role in {Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.EditRole}:
-                return plugin["priority"]
-        elif index.column() == 2:
+                return plugin.priority
+        elif column == 2:
             if role in {Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.EditRole}:
                 return (
-                    str(plugin["processed"])
-                    if plugin["processed"]
+                    str(plugin.processed)
+                    if plugin.processed
                     else "排队中..."
                 )
         else:
@@ -842,7 +1523,7 @@ class plugin_progress_model(QAbstractTableModel):
     def update(self, plugin: plugin, processed: str | bool) -> None:
         index = self.__plugins.indexOf(plugin)
         if index >= 0:
-            plugin["processed"] = processed
+            plugin.processed = processed
 
             self.dataChanged.emit(
                 self.index(index, 0),
@@ -852,7 +1533,7 @@ class plugin_progress_model(QAbstractTableModel):
 
 
 class PluginProgressWindow(QDialog):
-    def __init__(self, plugins: Plugins, parent: QWidget | None = None) -> None:
+    def __init__(self, plugins: "Plugins | PluginsView", parent: QWidget | None = None) -> None:
         super().__init__(parent)
         self.__canceled = False
         self.__stopped = False
@@ -887,6 +1568,47 @@ class PluginProgressWindow(QDialog):
         )
         os.makedirs(self.__outputPath, exist_ok=True)
 
+        archive_max_mb = self.__organizer.pluginSetting(
+            CleanerPlugin.NAME(), "log_archive_max_mb"
+        )
+        archive_max_days = self.__organizer.pluginSetting(
+            CleanerPlugin.NAME(), "log_archive_max_days"
+        )
+        self.__archive = LogArchive.get(
+            self.__outputPath / "logs",
+            max(0, to_int(archive_max_mb)) * 1024 * 1024,
+            max(0, to_int(archive_max_days)) * 24 * 60 * 60,
+        )
+        # Index the records cleaned in every log as it is archived.
+        self.__records = RecordStore.get(self.__outputPath / "records.sqlite")
+        if self.__records.add_archived not in self.__archive.listeners:
+            self.__archive.listeners.append(self.__records.add_archived)
+        # Logs kept before there was an archive.
+        self.__archive.adopt(self.__outputPath)
+
+        # xEdit writes its log to the staging directory, a fast local drive
+        # by default, and kept logs are moved from there to the archive in
+        # the background. One per MO2 instance, in case several share it.
+        staging = self.__organizer.pluginSetting(
+            CleanerPlugin.NAME(), "log_staging_dir"
+        )
+        instance = hashlib.blake2b(
+            str(self.__outputPath).encode(), digest_size=4
+        ).hexdigest()
+        self.__logPath = (
+            Path(str(staging) or tempfile.gettempdir())
+            / CleanerPlugin.NAME()
+            / instance
+        )
+        try:
+            os.makedirs(self.__logPath, exist_ok=True)
+        except Exception as e:
+            logging.error(f'Error creating log staging directory "{self.__logPath}"')
+            logging.error(traceback.format_exception(e))
+            self.__logPath = self.__outputPath
+        # Logs left in staging when MO2 closed mid clean.
+        self.__archive.adopt(self.__logPath)
+
         self.__xEditArgs = list(launchOptions)
         # TODO: Re-enable this if I find a way to force xEdit to perform backups if disabled in GUI, as this just tells it where to back up but won't force it to create backups
         # if self.__organizer.pluginSetting(CleanerPlugin.NAME(), "save_dirty_plugins"):
@@ -912,6 +1634,16 @@ class PluginProgressWindow(QDialog):
             else gameInfo[self.__organizer.managedGame().gameShortName()]["xEditName"]
         )
 
+        # Plugin -> the plugins loaded to clean it, casefolded
+        self.__loads = dict[str, frozenset[str]]()
+
+        self.__xEditTimeout = max(
+            0,
+            to_int(
+                self.__organizer.pluginSetting(CleanerPlugin.NAME(), "xedit_timeout")
+            ),
+        )
+
         logging.debug(f"MO2 Application to launch: {self.__xEditExecutableName}")
         logging.debug(f"Args: {self.__xEditArgs}")
 
@@ -941,146 +1673,408 @@ class PluginProgressWindow(QDialog):
         userFile = Path(self.__organizer.getPluginDataPath()) / "cleaning_data.csv"
 
         keep_log_level = self.get_log_level()
+        self.__clean_scheduled(self.worker_count(), keep_log_level, userFile)
+
+        self.__main_screen.cancelButton.setText("Close")
+        self.__stopped = True
+        if not self.__canceled and self.__organizer.pluginSetting(
+            CleanerPlugin.NAME(), "auto_close"
+        ):
+            self.close()
+
+    def worker_count(self) -> int:
+        """
+        How many xEdit processes to run at once, as set but capped by the
+        memory available now. Only one where they can't be polled.
+        """
+        if not xedit_log.can_poll():
+            return 1
+        workers = to_int(
+            self.__organizer.pluginSetting(CleanerPlugin.NAME(), "xedit_workers"), 1
+        )
+        memory = to_int(
+            self.__organizer.pluginSetting(
+                CleanerPlugin.NAME(), "xedit_worker_memory_mb"
+            ),
+            2048,
+        )
+        return scheduler.worker_count(workers, max(0, memory) * 1024 * 1024)
+
+    def __clean_scheduled(
+        self, workers: int, keep_log_level: keep_logs, userFile: Path
+    ) -> None:
+        """
+        Cleans the plugins with up to workers xEdit processes at once, each
+        with its own log, taking in each result as its process exits.
+
+        Where processes can be polled nothing here waits on xEdit: a timer
+        checks on the processes and the dialog's events are handled in
+        between, so it stays responsive for the whole run. Elsewhere the one
+        process is waited for in waitForApplication. The organizer is only
+        used from the GUI thread. A plugin is not cleaned while one of its
+        masters or dependents is.
+        """
+        self.__loads.clear()
+        runs = list[xedit_run]()
         for x in range(len(self.__plugins)):
             plugin = self.__plugins[x]
             if not plugin:
                 self.__stopped = True
                 raise ValueError("Plugin not found")
+            runs.append(xedit_run(x, plugin, self.log_file_name(plugin)))
+        runs = self.__batches(runs)
 
-            if self.__canceled:
-                self.__plugins_model.update(plugin, "Canceled")
-                continue
-
-            self.__plugins_model.update(plugin, "Processing...")
-
-            self.__main_screen.pluginsView.selectRow(x)
-            self.__main_screen.pluginsView.scrollTo(self.__proxyModel.index(x, 0))
-
-            result = self.clean(plugin)
-            if isinstance(result, crc_cleaning_data):
-                result_length = len(result)
-                if result_length == 0:
-                    logging.error(
-                        "No files detected in LOOT data from xEdit run. This should never happen."
-                    )
-                    self.reject()
-                    continue
-                elif result_length == 1:
-                    pass
-                else:
-                    logging.error(
-                        "Multiple different files detected in LOOT data from xEdit run. This should never happen."
-                    )
-                    self.reject()
-                    continue
-
-                name = plugin["name"].casefold()
-                if name not in result:
-                    logging.error(
-                        "Plugin name not found in LOOT data from xEdit run. This should never happen."
-                    )
-                    self.reject()
-                    continue
-
-                updatedData = result[name]
-                if plugin["crc"] is None:
-                    logging.error(
-                        "Plugin CRC is None. This should never happen."
-                    )
-                    self.reject()
-                    continue
-                    
-                if plugin["crc"] not in updatedData:
-                    logging.error(
-                        "Plugin CRC not found in LOOT data from xEdit run. This should never happen."
-                    )
-                    self.reject()
-                    continue
-
-                crc_cleaning_data.update(self.__plugins.crc_cleaning_data, result)
-                cleaning_data.CsvData.save(self.__plugins.crc_cleaning_data, userFile)
+        if xedit_log.can_poll():
+            poll = xedit_log.exit_code
+        else:
 
-                crcData = updatedData[plugin["crc"]]
+            def poll(handle: int) -> int | None:
+                run = jobs.running[handle]
+                run.exited = self.__organizer.waitForApplication(handle, False)
+                return run.exited[1]
 
-                log_level = keep_logs.UNKNOWN
-                if crcData.is_clean():
-                    self.__plugins_model.update(plugin, "Clean")
-                    log_level = keep_logs.ALL
-                else:
-                    cleanedCrc = None
-                    cleanedData = None
-
-                    if crcData.is_auto_cleanable():
-                        for crc, data in updatedData.items():
-                            if crc == plugin["crc"]:
-                                continue
-                            cleanedCrc = crc
-                            cleanedData = data
-                            if not data.is_auto_cleanable():
-                                break
-
-                        if cleanedCrc and cleanedData:
-                            if cleanedData.is_clean():
-                                self.__plugins_model.update(
-                                    plugin,
-                                    f"Cleaned - ITM: {crcData.itm} UDR: {crcData.udr}",
-                                )
-                                log_level = keep_logs.CLEANED
-                            elif not cleanedData.is_auto_cleanable():
-                                self.__plugins_model.update(
-                                    plugin,
-                                    f"Attention manual cleaning required - NAV: {crcData.nav}. Cleaned - ITM: {crcData.itm} UDR: {crcData.udr}",
-                                )
-                                log_level = keep_logs.MANUAL
-                            else:
-                                self.__plugins_model.update(
-                                    plugin,
-                                    f"Attention unknown cleaning state - Original/Cleaned ITM: {crcData.itm}/{cleanedData.itm} UDR: {crcData.udr}/{cleanedData.udr} NAV: {crcData.nav}/{cleanedData.nav}",
-                                )
-                        else:
-                            self.__plugins_model.update(
-                                plugin,
-                                f"Attention not cleaned - ITM: {crcData.itm} UDR: {crcData.udr} NAV: {crcData.nav}",
-                            )
+        jobs = scheduler.scheduler(
+            runs, workers, self.__start, poll, self.__conflicts
+        )
+        # Sessions that exited, while the plugins they cleaned are hashed.
+        hash_pool = ThreadPoolExecutor(1, "Hash")
+        finishing = list[tuple[xedit_run, bool, dict[int, Future[crc32]]]]()
+        loop = QEventLoop(self)
+        # Often enough that a plugin finishing is noticed well within a
+        # second, each check is a few system calls per process.
+        timer = QTimer(self)
+        timer.setInterval(100)
+
+        stepping = False
+
+        def cancel() -> None:
+            if self.__canceled:
+                for run in jobs.cancel():
+                    for member in run.members():
+                        self.__plugins_model.update(member.plugin, "Canceled")
+
+        def step() -> None:
+            nonlocal stepping
+            # A message box shown while starting xEdit runs its own event loop.
+            if stepping:
+                return
+            stepping = True
+            try:
+                cancel()
+
+                for run in list(jobs.running.values()):
+                    self.watch_xEdit(run)
+
+                for run, exitCode in jobs.step():
+                    run.watching = False
+                    waitResult = run.exited[0] if run.exited else True
+                    if run.batch is not None:
+                        failed = self.__batch_failed(run, waitResult, exitCode)
+                        hashes = {} if failed else self.__hash_batch(run, hash_pool)
+                        finishing.append((run, failed, hashes))
+                        continue
+                    if exitCode is None:
+                        result = "Failed to start xEdit"
                     else:
-                        self.__plugins_model.update(
-                            plugin, f"Requires manual cleaning - NAV: {crcData.nav}"
+                        result = self.__result(run, waitResult, exitCode)
+                    self.__ingest(run.plugin, result, keep_log_level, userFile)
+
+                for entry in list(finishing):
+                    run, failed, hashes = entry
+                    if all(future.done() for future in hashes.values()):
+                        finishing.remove(entry)
+                        crcs = {row: hashed.result() for row, hashed in hashes.items()}
+                        # Plugins the session did not clean get one of their own.
+                        jobs.pending.extend(
+                            self.__finish_batch(
+                                run, failed, crcs, keep_log_level, userFile
+                            )
                         )
-                        log_level = keep_logs.MANUAL
 
-                if log_level > keep_log_level:
-                    os.remove(self.log_file_name(plugin))
-            else:
-                logging.error(f"Plugin {plugin['name']} was not cleaned: {result}")
-                self.__plugins_model.update(plugin, result)
-                self.reject()
-
-        self.__main_screen.cancelButton.setText("Close")
-        self.__stopped = True
-        if not self.__canceled and self.__organizer.pluginSetting(
-            CleanerPlugin.NAME(), "auto_close"
-        ):
-            self.close()
+                # Starting xEdit failing cancels the rest, don't try them.
+                cancel()
+            finally:
+                stepping = False
+
+            if jobs.done() and not finishing:
+                timer.stop()
+                loop.quit()
+
+        timer.timeout.connect(step)
+        timer.start()
+        try:
+            step()
+            if not jobs.done() or finishing:
+                loop.exec()
+        finally:
+            hash_pool.shutdown(False, cancel_futures=True)
+            timer.stop()
+            timer.deleteLater()
+
+    def __plugin_loads(self, plugin: plugin) -> frozenset[str]:
+        name = plugin.name.casefold()
+        if name not in self.__loads:
+            self.__loads[name] = frozenset(
+                master.casefold() for master, _ in self.__plugins.session(plugin)
+            )
+        return self.__loads[name]
+
+    def __conflicts(self, run: "xedit_run", other: "xedit_run") -> bool:
+        """
+        Whether run cleans a master of a plugin other cleans, or the other
+        way round. xEdit saves cleaned plugins while other processes may have
+        them loaded as masters, so those must not run at the same time.
+        """
+        cleans = {member.plugin.name.casefold() for member in run.members()}
+        other_cleans = {member.plugin.name.casefold() for member in other.members()}
+        return any(
+            not cleans.isdisjoint(self.__plugin_loads(member.plugin))
+            for member in other.members()
+        ) or any(
+            not other_cleans.isdisjoint(self.__plugin_loads(member.plugin))
+            for member in run.members()
+        )
 
-    def log_file_name(self, plugin: plugin) -> str:
-        return str(self.__outputPath / f"{plugin['name']}_{plugin['crc']}.log")
+    def __batches(self, runs: list["xedit_run"]) -> list["xedit_run"]:
+        """
+        Puts plugins with the same masters, overriding none of the same
+        records, together in xEdit sessions of up to xedit_batch_size
+        plugins, so the masters are only loaded once per session. Returns the
+        sessions and the plugins cleaned on their own, in the order of their
+        first plugin.
+        """
+        size = to_int(
+            self.__organizer.pluginSetting(CleanerPlugin.NAME(), "xedit_batch_size")
+        )
+        if size < 2:
+            return runs
+
+        game = self.__organizer.managedGame().gameShortName()
+        candidates = list[tuple[xedit_run, list[str]]]()
+        jobs = list[xedit_run]()
+        masters = dict[int, list[str]]()
+        for run in runs:
+            path = self.__plugins.file(run.plugin)
+            found = (
+                xedit_batch.plugin_masters(path, game)
+                if path and run.plugin.crc is not None
+                else None
+            )
+            if found is None:
+                jobs.append(run)
+            else:
+                masters[run.row] = found
+                candidates.append((run, found))
 
-    def clean(self, plugin: plugin) -> crc_cleaning_data | str:
-        args = list(self.__xEditArgs)
+        def overrides(run: xedit_run) -> frozenset[tuple[str, int]] | None:
+            path = self.__plugins.file(run.plugin)
+            return (
+                xedit_batch.plugin_overrides(path, game, masters[run.row])
+                if path
+                else None
+            )
 
-        logFile = self.log_file_name(plugin)
+        for group in xedit_batch.group_by_masters(candidates, size, overrides):
+            if len(group) == 1:
+                jobs.append(group[0])
+                continue
+            session = xedit_run(
+                group[0].row,
+                group[0].plugin,
+                str(self.__logPath / f"batch_{group[0].plugin.name}.log"),
+            )
+            session.batch = group
+            # Their masters' masters too, in load order, xEdit needs them all.
+            session.masters = [
+                name
+                for name, _ in self.__plugins.session(group[0].plugin)
+                if name.casefold() != group[0].plugin.name.casefold()
+            ]
+            jobs.append(session)
+
+        jobs.sort(key=lambda run: run.row)
+        return jobs
+
+    def __batch_args(self, run: "xedit_run") -> list[str]:
+        """
+        Writes the script and plugins.txt of an xEdit session cleaning
+        several plugins and returns its arguments.
+        """
+        assert run.batch is not None
+        script, plugins = self.__batch_files(run)
+        for member in run.batch:
+            # The script writes each plugin's log, don't read an old one.
+            try:
+                os.remove(member.logFile)
+            except FileNotFoundError:
+                pass
+        # Without a BOM xEdit reads the script in the ANSI code page.
+        with open(script, "w", encoding="utf-8-sig") as file:
+            file.write(
+                xedit_batch.script(
+                    [
+                        (member.plugin.name, member.plugin.crc, member.logFile)
+                        for member in run.batch
+                    ]  # type: ignore
+                )
+            )
+        with open(plugins, "w", encoding="utf-8") as file:
+            file.write(
+                xedit_batch.plugins_txt(
+                    self.__organizer.managedGame().gameShortName(),
+                    run.masters or [],
+                    [member.plugin.name for member in run.batch],
+                )
+            )
 
-        # Add unique per plugin args
+        args = [arg for arg in self.__xEditArgs if arg != "-QuickAutoClean"]
         args.extend(
             (
-                f'-R:"{logFile}"',
-                f'"{plugin["name"]}"',
+                f'-script:"{script}"',
+                f'-P:"{plugins}"',
+                f'-R:"{run.logFile}"',
             )
         )
+        return args
+
+    def __batch_files(self, run: "xedit_run") -> tuple[Path, Path]:
+        """
+        Returns the script and plugins.txt of an xEdit session, named after
+        its log.
+        """
+        stem = run.logFile.removesuffix(".log")
+        return Path(f"{stem}.pas"), Path(f"{stem}.txt")
+
+    def __batch_failed(
+        self, run: "xedit_run", waitResult: bool, exitCode: int | None
+    ) -> bool:
+        """
+        Whether an xEdit session failed, logging why if it did.
+        """
+        assert run.batch is not None
+        failed = exitCode is None or bool(
+            run.stop_reason or not waitResult or exitCode != 0
+        )
+        if failed:
+            reason = (
+                "Failed to start xEdit"
+                if exitCode is None
+                else self.__result(run, waitResult, exitCode)
+            )
+            logging.error(
+                f"xEdit session cleaning {len(run.batch)} plugins failed: {reason}"
+            )
+        return failed
+
+    def __hash_batch(
+        self, run: "xedit_run", pool: ThreadPoolExecutor
+    ) -> dict[int, Future[crc32]]:
+        """
+        Hashes the plugins an xEdit session cleaned on the pool, so the
+        dialog doesn't wait on reading them. Returns the hashes by row.
+        """
+        assert run.batch is not None
+        hashes = dict[int, Future[crc32]]()
+        for member in run.batch:
+            path = self.__plugins.file(member.plugin)
+            if path:
+                hashes[member.row] = pool.submit(crc32.from_file, path)
+                self.__plugins_model.update(member.plugin, "Checking the result...")
+        return hashes
+
+    def __finish_batch(
+        self,
+        run: "xedit_run",
+        failed: bool,
+        hashes: dict[int, crc32],
+        keep_log_level: keep_logs,
+        userFile: Path,
+    ) -> list["xedit_run"]:
+        """
+        Takes in the result of each plugin an xEdit session cleaned, given
+        the CRCs of the plugins after it. Returns the plugins it did not
+        clean, to be cleaned one at a time.
+        """
+        assert run.batch is not None
+        retry = list[xedit_run]()
+        for member in run.batch:
+            result = (
+                None
+                if failed
+                else self.__batch_result(
+                    member, hashes.get(member.row, member.plugin.crc)
+                )
+            )
+            if result is None:
+                self.__plugins_model.update(member.plugin, "Waiting to clean on its own")
+                retry.append(xedit_run(member.row, member.plugin, member.logFile))
+            else:
+                self.__ingest(member.plugin, result, keep_log_level, userFile)
+
+        keep = failed or retry or keep_log_level >= keep_logs.ALL
+        for file in (run.logFile, *self.__batch_files(run)):
+            if keep and file == run.logFile:
+                self.__archive.add(run.logFile)
+                continue
+            try:
+                os.remove(file)
+            except FileNotFoundError:
+                pass
+        return retry
+
+    def __batch_result(
+        self, member: "xedit_run", cleaned: crc32 | None
+    ) -> crc_cleaning_data | None:
+        """
+        Returns the cleaning data an xEdit session logged for one plugin,
+        with cleaned, the CRC of the plugin after the session, added, or
+        None if it did not clean it.
+        """
+        plugin = member.plugin
+        result = cleaning_data.LootData.from_xEdit_log(member.logFile)
+        name = plugin.name.casefold()
+        if not result or name not in result or plugin.crc not in result[name]:
+            return None
+
+        data = result[name][plugin.crc]
+        if data.is_clean() or not data.is_auto_cleanable():
+            # Nothing for xEdit to change.
+            return result
+
+        if cleaned == plugin.crc or not xedit_batch.complete_log(
+            member.logFile, cleaned, data.nav
+        ):
+            # The session did not save the plugin.
+            return None
+        return cleaning_data.LootData.from_xEdit_log(member.logFile)
+
+    def __start(self, run: "xedit_run") -> int | None:
+        """
+        Starts xEdit cleaning one plugin, or several in one session. Returns
+        its process handle, or None if it could not be started.
+        """
+        if run.batch is not None:
+            args = self.__batch_args(run)
+        else:
+            # So the FormIDs in its log can be tied to the plugins they are from.
+            self.__records.set_session(
+                run.plugin.name, self.__plugins.session(run.plugin)
+            )
+            args = list(self.__xEditArgs)
+
+            # Add unique per plugin args
+            args.extend(
+                (
+                    f'-R:"{run.logFile}"',
+                    f'"{run.plugin.name}"',
+                )
+            )
 
         logging.debug(
             f"Running MO2 Application: {self.__xEditExecutableName} Args: {args}"
         )
+        # Created before xEdit starts so anything already in the log is skipped.
+        run.tail = xedit_log.xEditLogTail(run.logFile)
         exe = self.__organizer.startApplication(self.__xEditExecutableName, args)
 
         if exe == mobase.INVALID_HANDLE_VALUE:
@@ -1090,118 +2084,213 @@ class PluginProgressWindow(QDialog):
                 "Failed to start xEdit",
                 f'Make sure xEdit is registered as an executable (Ctrl+E) with the name "{self.__xEditExecutableName}"',
             )
-            return "Failed to start xEdit"
+            return None
 
-        waitResult, exitCode = self.__organizer.waitForApplication(exe, False)
-        if not waitResult:
-            self.__canceled = True
-            return "Failed to wait for xEdit"
+        run.handle = exe
+        run.watching = True
+        for member in run.members():
+            self.__plugins_model.update(member.plugin, "Processing...")
+        self.__main_screen.pluginsView.selectRow(run.row)
+        self.__main_screen.pluginsView.scrollTo(self.__proxyModel.index(run.row, 0))
+        return exe
 
-        if exitCode != 0:
-            return f"xEdit exit code {exitCode}"
+    def __ingest(
+        self,
+        plugin: plugin,
+        result: crc_cleaning_data | str,
+        keep_log_level: keep_logs,
+        userFile: Path,
+    ) -> None:
+        """
+        Records the result of cleaning one plugin and keeps or drops its log.
+        """
+        if isinstance(result, crc_cleaning_data):
+            result_length = len(result)
+            if result_length == 0:
+                logging.error(
+                    "No files detected in LOOT data from xEdit run. This should never happen."
+                )
+                self.reject()
+                return
+            elif result_length == 1:
+                pass
+            else:
+                logging.error(
+                    "Multiple different files detected in LOOT data from xEdit run. This should never happen."
+                )
+                self.reject()
+                return
 
-        cd = cleaning_data.LootData.from_xEdit_log(logFile)
-        return cd if cd else "No LOOT cleaning data found in xEdit log file"
+            name = plugin.name.casefold()
+            if name not in result:
+                logging.error(
+                    "Plugin name not found in LOOT data from xEdit run. This should never happen."
+                )
+                self.reject()
+                return
 
+            updatedData = result[name]
+            if plugin.crc is None:
+                logging.error(
+                    "Plugin CRC is None. This should never happen."
+                )
+                self.reject()
+                return
+                
+            if plugin.crc not in updatedData:
+                logging.error(
+                    "Plugin CRC not found in LOOT data from xEdit run. This should never happen."
+                )
+                self.reject()
+                return
 
-class CleanerPlugin(mobase.IPluginTool):
+            crc_cleaning_data.update(self.__plugins.crc_cleaning_data, result)
+            cleaning_data.CsvData.save(self.__plugins.crc_cleaning_data, userFile)
 
-    __organizer: mobase.IOrganizer
+            crcData = updatedData[plugin.crc]
 
-    def __init__(self):
-        super().__init__()
+            log_level = keep_logs.UNKNOWN
+            if crcData.is_clean():
+                self.__plugins_model.update(plugin, "Clean")
+                log_level = keep_logs.ALL
+            else:
+                cleanedCrc = None
+                cleanedData = None
+
+                if crcData.is_auto_cleanable():
+                    for crc, data in updatedData.items():
+                        if crc == plugin.crc:
+                            continue
+                        cleanedCrc = crc
+                        cleanedData = data
+                        if not data.is_auto_cleanable():
+                            break
+
+                    if cleanedCrc and cleanedData:
+                        if cleanedData.is_clean():
+                            self.__plugins_model.update(
+                                plugin,
+                                f"Cleaned - ITM: {crcData.itm} UDR: {crcData.udr}",
+                            )
+                            log_level = keep_logs.CLEANED
+                        elif not cleanedData.is_auto_cleanable():
+                            self.__plugins_model.update(
+                                plugin,
+                                f"Attention manual cleaning required - NAV: {crcData.nav}. Cleaned - ITM: {crcData.itm} UDR: {crcData.udr}",
+                            )
+                            log_level = keep_logs.MANUAL
+                        else:
+                            self.__plugins_model.update(
+                                plugin,
+                                f"Attention unknown cleaning state - Original/Cleaned ITM: {crcData.itm}/{cleanedData.itm} UDR: {crcData.udr}/{cleanedData.udr} NAV: {crcData.nav}/{cleanedData.nav}",
+                            )
+                    else:
+                        self.__plugins_model.update(
+                            plugin,
+                            f"Attention not cleaned - ITM: {crcData.itm} UDR: {crcData.udr} NAV: {crcData.nav}",
+                        )
+                else:
+                    self.__plugins_model.update(
+                        plugin, f"Requires manual cleaning - NAV: {crcData.nav}"
+                    )
+                    log_level = keep_logs.MANUAL
 
-    def init(self, organizer: mobase.IOrganizer):
-        self.__organizer = organizer
-        return True
+            if log_level > keep_log_level:
+                os.remove(self.log_file_name(plugin))
+            else:
+                self.__archive.add(self.log_file_name(plugin))
+        else:
+            logging.error(f"Plugin {plugin.name} was not cleaned: {result}")
+            self.__plugins_model.update(plugin, result)
+            self.__archive.add(self.log_file_name(plugin))
+            self.reject()
 
-    @staticmethod
-    def NAME() -> str:
-        return "Batch Plugin Cleaner"
+    def watch_xEdit(self, run: "xedit_run") -> None:
+        if not run.watching or run.tail is None or run.handle is None:
+            return
 
-    def name(self) -> str:
-        return CleanerPlugin.NAME()
+        if run.tail.poll():
+            for member in run.members():
+                self.__plugins_model.update(
+                    member.plugin, f"Processing... {run.tail.status()}"
+                )
 
-    def author(self) -> str:
-        return "bluebuiy & wxMichael & GoriRed"
+        # An error in the log only fails the run if xEdit exits with an error
+        # too, __result() reports it then. If xEdit is left waiting on the
+        # error instead, the log stops growing and the timeout stops it.
+        if not self.__xEditTimeout or run.tail.idle() <= self.__xEditTimeout:
+            return
+        reason = f"No progress in the log for {self.__xEditTimeout} seconds"
+        if run.tail.failure:
+            reason += f" after: {run.tail.failure}"
+
+        logging.error(f"Stopping xEdit cleaning {run.plugin.name}: {reason}")
+        run.watching = False
+        if xedit_log.terminate(run.handle):
+            run.stop_reason = reason
+        else:
+            logging.error("Failed to stop xEdit, waiting for it to exit.")
 
-    def displayName(self):
-        return "Clean Plugins"
+    def log_file_name(self, plugin: plugin) -> str:
+        return str(self.__logPath / f"{plugin.name}_{plugin.crc}.log")
 
-    def description(self) -> str:
-        return f"Clean all plugins with one button. Requires {gameInfo[self.__organizer.managedGame().gameShortName()]['xEditName']}"
+    def __result(
+        self, run: "xedit_run", waitResult: bool, exitCode: int
+    ) -> crc_cleaning_data | str:
+        """
+        Returns the cleaning data xEdit logged, or why there is none.
+        """
+        if run.stop_reason:
+            return f"xEdit stopped: {run.stop_reason}"
 
-    def version(self) -> mobase.VersionInfo:
-        return mobase.VersionInfo(1, 2, 0, mobase.ReleaseType.FINAL)
+        if not waitResult:
+            self.__canceled = True
+            return "Failed to wait for xEdit"
 
-    def isActive(self) -> bool:
-        return self.__organizer.pluginSetting(self.name(), "enabled")  # type: ignore
+        if exitCode != 0:
+            if run.tail:
+                run.tail.poll()
+                if run.tail.failure:
+                    return f"xEdit exit code {exitCode}: {run.tail.failure}"
+            return f"xEdit exit code {exitCode}"
 
-    def tooltip(self) -> str:
-        return "Clean all plugins at once"
+        cd = cleaning_data.LootData.from_xEdit_log(run.logFile)
+        return cd if cd else "No LOOT cleaning data found in xEdit log file"
 
-    def settings(self) -> list[mobase.PluginSetting]:
-        return [
-            mobase.PluginSetting("enabled", "enable this plugin", True),
-            mobase.PluginSetting("clean_beth", "Clean base game plugins", False),
-            mobase.PluginSetting("clean_cc", "Clean Creation Club plugins", True),
-            mobase.PluginSetting("clean_else", "Clean mod plugins", True),
-            mobase.PluginSetting(
-                "explicit_data_path",
-                "If the data directory should be explicitly provided.  May need to be enabled if you get errors from xEdit.",
-                False,
-            ),
-            mobase.PluginSetting(
-                "explicit_ini_path",
-                "If the ini path should be explicitly provided.  May need to be enabled if you get errors from xEdit.",
-                False,
-            ),
-            # TODO: Re-enable this if I find a way to force xEdit to perform backups if disabled in GUI
-            # mobase.PluginSetting(
-            #    "save_dirty_plugins",
-            #    "Saves xEdit backups of dirty plugins to 'Batch Plugin Cleaner' folder under MO2/Plugins/Data/ path.",
-            #    True,
-            # ),
-            mobase.PluginSetting(
-                "keep_logs",
-                "xEdit log files to keep. 0=None, 1=Unknown, 3=Manual Cleaning Required, 4=Cleaned, 5=All",
-                4,
-            ),
-            mobase.PluginSetting(
-                "auto_close",
-                "Auto close plugin selection window after clean.",
-                True,
-            ),
-            mobase.PluginSetting(
-                "exe_name_xedit",
-                "Invoke xEdit as xEdit, not a game-specific name such as FO4Edit.",
-                False,
-            ),
-            mobase.PluginSetting(
-                "first_dynamic",
-                "Will not auto select this plugin or any with higher priority",
-                "",
-            ),
-            mobase.PluginSetting(
-                "do_not_clean",
-                "Will not allow cleaning of listed plugins even if known dirty. Comma separated list.",
-                "",
-            ),
-        ]
 
-    def icon(self) -> QIcon:
-        return QIcon()
-
-    def display(self) -> None:
-        logging.debug(f"{self.name()} logging started")
-        logging.debug(f"Game: {self.__organizer.managedGame().gameShortName()}")
-        plugins = Plugins.All(self.__organizer)
-        dialog = PluginSelectWindow(plugins, self._parentWidget())
-        if dialog.exec():
-            dialog = PluginProgressWindow(
-                Plugins.Selected(plugins), self._parentWidget()
-            )
-            dialog.open()
-            dialog.clean_all()
+class xedit_run:
+    """
+    One xEdit process cleaning a plugin, and the row it is shown in.
+    """
+
+    __slots__ = (
+        "row",
+        "plugin",
+        "logFile",
+        "tail",
+        "handle",
+        "watching",
+        "stop_reason",
+        "exited",
+        "batch",
+        "masters",
+    )
+
+    def __init__(self, row: int, plugin: plugin, logFile: str) -> None:
+        self.row = row
+        self.plugin = plugin
+        self.logFile = logFile
+        self.tail: xedit_log.xEditLogTail | None = None
+        self.handle: int | None = None
+        # Whether watch_xEdit should still follow the log
+        self.watching = False
+        self.stop_reason: str | None = None
+        # (waitResult, exitCode) where waitForApplication waited for it
+        self.exited: tuple[bool, int] | None = None
+        # The plugins of a session cleaning several, and their shared masters
+        self.batch: list[xedit_run] | None = None
+        self.masters: list[str] | None = None
+
+    def members(self) -> list["xedit_run"]:
+        return self.batch if self.batch is not None else [self]
 
-        logging.debug(f"{self.name()} logging finished")
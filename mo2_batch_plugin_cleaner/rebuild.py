@@ -0,0 +1,138 @@
+# Created by GoriRed
+# Version: 1.2
+# License: CC-BY-NC
+# https://github.com/tkoopman/MO2-Batch-Plugin-Cleaner
+
+import gzip
+import io
+import logging
+import os
+import shutil
+import time
+import traceback
+
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Iterator
+
+from .cleaning_data import CsvData, LootData, cleaning_data, crc32, source
+from .log_archive import LogArchive
+
+# (casefolded plugin name, CRC, ITM, UDR, NAV)
+log_entry = tuple[str, int, int, int, int]
+
+
+def log_files(directory: str | Path) -> list[Path]:
+    """
+    Returns the xEdit logs kept in the plugin's data folder, loose and in the
+    log archive, oldest first.
+    """
+    directory = Path(directory)
+    archive = directory / "logs"
+    files = list(directory.glob("*.log"))
+    files += archive.glob(f"*{LogArchive.SUFFIX}")
+    files += archive.glob(f"*{LogArchive.PENDING}")
+
+    def mtime(path: Path) -> float:
+        try:
+            return path.stat().st_mtime
+        except OSError:
+            return 0
+
+    return sorted(files, key=mtime)
+
+
+def read_log(filename: str) -> list[log_entry] | None:
+    """
+    Returns the LOOT entries of one log. Runs in the worker processes, so
+    takes and returns only plain data.
+    """
+    try:
+        if filename.endswith(".gz"):
+            with gzip.open(filename, "rb") as file:
+                crc_data = LootData.from_xEdit_log(io.BytesIO(file.read()))
+        else:
+            crc_data = LootData.from_xEdit_log(filename)
+    except Exception as e:
+        logging.error(f'Error reading "{filename}"')
+        logging.error(traceback.format_exception(e))
+        return None
+
+    if crc_data is None:
+        return None
+    return [
+        (name, int(crc), cd.itm, cd.udr, cd.nav)
+        for name, crcs in crc_data.items()
+        for crc, cd in crcs.items()
+    ]
+
+
+def read_logs(
+    files: list[Path], workers: int | None
+) -> Iterator[list[log_entry] | None]:
+    names = [str(f) for f in files]
+    if workers == 1 or len(names) < 2:
+        yield from map(read_log, names)
+        return
+
+    # Workers log at the same level as this process.
+    with ProcessPoolExecutor(
+        workers,
+        initializer=logging.getLogger().setLevel,
+        initargs=(logging.getLogger().level,),
+    ) as executor:
+        # Logs are small, so hand them out in batches to keep the workers busy.
+        count = workers or os.cpu_count() or 1
+        chunksize = max(1, min(64, len(names) // (count * 4)))
+        yield from executor.map(read_log, names, chunksize=chunksize)
+
+
+def rebuild(
+    directory: str | Path, csv_file: str | Path, workers: int | None = None
+) -> dict[str, Any]:
+    """
+    Reads the LOOT entries of every kept log in directory and merges them
+    into the user cleaning data in csv_file, the newest log winning when
+    logs or the file disagree. The old file is kept as a .bak first.
+
+    Returns counts of what was read and changed and the logs per second.
+    """
+    start = time.perf_counter()
+    files = log_files(directory)
+
+    entries = dict[tuple[str, int], tuple[int, int, int]]()
+    stats = {"logs": len(files), "failed": 0, "entries": 0, "duplicates": 0}
+    for result in read_logs(files, workers):
+        if result is None:
+            stats["failed"] += 1
+            continue
+        for name, crc, itm, udr, nav in result:
+            stats["entries"] += 1
+            if (name, crc) in entries:
+                stats["duplicates"] += 1
+            entries[(name, crc)] = (itm, udr, nav)
+
+    csv_file = Path(csv_file)
+    crc_data = CsvData.load(csv_file)
+    stats.update(added=0, updated=0, unchanged=0)
+    for (name, crc), (itm, udr, nav) in entries.items():
+        known = crc_data.find(name, crc32(crc))
+        if known is None:
+            stats["added"] += 1
+        elif (known.itm, known.udr, known.nav) == (itm, udr, nav):
+            stats["unchanged"] += 1
+            continue
+        else:
+            stats["updated"] += 1
+        if name not in crc_data:
+            crc_data[name] = {}
+        crc_data[name][crc32(crc)] = cleaning_data(itm, udr, nav, source.USER)
+
+    if stats["added"] or stats["updated"]:
+        if csv_file.is_file():
+            shutil.copy2(csv_file, csv_file.with_name(csv_file.name + ".bak"))
+        CsvData.save(crc_data, csv_file)
+
+    stats["seconds"] = time.perf_counter() - start
+    stats["logs_per_second"] = len(files) / stats["seconds"] if stats["seconds"] else 0
+    return stats
@@ -0,0 +1,275 @@
+# Created by GoriRed
+# Version: 1.2
+# License: CC-BY-NC
+# https://github.com/tkoopman/MO2-Batch-Plugin-Cleaner
+
+import gzip
+import io
+import logging
+import re
+import sqlite3
+import threading
+import traceback
+
+from pathlib import Path
+from typing import IO, Any
+
+from .cleaning_data import LootData
+
+# A plugin loaded in an xEdit session and whether it is light (ESL).
+session_file = tuple[str, bool]
+
+# A record as the plugin it comes from and its object ID within it. The
+# plugin is None if the FormID could not be resolved, the ID is then the
+# FormID as logged.
+form = tuple[str | None, int]
+
+# (plugin, object ID, record type, action, plugin and object ID of the cell
+# it is in)
+record = tuple[str | None, int, str, str, str | None, int | None]
+
+# The records xEdit removed or undeleted while cleaning, as it logs them:
+#   Removing: MQ101 "Unbound" [QUST:0003372B]
+#   Undeleting: [REFR:0001ACB2] (places ... in GRUP Cell ... of [CELL:00009C8B] ...)
+RECORD = re.compile(r"(Removing|Undeleting): [^\[]*\[(\w{4}):([0-9A-Fa-f]{8})\]")
+CELL = re.compile(r"\[CELL:([0-9A-Fa-f]{8})\]")
+ACTIONS = {"Removing": "ITM", "Undeleting": "UDR"}
+
+
+def resolve(formid: int, files: list[session_file] | None) -> form:
+    """
+    Returns the plugin and object ID of a FormID as xEdit logs it. The top
+    byte is the index of the plugin among the full plugins of the session,
+    or FE followed by three hex digits of its index among the light ones.
+    files are the plugins of the session in load order.
+    """
+    if files is None:
+        return None, formid
+    if formid >> 24 == 0xFE:
+        index = (formid >> 12) & 0xFFF
+        light = [name for name, is_light in files if is_light]
+        return (light[index], formid & 0xFFF) if index < len(light) else (None, formid)
+    index = formid >> 24
+    full = [name for name, is_light in files if not is_light]
+    return (full[index], formid & 0xFFFFFF) if index < len(full) else (None, formid)
+
+
+def parse_records(
+    stream: IO[bytes], files: list[session_file] | None = None
+) -> list[record]:
+    """
+    Returns every record removed or undeleted in an xEdit log. FormIDs are
+    resolved through files, the plugins xEdit loaded in load order, as the
+    same record has another FormID in each session with other masters.
+    """
+    # Logs can be UTF-16, the BOM is left in the first line, which is never
+    # a record.
+    head = stream.read(64 * 1024)
+    encoding = LootData.detect_encoding(head, head, 0)
+    stream.seek(0)
+
+    records = list[record]()
+    text = io.TextIOWrapper(stream, encoding, errors="replace")  # type: ignore
+    for line in text:
+        match = RECORD.search(line)
+        if match:
+            if match[2] == "CELL":
+                cell = match[3]
+            else:
+                inCell = CELL.search(line, match.end())
+                cell = inCell[1] if inCell else None
+            plugin, formid = resolve(int(match[3], 16), files)
+            cell_plugin, cell_id = (
+                resolve(int(cell, 16), files) if cell else (None, None)
+            )
+            records.append(
+                (plugin, formid, match[2], ACTIONS[match[1]], cell_plugin, cell_id)
+            )
+    # Leave closing the stream to the caller.
+    text.detach()
+    return records
+
+
+class RecordStore:
+    """
+    SQLite index of the records xEdit removed or undeleted in every archived
+    log, so they can be looked up by FormID, cell, plugin or record type
+    without reading the logs again.
+
+    Records and cells are stored as the plugin they come from and their
+    object ID in it, so they match across logs whatever other plugins were
+    loaded. Call set_session() with the plugins xEdit loads before its log
+    is archived, else the FormIDs are stored as logged.
+    """
+
+    VERSION = 2
+
+    # One store per file, shared by every cleaning run in the MO2 session.
+    __stores: dict[Path, "RecordStore"] = {}
+
+    @staticmethod
+    def get(filename: str | Path) -> "RecordStore":
+        filename = Path(filename).resolve()
+        store = RecordStore.__stores.get(filename)
+        if store is None:
+            store = RecordStore(filename)
+            RecordStore.__stores[filename] = store
+        return store
+
+    def __init__(self, filename: str | Path) -> None:
+        self.filename = Path(filename)
+        self.__lock = threading.Lock()
+        # Casefolded plugin name -> the plugins of its last xEdit session
+        self.__sessions = dict[str, list[session_file]]()
+        # Written to by the log archive's worker thread, read from the GUI.
+        self.__db = sqlite3.connect(self.filename, check_same_thread=False)
+        with self.__lock, self.__db:
+            version = self.__db.execute("PRAGMA user_version").fetchone()[0]
+            if version != RecordStore.VERSION:
+                self.__db.executescript(
+                    """
+                    DROP TABLE IF EXISTS records;
+                    DROP TABLE IF EXISTS runs;
+                    """
+                )
+            self.__db.executescript(
+                f"""
+                PRAGMA journal_mode = WAL;
+                PRAGMA synchronous = NORMAL;
+                PRAGMA foreign_keys = ON;
+                CREATE TABLE IF NOT EXISTS runs (
+                    id INTEGER PRIMARY KEY,
+                    log TEXT NOT NULL UNIQUE,
+                    plugin TEXT NOT NULL COLLATE NOCASE,
+                    crc TEXT,
+                    created REAL NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS runs_plugin ON runs (plugin, crc);
+                CREATE TABLE IF NOT EXISTS records (
+                    run INTEGER NOT NULL REFERENCES runs (id) ON DELETE CASCADE,
+                    plugin TEXT COLLATE NOCASE,
+                    formid INTEGER NOT NULL,
+                    type TEXT NOT NULL,
+                    action TEXT NOT NULL,
+                    cell_plugin TEXT COLLATE NOCASE,
+                    cell INTEGER
+                );
+                CREATE INDEX IF NOT EXISTS records_run ON records (run);
+                CREATE INDEX IF NOT EXISTS records_formid
+                    ON records (formid, plugin);
+                CREATE INDEX IF NOT EXISTS records_cell ON records (cell, cell_plugin)
+                    WHERE cell IS NOT NULL;
+                PRAGMA user_version = {RecordStore.VERSION};
+                """
+            )
+
+    def set_session(self, plugin: str, files: list[session_file]) -> None:
+        """
+        Sets the plugins, in load order, xEdit loads to clean plugin. Used to
+        resolve the FormIDs in its logs archived from now on.
+        """
+        with self.__lock:
+            self.__sessions[plugin.casefold()] = files
+
+    def has(self, log: str) -> bool:
+        with self.__lock:
+            return (
+                self.__db.execute("SELECT 1 FROM runs WHERE log = ?", (log,)).fetchone()
+                is not None
+            )
+
+    def add(
+        self,
+        log: str,
+        plugin: str,
+        crc: str | None,
+        created: float,
+        records: list[record],
+    ) -> None:
+        """
+        Stores the records of one log, replacing any stored for it before.
+        """
+        with self.__lock, self.__db:
+            self.__db.execute("DELETE FROM runs WHERE log = ?", (log,))
+            run = self.__db.execute(
+                "INSERT INTO runs (log, plugin, crc, created) VALUES (?, ?, ?, ?)",
+                (log, plugin, crc, created),
+            ).lastrowid
+            self.__db.executemany(
+                "INSERT INTO records"
+                " (run, plugin, formid, type, action, cell_plugin, cell)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [(run, *r) for r in records],
+            )
+
+    def add_archived(self, name: str, entry: dict[str, Any], path: Path) -> None:
+        """
+        Listener for LogArchive, stores the records of a newly archived log.
+        """
+        try:
+            with self.__lock:
+                files = self.__sessions.get(entry["plugin"].casefold())
+            with gzip.open(path, "rb") as file:
+                records = parse_records(file, files)
+            self.add(name, entry["plugin"], entry["crc"], entry["created"], records)
+        except Exception as e:
+            logging.error(f'Error reading the records in "{path}"')
+            logging.error(traceback.format_exception(e))
+
+    def find(
+        self,
+        formid: form | None = None,
+        cell: form | None = None,
+        plugin: str | None = None,
+        record_type: str | None = None,
+        action: str | None = None,
+    ) -> list[tuple[str, str | None, str | None, int, str, str, str | None, int | None]]:
+        """
+        Returns the cleaned plugin, its CRC, the record's plugin and object
+        ID, record type, action and the cell's plugin and object ID of every
+        stored record matching all of the given filters. formid and cell are
+        the plugin a record comes from and its object ID in it.
+        """
+        filters = list[str]()
+        params = list[Any]()
+        for column, value in [
+            ("records.formid", formid[1] if formid else None),
+            ("records.plugin", formid[0] if formid else None),
+            ("records.cell", cell[1] if cell else None),
+            ("records.cell_plugin", cell[0] if cell else None),
+            ("runs.plugin", plugin),
+            ("records.type", record_type),
+            ("records.action", action),
+        ]:
+            if value is not None:
+                filters.append(f"{column} = ?")
+                params.append(value)
+
+        sql = (
+            "SELECT DISTINCT runs.plugin, runs.crc, records.plugin, records.formid,"
+            " records.type, records.action, records.cell_plugin, records.cell"
+            " FROM records JOIN runs ON runs.id = records.run"
+        )
+        if filters:
+            sql += " WHERE " + " AND ".join(filters)
+        sql += " ORDER BY runs.plugin, records.plugin, records.formid"
+        with self.__lock:
+            return self.__db.execute(sql, params).fetchall()
+
+    def plugins_touching(self, plugin: str, formid: int) -> list[str]:
+        """
+        Returns the plugins that had the record with this object ID in plugin
+        cleaned.
+        """
+        return sorted(
+            {r[0] for r in self.find(formid=(plugin, formid))}, key=str.casefold
+        )
+
+    def undeleted_in_cell(
+        self, plugin: str, cell: int
+    ) -> list[tuple[str, str | None, str | None, int, str, str, str | None, int | None]]:
+        """
+        Returns the references undeleted in the cell with this object ID in
+        plugin.
+        """
+        return self.find(cell=(plugin, cell), action="UDR")
@@ -0,0 +1,142 @@
+# Created by GoriRed
+# Version: 1.2
+# License: CC-BY-NC
+# https://github.com/tkoopman/MO2-Batch-Plugin-Cleaner
+
+import os
+import sys
+import typing
+
+from collections import deque
+
+T = typing.TypeVar("T")
+
+
+def available_memory() -> int | None:
+    """
+    Returns the physical memory in bytes that can be used without swapping,
+    or None if it can't be told on this system.
+    """
+    if sys.platform == "win32":
+        import ctypes
+
+        class MEMORYSTATUSEX(ctypes.Structure):
+            _fields_ = [
+                ("dwLength", ctypes.c_ulong),
+                ("dwMemoryLoad", ctypes.c_ulong),
+                ("ullTotalPhys", ctypes.c_ulonglong),
+                ("ullAvailPhys", ctypes.c_ulonglong),
+                ("ullTotalPageFile", ctypes.c_ulonglong),
+                ("ullAvailPageFile", ctypes.c_ulonglong),
+                ("ullTotalVirtual", ctypes.c_ulonglong),
+                ("ullAvailVirtual", ctypes.c_ulonglong),
+                ("ullAvailExtendedVirtual", ctypes.c_ulonglong),
+            ]
+
+        status = MEMORYSTATUSEX()
+        status.dwLength = ctypes.sizeof(MEMORYSTATUSEX)
+        if not ctypes.windll.kernel32.GlobalMemoryStatusEx(ctypes.byref(status)):
+            return None
+        return status.ullAvailPhys
+
+    try:
+        with open("/proc/meminfo", "r") as file:
+            for line in file:
+                if line.startswith("MemAvailable:"):
+                    return int(line.split()[1]) * 1024
+    except (OSError, ValueError, IndexError):
+        pass
+    return None
+
+
+def worker_count(requested: int, memory_per_worker: int) -> int:
+    """
+    Returns how many xEdit processes to run at once. requested is the
+    setting, 0 meaning one per CPU core, and is capped so each process has
+    memory_per_worker bytes of the memory available now. Always at least 1.
+    """
+    count = requested if requested > 0 else (os.cpu_count() or 1)
+    available = available_memory()
+    if available is not None and memory_per_worker > 0:
+        count = min(count, available // memory_per_worker)
+    return max(1, count)
+
+
+class scheduler(typing.Generic[T]):
+    """
+    Runs one process per job, at most workers at a time, starting them in
+    the order given as slots free up.
+
+    start is called with a job to start its process and returns its handle,
+    or None if it failed to start. poll returns the exit code of a process,
+    or None while it is still running. Neither may block, step() is meant to
+    be called from a timer.
+
+    conflicts tells whether two jobs must not run at the same time. A job
+    that conflicts with a running one, or with one held back before it, is
+    held back until they finished, while later jobs may take its slot. So
+    jobs that conflict always run in the order given.
+    """
+
+    __slots__ = ("workers", "pending", "running", "__start", "__poll", "__conflicts")
+
+    def __init__(
+        self,
+        jobs: typing.Iterable[T],
+        workers: int,
+        start: typing.Callable[[T], int | None],
+        poll: typing.Callable[[int], int | None],
+        conflicts: typing.Callable[[T, T], bool] | None = None,
+    ) -> None:
+        self.workers = max(1, workers)
+        self.pending = deque(jobs)
+        # handle -> job, in the order they were started
+        self.running = dict[int, T]()
+        self.__start = start
+        self.__poll = poll
+        self.__conflicts = conflicts
+
+    def step(self) -> list[tuple[T, int | None]]:
+        """
+        Collects the processes that exited and starts jobs in the slots they
+        freed. Returns the finished jobs with their exit code, or None for
+        the one whose process did not start. No more jobs are started in a
+        step after one fails to, what failed likely fails them too.
+        """
+        finished = list[tuple[T, int | None]]()
+        for handle, job in list(self.running.items()):
+            code = self.__poll(handle)
+            if code is not None:
+                del self.running[handle]
+                finished.append((job, code))
+
+        held = deque[T]()
+        while self.pending and len(self.running) < self.workers:
+            job = self.pending.popleft()
+            if self.__conflicts and any(
+                self.__conflicts(job, other)
+                for other in (*self.running.values(), *held)
+            ):
+                held.append(job)
+                continue
+            handle = self.__start(job)
+            if handle is None:
+                finished.append((job, None))
+                break
+            else:
+                self.running[handle] = job
+        held.extend(self.pending)
+        self.pending = held
+        return finished
+
+    def cancel(self) -> list[T]:
+        """
+        Drops the jobs not started yet and returns them. Running processes
+        are left to finish.
+        """
+        jobs = list(self.pending)
+        self.pending.clear()
+        return jobs
+
+    def done(self) -> bool:
+        return not self.pending and not self.running
@@ -0,0 +1,276 @@
+# Original plugin created for Skyrim by bluebuiy
+#     https://www.nexusmods.com/skyrimspecialedition/mods/59598
+# Modified for Fallout 4 by wxMichael
+#     https://www.nexusmods.com/fallout4/mods/85067
+#
+# This version created by GoriRed
+# Version: 1.2
+# License: CC-BY-NC
+# https://github.com/tkoopman/MO2-Batch-Plugin-Cleaner
+#
+# MO2 imports this module at startup, so it must stay cheap to import.
+# Only import what createPlugin() and the metadata methods need here.
+
+import logging
+import typing
+
+import mobase  # type: ignore
+
+if typing.TYPE_CHECKING:
+    from PyQt6.QtGui import QIcon
+
+    from .plugin import Plugins
+
+
+class GameInfo(typing.TypedDict):
+    xEditName: str
+    xEditSwitch: str
+    LootFolder: str | None
+
+
+gameInfo: dict[str, GameInfo] = {
+    "Oblivion": {
+        "xEditName": "TES4Edit",
+        "xEditSwitch": "-tes4",
+        "LootFolder": "Oblivion",
+    },
+    "Nehrim": {
+        "xEditName": "TES4Edit",
+        "xEditSwitch": "-tes4",
+        "LootFolder": "Nehrim",
+    },
+    "Fallout3": {
+        "xEditName": "FO3Edit",
+        "xEditSwitch": "-fo3",
+        "LootFolder": "Fallout3",
+    },
+    "FalloutNV": {
+        "xEditName": "FNVEdit",
+        "xEditSwitch": "-fnv",
+        "LootFolder": "FalloutNV",
+    },
+    "TTW": {
+        "xEditName": "FNVEdit",
+        "xEditSwitch": "-fnv",
+        "LootFolder": None,
+    },
+    "Skyrim": {
+        "xEditName": "TES5Edit",
+        "xEditSwitch": "-tes5",
+        "LootFolder": "Skyrim",
+    },
+    "SkyrimSE": {
+        "xEditName": "SSEEdit",
+        "xEditSwitch": "-sse",
+        "LootFolder": "Skyrim Special Edition",
+    },
+    "SkyrimVR": {
+        "xEditName": "TES5VREdit",
+        "xEditSwitch": "-tes5vr",
+        "LootFolder": "Skyrim VR",
+    },
+    "Enderal": {
+        "xEditName": "EnderalEdit",
+        "xEditSwitch": "-enderal",
+        "LootFolder": "Enderal",
+    },
+    "EnderalSE": {
+        "xEditName": "EnderalSEEdit",
+        "xEditSwitch": "-enderalse",
+        "LootFolder": "Enderal Special Edition",
+    },
+    "Fallout4": {
+        "xEditName": "FO4Edit",
+        "xEditSwitch": "-fo4",
+        "LootFolder": "Fallout4",
+    },
+    "Fallout4VR": {
+        "xEditName": "FO4VREdit",
+        "xEditSwitch": "-fo4vr",
+        "LootFolder": "Fallout4VR",
+    },
+    "Fallout76": {
+        "xEditName": "FO76Edit",
+        "xEditSwitch": "-fo76",
+        "LootFolder": None,
+    },
+    "Starfield": {
+        "xEditName": "SF1Edit",
+        "xEditSwitch": "-sf1",
+        "LootFolder": "Starfield",
+    },
+}
+
+
+class CleanerPlugin(mobase.IPluginTool):
+
+    __organizer: mobase.IOrganizer
+    # Kept up to date by MO2's change notifications between openings.
+    __plugins: "Plugins | None" = None
+
+    def __init__(self):
+        super().__init__()
+
+    def init(self, organizer: mobase.IOrganizer):
+        self.__organizer = organizer
+        return True
+
+    @staticmethod
+    def NAME() -> str:
+        return "Batch Plugin Cleaner"
+
+    def name(self) -> str:
+        return CleanerPlugin.NAME()
+
+    def author(self) -> str:
+        return "bluebuiy & wxMichael & GoriRed"
+
+    def displayName(self):
+        return "Clean Plugins"
+
+    def description(self) -> str:
+        return f"Clean all plugins with one button. Requires {gameInfo[self.__organizer.managedGame().gameShortName()]['xEditName']}"
+
+    def version(self) -> mobase.VersionInfo:
+        return mobase.VersionInfo(1, 2, 0, mobase.ReleaseType.FINAL)
+
+    def isActive(self) -> bool:
+        return self.__organizer.pluginSetting(self.name(), "enabled")  # type: ignore
+
+    def tooltip(self) -> str:
+        return "Clean all plugins at once"
+
+    def settings(self) -> list[mobase.PluginSetting]:
+        return [
+            mobase.PluginSetting("enabled", "enable this plugin", True),
+            mobase.PluginSetting("clean_beth", "Clean base game plugins", False),
+            mobase.PluginSetting("clean_cc", "Clean Creation Club plugins", True),
+            mobase.PluginSetting("clean_else", "Clean mod plugins", True),
+            mobase.PluginSetting(
+                "explicit_data_path",
+                "If the data directory should be explicitly provided.  May need to be enabled if you get errors from xEdit.",
+                False,
+            ),
+            mobase.PluginSetting(
+                "explicit_ini_path",
+                "If the ini path should be explicitly provided.  May need to be enabled if you get errors from xEdit.",
+                False,
+            ),
+            # TODO: Re-enable this if I find a way to force xEdit to perform backups if disabled in GUI
+            # mobase.PluginSetting(
+            #    "save_dirty_plugins",
+            #    "Saves xEdit backups of dirty plugins to 'Batch Plugin Cleaner' folder under MO2/Plugins/Data/ path.",
+            #    True,
+            # ),
+            mobase.PluginSetting(
+                "keep_logs",
+                "xEdit log files to keep. 0=None, 1=Unknown, 3=Manual Cleaning Required, 4=Cleaned, 5=All",
+                4,
+            ),
+            mobase.PluginSetting(
+                "log_archive_max_mb",
+                "Total size in MB the compressed xEdit logs kept may use before the least recently used are removed. 0=No limit",
+                500,
+            ),
+            mobase.PluginSetting(
+                "log_archive_max_days",
+                "Days to keep compressed xEdit logs for. 0=No limit",
+                180,
+            ),
+            mobase.PluginSetting(
+                "log_staging_dir",
+                "Directory xEdit writes its logs to while cleaning, kept logs are then moved to the archive in the background. Empty=System temp directory",
+                "",
+            ),
+            mobase.PluginSetting(
+                "xedit_timeout",
+                "Stop xEdit if its log shows no progress for this many seconds. 0=Never",
+                0,
+            ),
+            mobase.PluginSetting(
+                "xedit_workers",
+                "xEdit processes to run at once, each cleaning one plugin, or a session of several with xedit_batch_size. More than 1 needs Windows, elsewhere one is run at a time. 0=One per CPU core",
+                1,
+            ),
+            mobase.PluginSetting(
+                "xedit_worker_memory_mb",
+                "Free RAM in MB needed per xEdit process, fewer are run at once if there is not enough. 0=No limit",
+                2048,
+            ),
+            mobase.PluginSetting(
+                "xedit_batch_size",
+                "Experimental and untested: it has not been run against a real xEdit yet, so its results may differ from cleaning each plugin on its own, see tools/xedit_batch_parity.py. Clean up to this many plugins with the same masters, and no overridden records in common, in one xEdit session, run by a generated script, so the masters are loaded once. Plugins it can't clean are cleaned on their own. 0=Off",
+                0,
+            ),
+            mobase.PluginSetting(
+                "auto_close",
+                "Auto close plugin selection window after clean.",
+                True,
+            ),
+            mobase.PluginSetting(
+                "exe_name_xedit",
+                "Invoke xEdit as xEdit, not a game-specific name such as FO4Edit.",
+                False,
+            ),
+            mobase.PluginSetting(
+                "first_dynamic",
+                "Will not auto select this plugin or any with higher priority",
+                "",
+            ),
+            mobase.PluginSetting(
+                "do_not_clean",
+                "Will not allow cleaning of listed plugins even if known dirty. Comma separated list.",
+                "",
+            ),
+        ]
+
+    def icon(self) -> "QIcon":
+        from PyQt6.QtGui import QIcon
+
+        return QIcon()
+
+    def display(self) -> None:
+        # Everything else (Qt widgets, icons, the bundled PyYAML) is only
+        # imported once the tool is actually opened.
+        from pathlib import Path
+
+        from .plugin import PluginProgressWindow, PluginSelectWindow, Plugins
+
+        logging.debug(f"{self.name()} logging started")
+        logging.debug(f"Game: {self.__organizer.managedGame().gameShortName()}")
+        snapshot = (
+            Path(self.__organizer.pluginDataPath())
+            / self.name()
+            / "plugins snapshot.json"
+        )
+        if self.__plugins is None:
+            # Rows show as they are read, the rest is read with the dialog open.
+            # The last session's snapshot shows them classified until then and
+            # saves hashing the plugins that did not change.
+            plugins = Plugins.Loading(self.__organizer)
+            plugins.restore(snapshot)
+            loading = plugins.load()
+        else:
+            plugins = self.__plugins
+            plugins.refresh()
+            loading = None
+
+        dialog = PluginSelectWindow(plugins, self._parentWidget(), loading)
+        accepted = dialog.exec()
+        if self.__plugins is None and dialog.loaded:
+            # Only keep a list that was read completely.
+            plugins.watch()
+            self.__plugins = plugins
+
+        if accepted:
+            selected = Plugins.Selected(plugins)
+            dialog = PluginProgressWindow(selected, self._parentWidget())
+            dialog.open()
+            dialog.clean_all()
+            # xEdit has rewritten the plugins it cleaned.
+            plugins.invalidate(plugin.name for plugin in selected)
+
+        if self.__plugins is not None:
+            self.__plugins.save_snapshot(snapshot)
+
+        logging.debug(f"{self.name()} logging finished")
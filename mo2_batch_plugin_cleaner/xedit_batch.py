@@ -0,0 +1,370 @@
+# Created by GoriRed
+# Version: 1.2
+# License: CC-BY-NC
+# https://github.com/tkoopman/MO2-Batch-Plugin-Cleaner
+
+import mmap
+import re
+import struct
+import typing
+
+from pathlib import Path
+
+from .cleaning_data import LootData, crc32
+
+# Games whose plugins.txt marks active plugins with a leading *.
+ASTERISK_PLUGINS_TXT = {
+    "SkyrimSE",
+    "SkyrimVR",
+    "EnderalSE",
+    "Fallout4",
+    "Fallout4VR",
+    "Starfield",
+}
+
+# Reference records xEdit undeletes and disables when cleaning.
+REFERENCES = (
+    "REFR",
+    "ACHR",
+    "ACRE",
+    "PGRE",
+    "PMIS",
+    "PHZD",
+    "PARW",
+    "PBAR",
+    "PBEA",
+    "PCON",
+    "PFLA",
+)
+
+
+def header_size(game: str) -> int:
+    # Oblivion's record header has no version control info.
+    return 20 if game in ("Oblivion", "Nehrim") else 24
+
+
+def plugin_masters(filename: str | Path, game: str) -> list[str] | None:
+    """
+    Returns the masters listed in a plugin's header, in the order listed, or
+    None if the file can't be read as a plugin.
+    """
+    header_length = header_size(game)
+    try:
+        with open(filename, "rb") as file:
+            header = file.read(header_length)
+            if len(header) < header_length or header[:4] != b"TES4":
+                return None
+            (size,) = struct.unpack_from("<I", header, 4)
+            data = file.read(size)
+    except OSError:
+        return None
+
+    masters = list[str]()
+    pos = 0
+    # A subrecord over 64 KB is preceded by an XXXX subrecord holding its size.
+    large: int | None = None
+    while pos + 6 <= len(data):
+        kind = data[pos : pos + 4]
+        (length,) = struct.unpack_from("<H", data, pos + 4)
+        pos += 6
+        if large is not None:
+            length, large = large, None
+        if kind == b"XXXX" and length == 4:
+            (large,) = struct.unpack_from("<I", data, pos)
+        elif kind == b"MAST":
+            masters.append(
+                data[pos : pos + length].split(b"\0", 1)[0].decode("cp1252", "replace")
+            )
+        pos += length
+    return masters
+
+
+def plugin_overrides(
+    filename: str | Path, game: str, masters: list[str]
+) -> frozenset[tuple[str, int]] | None:
+    """
+    Returns the records of its masters a plugin overrides, each as the
+    casefolded master and object ID, or None if the file can't be read as a
+    plugin.
+
+    Only the record headers are read, walking into every group, so
+    compressed records don't need unpacking.
+    """
+    size = header_size(game)
+    overrides = set[tuple[str, int]]()
+    masters = [master.casefold() for master in masters]
+    try:
+        with open(filename, "rb") as file, mmap.mmap(
+            file.fileno(), 0, access=mmap.ACCESS_READ
+        ) as data:
+            if data[:4] != b"TES4":
+                return None
+            end = len(data)
+            # After the header, its FormID of 0 would read as the first master's.
+            (length,) = struct.unpack_from("<I", data, 4)
+            pos = size + length
+            while pos + size <= end:
+                if data[pos : pos + 4] == b"GRUP":
+                    # The group's records follow its header.
+                    pos += size
+                    continue
+                length, _, formid = struct.unpack_from("<III", data, pos + 4)
+                index = formid >> 24
+                if index < len(masters):
+                    overrides.add((masters[index], formid & 0xFFFFFF))
+                pos += size + length
+    except (OSError, ValueError):
+        # mmap raises ValueError for an empty file.
+        return None
+    return frozenset(overrides)
+
+
+T = typing.TypeVar("T")
+
+
+def group_by_masters(
+    plugins: typing.Iterable[tuple[T, list[str]]],
+    size: int,
+    overrides: typing.Callable[[T], frozenset[tuple[str, int]] | None],
+) -> list[list[T]]:
+    """
+    Groups plugins that have the same masters and override none of the same
+    records, in the order they are given, into groups of at most size.
+    Plugins that can't share a session are returned in groups of one.
+
+    xEdit compares a record with every plugin loaded, so a record two
+    plugins of a session override is not identical to master in either.
+    overrides is only called for plugins sharing their masters, it returns
+    None for a plugin that must be cleaned on its own.
+    """
+    groups = dict[tuple[str, ...], list[T]]()
+    for item, masters in plugins:
+        key = tuple(sorted(master.casefold() for master in masters))
+        groups.setdefault(key, []).append(item)
+
+    result = list[list[T]]()
+    for items in groups.values():
+        if len(items) == 1:
+            result.append(items)
+            continue
+        sessions = list[tuple[list[T], set[tuple[str, int]]]]()
+        for item in items:
+            found = overrides(item)
+            if found is None:
+                result.append([item])
+                continue
+            for members, overridden in sessions:
+                if len(members) < size and overridden.isdisjoint(found):
+                    members.append(item)
+                    overridden.update(found)
+                    break
+            else:
+                sessions.append(([item], set(found)))
+        result.extend(members for members, _ in sessions)
+    return result
+
+
+def plugins_txt(game: str, masters: list[str], plugins: list[str]) -> str:
+    """
+    Returns a plugins.txt loading only the masters and the plugins, for
+    xEdit's -P: argument.
+    """
+    prefix = "*" if game in ASTERISK_PLUGINS_TXT else ""
+    return "".join(f"{prefix}{name}\r\n" for name in masters + plugins)
+
+
+def pascal(value: str) -> str:
+    return "'" + value.replace("'", "''") + "'"
+
+
+def script(targets: list[tuple[str, crc32, str]]) -> str:
+    """
+    Returns an xEdit script cleaning each (plugin, CRC, log file) target
+    loaded in the session the way -QuickAutoClean does: identical to master
+    records are removed, unless records of the plugin are left in their
+    child group, and deleted references undeleted and disabled.
+    Deleted navmeshes are counted but left, as they need fixing by hand.
+
+    For each plugin it writes the LOOT masterlist entries xEdit would log to
+    the plugin's own log file, with xEdit's name and version as the util and
+    the CRC given being that of the plugin before cleaning. complete_log()
+    then adds the CRC of the cleaned plugin.
+
+    The targets must override none of the same records, see
+    group_by_masters().
+    """
+    add = "\n".join(
+        f"  AddTarget({pascal(name)}, {pascal(str(crc))}, {pascal(log)});"
+        for name, crc, log in targets
+    )
+    references = " or ".join(f"(sig = '{sig}')" for sig in REFERENCES)
+    return f"""unit BatchPluginCleaner;
+
+var
+  Targets, Crcs, Logs: TStringList;
+  Util: string;
+
+procedure AddTarget(name, crc, log: string);
+begin
+  Targets.Add(name);
+  Crcs.Add(crc);
+  Logs.Add(log);
+end;
+
+function YamlName(name: string): string;
+begin
+  Result := '''' + StringReplace(name, '''', '''''', [rfReplaceAll]) + '''';
+end;
+
+// The version the way xEdit writes it in its own LOOT entries, 4.1.5f.
+function VersionString(v: integer): string;
+begin
+  Result := IntToStr(v shr 24) + '.' + IntToStr((v shr 16) and $FF) + '.'
+    + IntToStr((v shr 8) and $FF);
+  if (v and $FF) > 0 then
+    Result := Result + Chr(Ord('a') + (v and $FF) - 1);
+end;
+
+procedure Undelete(e: IInterface);
+begin
+  SetIsDeleted(e, False);
+  SetIsInitiallyDisabled(e, True);
+  // Enabled opposite to the player, so it is never enabled. Not every
+  // reference type of every game can have one.
+  if not Assigned(ElementByPath(e, 'XESP')) then
+    Add(e, 'XESP', True);
+  if Assigned(ElementByPath(e, 'XESP')) then begin
+    SetElementNativeValues(e, 'XESP\\Reference', $14);
+    SetElementNativeValues(e, 'XESP\\Flags', 1);
+  end;
+  // Out of sight below the world.
+  if Assigned(ElementByPath(e, 'DATA\\Position\\Z')) then
+    SetElementNativeValues(e, 'DATA\\Position\\Z', -30000);
+end;
+
+// Whether a CELL, WRLD or DIAL still holds records of this plugin.
+function HasChildren(e: IInterface): boolean;
+var
+  g: IInterface;
+begin
+  g := ChildGroup(e);
+  Result := Assigned(g) and (ElementCount(g) > 0);
+end;
+
+procedure CleanFile(f: IInterface; crc, log: string);
+var
+  i, itm, udr, nav, removed: integer;
+  e: IInterface;
+  sig: string;
+  lines: TStringList;
+begin
+  itm := 0;
+  udr := 0;
+  nav := 0;
+  // Records are not in parent and child order, a parent whose children
+  // were all removed is only removed in the next pass.
+  repeat
+    removed := 0;
+    for i := Pred(RecordCount(f)) downto 0 do begin
+      e := RecordByIndex(f, i);
+      if (not GetIsDeleted(e)) and (not IsMaster(e))
+        and (ConflictThisForMainRecord(e) = ctIdenticalToMaster)
+        and (not HasChildren(e)) then begin
+        RemoveNode(e);
+        Inc(removed);
+      end;
+    end;
+    itm := itm + removed;
+  until removed = 0;
+
+  for i := Pred(RecordCount(f)) downto 0 do begin
+    e := RecordByIndex(f, i);
+    if GetIsDeleted(e) then begin
+      sig := Signature(e);
+      if sig = 'NAVM' then
+        Inc(nav)
+      else if {references} then begin
+        Undelete(e);
+        Inc(udr);
+      end;
+    end;
+  end;
+
+  lines := TStringList.Create;
+  try
+    lines.Add('LOOT Masterlist Entries');
+    lines.Add('  - name: ' + YamlName(GetFileName(f)));
+    if (itm = 0) and (udr = 0) and (nav = 0) then
+      lines.Add('    clean:')
+    else
+      lines.Add('    dirty:');
+    lines.Add('      - crc: ' + crc);
+    lines.Add('        util: ' + YamlName(Util));
+    if itm > 0 then
+      lines.Add('        itm: ' + IntToStr(itm));
+    if udr > 0 then
+      lines.Add('        udr: ' + IntToStr(udr));
+    if nav > 0 then
+      lines.Add('        nav: ' + IntToStr(nav));
+    lines.SaveToFile(log);
+  finally
+    lines.Free;
+  end;
+  AddMessage('Cleaned ' + GetFileName(f));
+end;
+
+function Initialize: integer;
+var
+  i, j: integer;
+  f: IInterface;
+begin
+  Targets := TStringList.Create;
+  Crcs := TStringList.Create;
+  Logs := TStringList.Create;
+  Util := '[' + wbAppName + 'Edit v' + VersionString(wbVersionNumber)
+    + '](https://github.com/TES5Edit/TES5Edit)';
+{add}
+  for i := 0 to Pred(FileCount) do begin
+    f := FileByIndex(i);
+    j := Targets.IndexOf(GetFileName(f));
+    if j >= 0 then
+      CleanFile(f, Crcs[j], Logs[j]);
+  end;
+  Targets.Free;
+  Crcs.Free;
+  Logs.Free;
+  Result := 0;
+end;
+
+end.
+"""
+
+
+# The util of the entries script() logged.
+LOGGED_UTIL = re.compile(r"^ +util: (.*?)\r?$", re.MULTILINE)
+
+
+def complete_log(logFile: str | Path, crc: crc32 | None, nav: int) -> bool:
+    """
+    Adds the CRC of the cleaned plugin to the entries script() logged for
+    it: as a clean entry, or with its deleted navmeshes if it has any. It
+    is written with the util and in the encoding of the entries. Returns
+    False if the log has no entries.
+    """
+    tail = LootData.read_log_tail(Path(logFile))
+    if not tail:
+        return False
+    text, encoding = LootData.decode_log_tail(*tail)
+    utils = LOGGED_UTIL.findall(text)
+    if not utils:
+        return False
+
+    util = utils[-1]
+    with open(logFile, "a", encoding=encoding, newline="\r\n") as file:
+        if nav:
+            file.write(
+                f"      - crc: {crc}\n        util: {util}\n        nav: {nav}\n"
+            )
+        else:
+            file.write(f"    clean:\n      - crc: {crc}\n        util: {util}\n")
+    return True
@@ -0,0 +1,172 @@
+# Created by GoriRed
+# Version: 1.2
+# License: CC-BY-NC
+# https://github.com/tkoopman/MO2-Batch-Plugin-Cleaner
+
+import codecs
+import enum
+import re
+import sys
+import time
+
+from pathlib import Path
+
+from .cleaning_data import LootData
+
+
+class xedit_phase(enum.Enum):
+    STARTING = "Starting"
+    LOADING = "Loading plugins"
+    UNDELETING = "Undeleting references"
+    REMOVING = "Removing ITMs"
+    SAVING = "Saving"
+    FINISHED = "Finished"
+
+
+class xEditLogTail:
+    """
+    Follows the -R: log of a running xEdit, reading only what was added since
+    the last poll, to report the phase it is in, how many records it has
+    touched and the first error xEdit logged, which explains why it failed
+    if it then exits with an error.
+    """
+
+    PHASES = (
+        (re.compile(r"Background Loader: "), xedit_phase.LOADING),
+        (re.compile(r"Undeleting and Disabling References"), xedit_phase.UNDELETING),
+        (re.compile(r'Removing "Identical to Master" records'), xedit_phase.REMOVING),
+        (re.compile(r"Saving: "), xedit_phase.SAVING),
+        (re.compile(LootData.LOG_HEADER), xedit_phase.FINISHED),
+    )
+    LOADED = re.compile(r"Background Loader: loading ")
+    RECORD = re.compile(r"(?:Removing|Undeleting|Disabling|Skipping): \[")
+    # Errors xEdit reports on a line of its own, with or without the elapsed
+    # time, so a record or script message that mentions them doesn't match.
+    FAILURE = re.compile(
+        r"(?:\[\d+:\d\d\] )?"
+        r"(?:Fatal: |(?:Error|Exception)[^:]*: (?:Access violation|Out of memory)"
+        r"|(?:EAccessViolation|EOutOfMemory)\b)"
+    )
+
+    def __init__(self, filename: str | Path) -> None:
+        self.filename = Path(filename)
+        # A log kept from an earlier run may be appended to, skip what is there.
+        try:
+            self.offset = self.filename.stat().st_size
+        except OSError:
+            self.offset = 0
+        self.decoder: codecs.IncrementalDecoder | None = None
+        self.pending = ""
+        self.phase = xedit_phase.STARTING
+        self.loaded = 0
+        self.records = 0
+        self.failure: str | None = None
+        self.last_growth = time.monotonic()
+
+    def poll(self) -> bool:
+        """
+        Reads and parses the lines added to the log. Returns True if it grew.
+        """
+        try:
+            size = self.filename.stat().st_size
+        except OSError:
+            return False
+
+        if size < self.offset:
+            # Truncated, so xEdit started the log again.
+            self.offset = 0
+            self.decoder = None
+            self.pending = ""
+        if size == self.offset:
+            return False
+
+        with open(self.filename, "rb") as file:
+            head = file.read(len(codecs.BOM_UTF8))
+            file.seek(self.offset)
+            data = file.read(size - self.offset)
+
+        if self.decoder is None:
+            encoding = LootData.detect_encoding(head, data, self.offset)
+            self.decoder = codecs.getincrementaldecoder(encoding)(errors="replace")
+        self.offset += len(data)
+        self.last_growth = time.monotonic()
+
+        lines = (self.pending + self.decoder.decode(data)).split("\n")
+        self.pending = lines.pop()
+        for line in lines:
+            self.__line(line.strip("\r\ufeff"))
+        return True
+
+    def __line(self, line: str) -> None:
+        for pattern, phase in xEditLogTail.PHASES:
+            if pattern.search(line):
+                if phase != self.phase:
+                    self.phase = phase
+                    self.records = 0
+                break
+
+        if xEditLogTail.LOADED.search(line):
+            self.loaded += 1
+        elif xEditLogTail.RECORD.search(line):
+            self.records += 1
+        elif self.failure is None and xEditLogTail.FAILURE.match(line):
+            self.failure = line
+
+    def idle(self) -> float:
+        """
+        Seconds since the log last grew.
+        """
+        return time.monotonic() - self.last_growth
+
+    def status(self) -> str:
+        if self.phase == xedit_phase.LOADING:
+            return f"{self.phase.value} ({self.loaded})..."
+        if self.phase in [xedit_phase.UNDELETING, xedit_phase.REMOVING]:
+            return f"{self.phase.value} ({self.records} records)..."
+        if self.phase == xedit_phase.FINISHED:
+            return self.phase.value
+        return f"{self.phase.value}..."
+
+
+def terminate(handle: int) -> bool:
+    """
+    Ends a process started with IOrganizer.startApplication, the same one
+    exit_code() polls.
+    """
+    if sys.platform != "win32":
+        return False
+
+    import ctypes
+
+    return bool(ctypes.windll.kernel32.TerminateProcess(ctypes.c_void_p(int(handle)), 1))
+
+
+def exit_code(handle: int) -> int | None:
+    """
+    Returns the exit code of a process started with
+    IOrganizer.startApplication, or None while it is still running. Only
+    works on Windows, see can_poll().
+
+    The handle is the one MO2 created xEdit with inside its virtual file
+    system, waitForApplication waits on it too. xEdit starts no processes of
+    its own, so when it has exited there is nothing else to wait for.
+    """
+    import ctypes
+    from ctypes import wintypes
+
+    kernel32 = ctypes.windll.kernel32
+    process = ctypes.c_void_p(int(handle))
+    # WAIT_OBJECT_0, the process has exited
+    if kernel32.WaitForSingleObject(process, 0) != 0:
+        return None
+    code = wintypes.DWORD()
+    if not kernel32.GetExitCodeProcess(process, ctypes.byref(code)):
+        return -1
+    return code.value
+
+
+def can_poll() -> bool:
+    """
+    Whether exit_code() can check on a process without waiting for it.
+    """
+    return sys.platform == "win32"
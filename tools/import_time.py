@@ -0,0 +1,158 @@
+# Created by GoriRed
+# Version: 1.2
+# License: CC-BY-NC
+# https://github.com/tkoopman/MO2-Batch-Plugin-Cleaner
+#
+# Measures what mo2_batch_plugin_cleaner costs MO2 at startup.
+#
+# Runs a child interpreter with `-X importtime` that imports the package,
+# calls createPlugin() and every metadata method MO2 uses to list the tool,
+# and reports the import time of each step plus any module that should only
+# be imported by display().
+#
+# Usage: python tools/import_time.py [--budget-ms 20] [--top 15]
+
+import argparse
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+STUBS = Path(__file__).resolve().parent / "stubs"
+
+# Modules that must not be imported until the tool is opened.
+DEFERRED = (
+    "yaml",
+    "sqlite3",
+    "csv",
+    "PyQt6.QtWidgets",
+    "mo2_batch_plugin_cleaner.plugin",
+    "mo2_batch_plugin_cleaner.rebuild",
+    "mo2_batch_plugin_cleaner.record_store",
+    "mo2_batch_plugin_cleaner.scheduler",
+    "mo2_batch_plugin_cleaner.cleaning_data",
+    "mo2_batch_plugin_cleaner.icons",
+    "mo2_batch_plugin_cleaner.load_order",
+    "mo2_batch_plugin_cleaner.log_archive",
+    "mo2_batch_plugin_cleaner.ui_main_screen",
+    "mo2_batch_plugin_cleaner.xedit_batch",
+    "mo2_batch_plugin_cleaner.xedit_log",
+)
+
+CHILD = """
+import sys
+sys.path[:0] = [{root!r}, {stubs!r}]
+
+def phase(name):
+    sys.stderr.write("phase: " + name + "\\n")
+    sys.stderr.flush()
+
+class Game:
+    def gameShortName(self):
+        return "SkyrimSE"
+
+class Organizer:
+    def managedGame(self):
+        return Game()
+
+    def pluginSetting(self, name, key):
+        return True
+
+# MO2 has already imported these before it loads any Python plugin.
+import enum, logging, typing
+import mobase
+
+phase("import")
+import mo2_batch_plugin_cleaner
+phase("createPlugin")
+tool = mo2_batch_plugin_cleaner.createPlugin()
+phase("metadata")
+tool.init(Organizer())
+for method in ("name", "author", "displayName", "description", "version",
+               "isActive", "tooltip", "settings"):
+    getattr(tool, method)()
+phase("done")
+"""
+
+
+def run_child() -> list[str]:
+    result = subprocess.run(
+        [
+            sys.executable,
+            "-X",
+            "importtime",
+            "-c",
+            CHILD.format(root=str(ROOT), stubs=str(STUBS)),
+        ],
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        sys.stderr.write(result.stderr)
+        raise SystemExit(result.returncode)
+    return result.stderr.splitlines()
+
+
+def parse(lines: list[str]) -> dict[str, list[tuple[str, int, int]]]:
+    """
+    Groups `-X importtime` lines by phase as (module, self us, cumulative us).
+    """
+    phases = dict[str, list[tuple[str, int, int]]]()
+    current = None
+    for line in lines:
+        if line.startswith("phase: "):
+            current = line[len("phase: ") :]
+            phases[current] = []
+        elif current and line.startswith("import time:") and "|" in line:
+            own, cumulative, module = line[len("import time:") :].split("|")
+            if own.strip().isdigit():
+                phases[current].append(
+                    (module.rstrip(), int(own), int(cumulative))
+                )
+    return phases
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--budget-ms", type=float, default=20.0)
+    parser.add_argument("--top", type=int, default=15)
+    args = parser.parse_args()
+
+    phases = parse(run_child())
+    failed = False
+    total = 0
+    for phase in ("import", "createPlugin", "metadata"):
+        imports = phases.get(phase, [])
+        # Top level imports are the ones with the smallest indentation.
+        spent = sum(
+            cumulative
+            for module, _, cumulative in imports
+            if not module.startswith("   ")
+        )
+        total += spent
+        print(f"{phase}: {spent / 1000:.1f} ms, {len(imports)} modules")
+        for module, own, cumulative in sorted(
+            imports, key=lambda x: x[1], reverse=True
+        )[: args.top]:
+            print(f"    {own / 1000:8.2f} ms self {cumulative / 1000:8.2f} ms total  {module.strip()}")
+
+    loaded = {
+        module.strip()
+        for imports in phases.values()
+        for module, _, _ in imports
+    }
+    for module in DEFERRED:
+        if module in loaded:
+            print(f"FAIL: {module} is imported before display()")
+            failed = True
+
+    print(f"total: {total / 1000:.1f} ms (budget {args.budget_ms:.1f} ms)")
+    if total / 1000 > args.budget_ms:
+        print("FAIL: import time budget exceeded")
+        failed = True
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,140 @@
+# Created by GoriRed
+# Version: 1.2
+# License: CC-BY-NC
+# https://github.com/tkoopman/MO2-Batch-Plugin-Cleaner
+#
+# Benchmarks reading the load order from MO2's plugin list.
+#
+# Builds a stub plugin list that counts the calls made into it, then times
+# the per call access pattern Plugins.All used before against the single
+# pass load_order snapshot that replaced it.
+#
+# Usage: python tools/load_order_bench.py [--plugins 5000] [--repeat 5]
+
+import argparse
+import collections
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+STUBS = Path(__file__).resolve().parent / "stubs"
+sys.path[:0] = [str(ROOT), str(STUBS)]
+
+import mobase  # noqa: E402
+
+from mo2_batch_plugin_cleaner.load_order import load_order  # noqa: E402
+
+
+class PluginList(mobase.IPluginList):
+    """
+    Looks plugins up by name on every call like MO2 does, counting the calls.
+    """
+
+    def __init__(self, count: int) -> None:
+        self.calls = collections.Counter[str]()
+        self.__plugins = dict[str, tuple[str, int, mobase.PluginState, str, bool]]()
+        for i in range(count):
+            name = f"Plugin {i:05d}.esp"
+            state = (
+                mobase.PluginState.INACTIVE if i % 10 == 9 else mobase.PluginState.ACTIVE
+            )
+            self.__plugins[name.casefold()] = (
+                name,
+                count - i,
+                state,
+                f"Mod {i // 3}",
+                i % 7 == 0,
+            )
+
+    def __get(self, method: str, name: str):
+        self.calls[method] += 1
+        return self.__plugins[name.casefold()]
+
+    def pluginNames(self) -> list[str]:
+        self.calls["pluginNames"] += 1
+        return [p[0] for p in self.__plugins.values()]
+
+    def priority(self, name: str) -> int:
+        return self.__get("priority", name)[1]
+
+    def state(self, name: str) -> mobase.PluginState:
+        return self.__get("state", name)[2]
+
+    def origin(self, name: str) -> str:
+        return self.__get("origin", name)[3]
+
+    def hasNoRecords(self, name: str) -> bool:
+        return self.__get("hasNoRecords", name)[4]
+
+
+class Organizer(mobase.IOrganizer):
+    def __init__(self, plugin_list: PluginList) -> None:
+        self.plugin_list = plugin_list
+
+    def pluginList(self) -> PluginList:
+        self.plugin_list.calls["pluginList"] += 1
+        return self.plugin_list
+
+
+def per_call(organizer: Organizer, firstDynamic: str) -> list[tuple]:
+    # How Plugins.All read the plugin list before the snapshot.
+    plugin_list = organizer.pluginList()
+    plugins = [(name, plugin_list.priority(name)) for name in plugin_list.pluginNames()]
+    plugins.sort(key=lambda x: x[1])
+
+    rows = []
+    for plugin_name, _ in plugins:
+        if plugin_list.state(plugin_name) != mobase.PluginState.ACTIVE:
+            continue
+        origin = organizer.pluginList().origin(plugin_name)
+        hasNoRecords = plugin_list.hasNoRecords(plugin_name)
+        if plugin_name == firstDynamic:
+            plugin_list.priority(plugin_name)
+        priority = plugin_list.priority(plugin_name)
+        rows.append((plugin_name, priority, origin, hasNoRecords))
+    return rows
+
+
+def snapshot(organizer: Organizer, firstDynamic: str) -> list[tuple]:
+    order = load_order(organizer.pluginList())
+    return list(zip(order.names, order.priorities, order.origins, order.hasNoRecords))
+
+
+def measure(function, count: int, repeat: int) -> tuple[float, collections.Counter, list]:
+    best = float("inf")
+    for _ in range(repeat):
+        organizer = Organizer(PluginList(count))
+        start = time.perf_counter()
+        rows = function(organizer, "Plugin 00100.esp")
+        best = min(best, time.perf_counter() - start)
+    return best, organizer.plugin_list.calls, rows
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--plugins", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    before, before_calls, before_rows = measure(per_call, args.plugins, args.repeat)
+    after, after_calls, after_rows = measure(snapshot, args.plugins, args.repeat)
+    if before_rows != after_rows:
+        print("FAIL: the snapshot does not match the per call load order")
+        return 1
+
+    print(f"{args.plugins} plugins, {len(after_rows)} active")
+    for label, seconds, calls in (
+        ("per call", before, before_calls),
+        ("snapshot", after, after_calls),
+    ):
+        print(
+            f"{label}: {seconds * 1000:7.2f} ms, {sum(calls.values())} calls "
+            f"({', '.join(f'{k} {v}' for k, v in sorted(calls.items()))})"
+        )
+    print(f"speedup: {before / after:.1f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
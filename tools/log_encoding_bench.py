@@ -0,0 +1,129 @@
+# Created by GoriRed
+# Version: 1.2
+# License: CC-BY-NC
+# https://github.com/tkoopman/MO2-Batch-Plugin-Cleaner
+#
+# Benchmarks reading the LOOT Masterlist Entries from xEdit logs.
+#
+# Writes UTF-8, CP1252 and UTF-16 LE/BE (with and without BOM) log fixtures
+# to a temporary directory. For each one it checks the detected encoding and
+# the parsed entries, then times LootData.from_xEdit_log against the trial
+# decoding of the whole file that it replaced.
+#
+# Usage: python tools/log_encoding_bench.py [--lines 200000] [--repeat 5]
+
+import argparse
+import codecs
+import re
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+STUBS = Path(__file__).resolve().parent / "stubs"
+sys.path[:0] = [str(ROOT), str(STUBS)]
+
+from mo2_batch_plugin_cleaner.cleaning_data import LootData  # noqa: E402
+
+# (fixture name, codec, BOM, encoding read_log_tail should detect)
+FIXTURES = (
+    ("SSEEdit_log.txt", "utf-8", b"", "utf-8"),
+    ("SSEEdit_log_bom.txt", "utf-8", codecs.BOM_UTF8, "utf-8"),
+    ("SSEEdit_log_ansi.txt", "cp1252", b"", "cp1252"),
+    ("SSEEditException_le.log", "utf-16-le", codecs.BOM_UTF16_LE, "utf-16-le"),
+    ("SSEEditException_be.log", "utf-16-be", codecs.BOM_UTF16_BE, "utf-16-be"),
+    ("SSEEditException_le_nobom.log", "utf-16-le", b"", "utf-16-le"),
+    ("SSEEditException_be_nobom.log", "utf-16-be", b"", "utf-16-be"),
+)
+
+ENTRIES = 3
+
+
+def log_text(lines: int) -> str:
+    text = [
+        f"[00:{i % 60:02d}] Background Loader: [Requiem - Résumé.esp] "
+        f"processing record {i:08X}"
+        for i in range(lines)
+    ]
+    text.append("LOOT Masterlist Entries")
+    for i in range(ENTRIES):
+        text += [
+            f"  - name: 'Plugin {i} Élan.esp'",
+            "    dirty:",
+            "      - <<: *quickClean",
+            f"        crc: 0x{0x1000 + i:08X}",
+            "        util: '[SSEEdit v4.1.5](https://github.com/TES5Edit/TES5Edit)'",
+            f"        itm: {i + 1}",
+            f"        udr: {i}",
+        ]
+    text.append("[00:59] Done.")
+    return "\r\n".join(text) + "\r\n"
+
+
+def trial_decode(logFile: Path, encodings: list[str]) -> re.Match[str] | None:
+    # What from_xEdit_log did before: open and decode the whole file with
+    # each encoding until one works, then search all of it for the entries.
+    for encoding in encodings:
+        try:
+            with open(logFile, "r", encoding=encoding) as file:
+                text = file.read()
+            break
+        except UnicodeError:
+            continue
+    else:
+        return None
+    return re.search(r"LOOT Masterlist Entries[\r\n]+((?:  .*[\r\n]+)+)", text)
+
+
+def timed(function, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        function()
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--lines", type=int, default=200000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    text = log_text(args.lines)
+    failed = False
+    print(f"{'fixture':32} {'MB':>6} {'detected':>10} {'tail ms':>9} {'trial ms':>9}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for name, codec, bom, expected in FIXTURES:
+            logFile = Path(tmp) / name
+            logFile.write_bytes(bom + text.encode(codec))
+
+            tail = LootData.read_log_tail(logFile)
+            detected = tail[1] if tail else None
+            if detected == "utf-8":
+                try:
+                    tail[0].decode(detected)  # type: ignore
+                except UnicodeDecodeError:
+                    detected = "cp1252"
+            data = LootData.from_xEdit_log(logFile)
+            names = sorted(data) if data else []
+            expected_names = [f"plugin {i} élan.esp" for i in range(ENTRIES)]
+            if detected != expected or names != expected_names:
+                print(f"{name}: detected {detected}, read {names}")
+                failed = True
+                continue
+
+            if "exception" in name.lower():
+                encodings = ["utf-16", "utf-16-le", "utf-8", "cp1252", "latin1"]
+            else:
+                encodings = ["utf-8", "cp1252", "latin1", "utf-16", "utf-16-le"]
+            tail_ms = timed(lambda: LootData.from_xEdit_log(logFile), args.repeat)
+            trial_ms = timed(lambda: trial_decode(logFile, encodings), args.repeat)
+            print(
+                f"{name:32} {logFile.stat().st_size / 1e6:6.1f} {detected:>10} "
+                f"{tail_ms:9.2f} {trial_ms:9.2f}"
+            )
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,109 @@
+# Created by GoriRed
+# Version: 1.2
+# License: CC-BY-NC
+# https://github.com/tkoopman/MO2-Batch-Plugin-Cleaner
+#
+# Checks the direct parser of xEdit's LOOT Masterlist Entries against the
+# YAML loader it bypasses.
+#
+# For every log in tools/xedit_logs it reads the entries block the way
+# LootData.from_xEdit_log does, then parses it with parse_xEdit_entries and
+# with yaml_entries. Both must return the same plugins, CRCs and ITM, UDR
+# and NAV counts. Logs named fallback_* are laid out in ways xEdit does not
+# write, the direct parser must turn them down so YAML reads them.
+#
+# Usage: python tools/loot_entries_parity.py [--logs <dir>]
+
+import argparse
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+STUBS = Path(__file__).resolve().parent / "stubs"
+sys.path[:0] = [str(ROOT), str(STUBS)]
+
+from mo2_batch_plugin_cleaner.cleaning_data import (  # noqa: E402
+    LootData,
+    crc_cleaning_data,
+    source,
+)
+
+LOGS = Path(__file__).resolve().parent / "xedit_logs"
+
+# The plugins each log has entries for. Only the last block of a log is read.
+EXPECTED = {
+    "cp1252.log": ["légendes – élan ‘quoted’.esp"],
+    "fallback_double_quoted.log": ['double "quoted".esp'],
+    "fallback_flow.log": ["flow style.esp"],
+    "lf_only.log": ["unix line ends.esp"],
+    "quotes.log": [
+        "clean plugin.esp",
+        "immersive citizens - ai overhaul.esp",
+        "lanterns of skyrim ii's patch.esp",
+        "name: with # hash and colon.esp",
+        "résumé – ünicode ✓.esp",
+    ],
+    "two_sections.log": ["second run.esp"],
+    "utf16be_bom.log": ["exception big endian.esp"],
+    "utf16le_bom.log": ["exception ünicode.esp"],
+    "utf16le_nobom.log": ["exception no bom.esp"],
+}
+
+
+def plain(crc_data: crc_cleaning_data | None) -> dict | None:
+    if crc_data is None:
+        return None
+    return {
+        name: {
+            str(crc): (cd.itm, cd.udr, cd.nav, cd.source)
+            for crc, cd in sorted(crcs.items(), key=lambda item: int(item[0]))
+        }
+        for name, crcs in sorted(crc_data.items())
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--logs", type=Path, default=LOGS)
+    args = parser.parse_args()
+
+    failed = 0
+    logs = sorted(args.logs.glob("*.log"))
+    for log in logs:
+        entries = LootData.xEdit_entries(log)
+        if entries is None:
+            print(f"{log.name}: no LOOT Masterlist Entries found")
+            failed += 1
+            continue
+
+        direct = plain(LootData.parse_xEdit_entries(entries, source.USER))
+        loaded = plain(LootData.yaml_entries(entries, source.USER))
+        fallback = log.name.startswith("fallback_")
+        expected = EXPECTED.get(log.name)
+
+        problems = list[str]()
+        if loaded is None:
+            problems.append("YAML returned nothing")
+        elif expected is not None and sorted(loaded) != expected:
+            problems.append(f"YAML read {sorted(loaded)}, expected {expected}")
+        if fallback and direct is not None:
+            problems.append("the direct parser did not fall back")
+        elif not fallback and direct != loaded:
+            problems.append(f"direct {direct} != YAML {loaded}")
+        if plain(LootData.from_xEdit_log(log)) != loaded:
+            problems.append("from_xEdit_log differs from YAML")
+
+        if problems:
+            failed += 1
+            for problem in problems:
+                print(f"{log.name}: {problem}")
+        else:
+            how = "YAML fallback" if fallback else "identical"
+            print(f"{log.name}: {len(loaded or {})} plugins, {how}")
+
+    print(f"{len(logs)} logs, {failed} failed")
+    return 1 if failed or not logs else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
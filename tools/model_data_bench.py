@@ -0,0 +1,111 @@
+# Created by GoriRed
+# Version: 1.2
+# License: CC-BY-NC
+# https://github.com/tkoopman/MO2-Batch-Plugin-Cleaner
+#
+# Benchmarks the data() methods of the plugin selection and progress models.
+#
+# Fills both models with synthetic plugins and asks for every column and
+# role a view asks for when it paints, the way a repaint of the whole table
+# does. Needs PyQt6, runs with the offscreen Qt platform.
+#
+# Usage: python tools/model_data_bench.py [--plugins 5000] [--repeat 5]
+
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+STUBS = Path(__file__).resolve().parent / "stubs"
+sys.path[:0] = [str(ROOT), str(STUBS)]
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt6.QtCore import Qt  # noqa: E402
+from PyQt6.QtWidgets import QApplication  # noqa: E402
+
+from mo2_batch_plugin_cleaner.cleaning_data import (  # noqa: E402
+    cleaning_data,
+    crc32,
+    crc_cleaning_data,
+    source,
+)
+from mo2_batch_plugin_cleaner.plugin import (  # noqa: E402
+    Plugins,
+    plugin,
+    plugin_clean_state,
+    plugin_progress_model,
+    plugin_select_model,
+    plugin_type,
+)
+
+ROLES = (
+    Qt.ItemDataRole.DisplayRole,
+    Qt.ItemDataRole.CheckStateRole,
+    Qt.ItemDataRole.DecorationRole,
+    Qt.ItemDataRole.ToolTipRole,
+    Qt.ItemDataRole.FontRole,
+    Qt.ItemDataRole.TextAlignmentRole,
+    Qt.ItemDataRole.ForegroundRole,
+    Qt.ItemDataRole.BackgroundRole,
+)
+
+
+def synthetic(count: int) -> Plugins:
+    states = list(plugin_clean_state)
+    types = list(plugin_type)
+    rows = [
+        plugin(
+            name=f"Plugin {i:05d}.esp",
+            selected=i % 2 == 0,
+            priority=i,
+            type=types[i % len(types)],
+            origin=f"Mod {i // 3}",
+            state=states[i % len(states)],
+            hasNoRecords=i % 11 == 0,
+            crc=crc32(i),
+            cleaning_data=cleaning_data(i % 3, i % 2, 0, source.LOOT),
+            processed="Clean" if i % 5 == 0 else False,
+            ignore=i % 13 == 0,
+        )
+        for i in range(count)
+    ]
+    return Plugins(None, crc_cleaning_data(), rows, None, -1, True, True, True)
+
+
+def measure(model, repeat: int) -> float:
+    indexes = [
+        model.index(row, column)
+        for row in range(model.rowCount())
+        for column in range(model.columnCount())
+    ]
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for index in indexes:
+            for role in ROLES:
+                model.data(index, role)
+        best = min(best, time.perf_counter() - start)
+    return len(indexes) * len(ROLES) / best
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--plugins", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    app = QApplication(sys.argv[:1])  # noqa: F841 - icons need a GUI app
+    plugins = synthetic(args.plugins)
+    for name, model in (
+        ("plugin_select_model", plugin_select_model(plugins)),
+        ("plugin_progress_model", plugin_progress_model(plugins)),
+    ):
+        calls = measure(model, args.repeat)
+        print(f"{name}: {calls / 1000:8.0f}k data() calls/s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,137 @@
+# Created by GoriRed
+# Version: 1.2
+# License: CC-BY-NC
+# https://github.com/tkoopman/MO2-Batch-Plugin-Cleaner
+#
+# Benchmarks Plugins.All, reading the load order, cleaning data and plugin
+# files the selection window opens with, against a synthetic MO2 instance.
+#
+# Builds a tree of mods, plugins and a LOOT masterlist per size with
+# stubs/synthetic.py, kept between runs, then times Plugins.All with the
+# plugin files evicted from the page cache and with them cached. Evicting
+# the whole cache needs root, otherwise each file is dropped with
+# posix_fadvise, which only works on Linux. Needs PyQt6 to import the
+# plugin.
+#
+# With --stages it also prints how long each stage of the cold run took
+# and how long loading waited on it, as recorded in Plugins.load_times.
+#
+# Usage: python tools/plugins_all_bench.py [--sizes 100,1000,5000,20000]
+#            [--kb 16] [--dir <tree directory>] [--repeat 3] [--stages]
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+STUBS = Path(__file__).resolve().parent / "stubs"
+sys.path[:0] = [str(ROOT), str(STUBS)]
+
+import synthetic  # noqa: E402
+
+from mo2_batch_plugin_cleaner.plugin import Plugins  # noqa: E402
+from mo2_batch_plugin_cleaner.tool import CleanerPlugin  # noqa: E402
+
+
+def evict(root: Path) -> str:
+    """
+    Drops the files under root from the page cache and returns how.
+    """
+    os.sync()
+    try:
+        with open("/proc/sys/vm/drop_caches", "w") as file:
+            file.write("3\n")
+        return "drop_caches"
+    except OSError:
+        pass
+
+    if not hasattr(os, "posix_fadvise"):
+        return "none"
+    for directory, _, files in os.walk(root):
+        for name in files:
+            try:
+                fd = os.open(os.path.join(directory, name), os.O_RDONLY)
+            except OSError:
+                continue
+            try:
+                os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_DONTNEED)
+            finally:
+                os.close(fd)
+    return "fadvise"
+
+
+def measure(root: Path, count: int, kb: int, repeat: int) -> dict:
+    settings = {s.key: s.default_value for s in CleanerPlugin().settings()}
+    organizer = synthetic.build(root, count, kb, settings)
+    os.environ["LOCALAPPDATA"] = str(root / "AppData")
+
+    # Builds the masterlist index, which MO2 keeps between sessions.
+    plugins = Plugins.All(organizer)
+
+    method = evict(root)
+    start = time.perf_counter()
+    plugins = Plugins.All(organizer)
+    cold = time.perf_counter() - start
+    cold_times = dict(plugins.load_times)
+
+    warm = min(timed(lambda: Plugins.All(organizer)) for _ in range(max(1, repeat)))
+    return {
+        "plugins": count,
+        "active": len(plugins),
+        "cold": cold,
+        "warm": warm,
+        "evict": method,
+        "stages": cold_times,
+    }
+
+
+def timed(call) -> float:
+    start = time.perf_counter()
+    call()
+    return time.perf_counter() - start
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", default="100,1000,5000,20000")
+    parser.add_argument("--kb", type=int, default=16, help="size of each plugin")
+    parser.add_argument(
+        "--dir",
+        type=Path,
+        default=Path(tempfile.gettempdir()) / "plugins_all_bench",
+        help="where the synthetic trees are kept",
+    )
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument(
+        "--stages", action="store_true", help="print the cold run's stage times"
+    )
+    args = parser.parse_args()
+
+    print(
+        f"{'plugins':>8} {'active':>7} {'cold ms':>9} {'warm ms':>9} "
+        f"{'cold µs/plugin':>15} {'warm µs/plugin':>15}  evicted by"
+    )
+    for size in (int(s) for s in args.sizes.split(",")):
+        result = measure(args.dir / str(size), size, args.kb, args.repeat)
+        print(
+            f"{result['plugins']:>8} {result['active']:>7} "
+            f"{result['cold'] * 1000:>9.1f} {result['warm'] * 1000:>9.1f} "
+            f"{result['cold'] * 1e6 / size:>15.1f} "
+            f"{result['warm'] * 1e6 / size:>15.1f}  {result['evict']}"
+        )
+        if args.stages:
+            print(
+                "         "
+                + ", ".join(
+                    f"{stage} {seconds * 1000:.1f} ms"
+                    for stage, seconds in result["stages"].items()
+                )
+            )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
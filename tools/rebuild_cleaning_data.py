@@ -0,0 +1,61 @@
+# Created by GoriRed
+# Version: 1.2
+# License: CC-BY-NC
+# https://github.com/tkoopman/MO2-Batch-Plugin-Cleaner
+#
+# Rebuilds cleaning_data.csv from the xEdit logs kept by the plugin.
+#
+# Reads the LOOT entries of every loose and archived log in the plugin's
+# data folder with a pool of worker processes and merges them into the
+# cleaning data, newest log first. Run it with MO2 closed.
+#
+# Usage: python tools/rebuild_cleaning_data.py "<MO2>/plugins/data/Batch Plugin Cleaner"
+#            [--csv <file>] [--workers N] [--verbose]
+
+import argparse
+import logging
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+STUBS = Path(__file__).resolve().parent / "stubs"
+sys.path[:0] = [str(ROOT), str(STUBS)]
+
+from mo2_batch_plugin_cleaner.rebuild import rebuild  # noqa: E402
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("directory", type=Path)
+    parser.add_argument(
+        "--csv",
+        type=Path,
+        help="defaults to cleaning_data.csv next to the directory",
+    )
+    parser.add_argument("--workers", type=int, help="defaults to the CPU count")
+    parser.add_argument(
+        "--verbose", action="store_true", help="show errors reading the logs"
+    )
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.ERROR if args.verbose else logging.CRITICAL)
+
+    if not args.directory.is_dir():
+        print(f'"{args.directory}" is not a directory')
+        return 1
+
+    csv_file = args.csv or args.directory.parent / "cleaning_data.csv"
+    stats = rebuild(args.directory, csv_file, args.workers)
+    print(
+        f"{stats['logs']} logs ({stats['failed']} without LOOT entries) in "
+        f"{stats['seconds']:.2f} s, {stats['logs_per_second']:.0f} logs/s"
+    )
+    print(
+        f"{stats['entries']} entries, {stats['duplicates']} duplicates: "
+        f"{stats['added']} added, {stats['updated']} updated, "
+        f"{stats['unchanged']} unchanged in {csv_file}"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
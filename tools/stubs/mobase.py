@@ -0,0 +1,80 @@
+# Created by GoriRed
+# Version: 1.2
+# License: CC-BY-NC
+# https://github.com/tkoopman/MO2-Batch-Plugin-Cleaner
+#
+# Pure Python stand-in for the parts of MO2's mobase module used by
+# mo2_batch_plugin_cleaner, so it can be imported and measured outside MO2.
+# The interfaces are empty, synthetic.py implements them over a generated
+# mod directory tree.
+
+import enum
+import typing
+
+INVALID_HANDLE_VALUE = -1
+
+
+class ReleaseType(enum.Enum):
+    PRE_ALPHA = enum.auto()
+    ALPHA = enum.auto()
+    BETA = enum.auto()
+    CANDIDATE = enum.auto()
+    FINAL = enum.auto()
+
+
+class PluginState(enum.IntEnum):
+    MISSING = 0
+    INACTIVE = 1
+    ACTIVE = 2
+
+
+class VersionInfo:
+    def __init__(
+        self,
+        major: int = 0,
+        minor: int = 0,
+        subminor: int = 0,
+        release_type: ReleaseType = ReleaseType.FINAL,
+    ) -> None:
+        self.major = major
+        self.minor = minor
+        self.subminor = subminor
+        self.release_type = release_type
+
+    def __str__(self) -> str:
+        return f"{self.major}.{self.minor}.{self.subminor}"
+
+
+class PluginSetting:
+    def __init__(self, key: str, description: str, default_value: typing.Any):
+        self.key = key
+        self.description = description
+        self.default_value = default_value
+
+
+class IOrganizer:
+    pass
+
+
+class IPluginList:
+    pass
+
+
+class IModList:
+    pass
+
+
+class IModInterface:
+    pass
+
+
+class IPluginGame:
+    pass
+
+
+class IPluginTool:
+    def __init__(self) -> None:
+        pass
+
+    def _parentWidget(self) -> None:
+        return None
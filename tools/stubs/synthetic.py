@@ -0,0 +1,333 @@
+# Created by GoriRed
+# Version: 1.2
+# License: CC-BY-NC
+# https://github.com/tkoopman/MO2-Batch-Plugin-Cleaner
+#
+# A stand-in MO2 instance for mo2_batch_plugin_cleaner, over a generated
+# tree of mods, plugins and a LOOT masterlist, so the tool can be run and
+# profiled without MO2 or Windows.
+#
+# build() writes the tree once and reuses it while its parameters are the
+# same, then returns an Organizer implementing the parts of mobase's
+# IOrganizer, IPluginList, IModList and IPluginGame the tool uses.
+
+import binascii
+import json
+import os
+import random
+import typing
+from pathlib import Path
+
+import mobase
+
+GAME = "SkyrimSE"
+LOOT_FOLDER = "Skyrim Special Edition"
+PRIMARY = ["Skyrim.esm", "Update.esm"]
+DLC = ["Dawnguard.esm", "HearthFires.esm", "Dragonborn.esm"]
+CC = ["ccBGSSSE001-Fish.esm", "ccQDRSSE001-SurvivalMode.esl"]
+
+
+class Directory:
+    """
+    The part of QDir the tool uses.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.__path = path
+
+    def absolutePath(self) -> str:
+        return str(self.__path.absolute())
+
+    def path(self) -> str:
+        return str(self.__path)
+
+
+class Game(mobase.IPluginGame):
+    def __init__(self, root: Path) -> None:
+        self.root = root
+
+    def gameShortName(self) -> str:
+        return GAME
+
+    def dataDirectory(self) -> Directory:
+        return Directory(self.root / "game" / "Data")
+
+    def documentsDirectory(self) -> Directory:
+        return Directory(self.root / "documents")
+
+    def iniFiles(self) -> list[str]:
+        return ["Skyrim.ini", "SkyrimPrefs.ini"]
+
+    def primaryPlugins(self) -> list[str]:
+        return list(PRIMARY)
+
+    def DLCPlugins(self) -> list[str]:
+        return list(DLC)
+
+    def CCPlugins(self) -> list[str]:
+        return list(CC)
+
+
+class Mod(mobase.IModInterface):
+    def __init__(self, name: str, path: Path) -> None:
+        self.__name = name
+        self.__path = path
+
+    def name(self) -> str:
+        return self.__name
+
+    def absolutePath(self) -> str:
+        return str(self.__path.absolute())
+
+
+class ModList(mobase.IModList):
+    def __init__(self, root: Path, mods: list[str]) -> None:
+        self.root = root
+        self.mods = mods
+        self.installed = list[typing.Callable[[Mod], None]]()
+        self.removed = list[typing.Callable[[str], None]]()
+
+    def allMods(self) -> list[str]:
+        return list(self.mods)
+
+    def getMod(self, name: str) -> Mod:
+        return Mod(name, self.root / "mods" / name)
+
+    def onModInstalled(self, callback: typing.Callable[[Mod], None]) -> bool:
+        self.installed.append(callback)
+        return True
+
+    def onModRemoved(self, callback: typing.Callable[[str], None]) -> bool:
+        self.removed.append(callback)
+        return True
+
+
+class PluginList(mobase.IPluginList):
+    """
+    Looks every plugin up by name, as MO2 does on each call.
+    """
+
+    def __init__(self) -> None:
+        # casefolded name -> [name, priority, state, origin, hasNoRecords]
+        self.plugins = dict[str, list[typing.Any]]()
+        self.refreshed = list[typing.Callable[[], None]]()
+        self.moved = list[typing.Callable[[str, int, int], None]]()
+        self.stateChanged = list[
+            typing.Callable[[dict[str, mobase.PluginState]], None]
+        ]()
+
+    def add(
+        self,
+        name: str,
+        origin: str,
+        state: mobase.PluginState = mobase.PluginState.ACTIVE,
+        hasNoRecords: bool = False,
+    ) -> None:
+        self.plugins[name.casefold()] = [
+            name,
+            len(self.plugins),
+            state,
+            origin,
+            hasNoRecords,
+        ]
+
+    def pluginNames(self) -> list[str]:
+        return [plugin[0] for plugin in self.plugins.values()]
+
+    def priority(self, name: str) -> int:
+        return self.plugins[name.casefold()][1]
+
+    def state(self, name: str) -> mobase.PluginState:
+        plugin = self.plugins.get(name.casefold())
+        return plugin[2] if plugin else mobase.PluginState.MISSING
+
+    def origin(self, name: str) -> str:
+        return self.plugins[name.casefold()][3]
+
+    def hasNoRecords(self, name: str) -> bool:
+        return self.plugins[name.casefold()][4]
+
+    def masters(self, name: str) -> list[str]:
+        # Every plugin needs Skyrim.esm, the DLC and mods Update.esm too, and
+        # every third mod plugin Dawnguard.esm.
+        if name == PRIMARY[0]:
+            return []
+        if name == PRIMARY[1] or name in CC:
+            return PRIMARY[:1]
+        if name in DLC:
+            return list(PRIMARY)
+        number = "".join(c for c in name if c.isdigit())
+        if number and int(number) % 3 == 0:
+            return PRIMARY + DLC[:1]
+        return list(PRIMARY)
+
+    def isLightFlagged(self, name: str) -> bool:
+        return name.lower().endswith(".esl")
+
+    def onRefreshed(self, callback: typing.Callable[[], None]) -> bool:
+        self.refreshed.append(callback)
+        return True
+
+    def onPluginMoved(self, callback: typing.Callable[[str, int, int], None]) -> bool:
+        self.moved.append(callback)
+        return True
+
+    def onPluginStateChanged(
+        self, callback: typing.Callable[[dict[str, mobase.PluginState]], None]
+    ) -> bool:
+        self.stateChanged.append(callback)
+        return True
+
+
+class Organizer(mobase.IOrganizer):
+    def __init__(
+        self, root: Path, mods: list[str], settings: dict[str, typing.Any]
+    ) -> None:
+        self.root = root
+        self.game = Game(root)
+        self.plugin_list = PluginList()
+        self.mod_list = ModList(root, mods)
+        self.settings = dict(settings)
+
+    def managedGame(self) -> Game:
+        return self.game
+
+    def pluginList(self) -> PluginList:
+        return self.plugin_list
+
+    def modList(self) -> ModList:
+        return self.mod_list
+
+    def overwritePath(self) -> str:
+        return str(self.root / "overwrite")
+
+    def pluginDataPath(self) -> str:
+        return str(self.root / "plugins" / "data")
+
+    def getPluginDataPath(self) -> str:
+        return self.pluginDataPath()
+
+    def pluginSetting(self, plugin: str, key: str) -> typing.Any:
+        return self.settings.get(key)
+
+    def setPluginSetting(self, plugin: str, key: str, value: typing.Any) -> None:
+        self.settings[key] = value
+
+    def startApplication(self, executable: str, args: list[str]) -> int:
+        # There is no xEdit to run.
+        return mobase.INVALID_HANDLE_VALUE
+
+    def waitForApplication(self, handle: int, refresh: bool = True) -> tuple[bool, int]:
+        return False, -1
+
+
+def build(
+    root: str | Path,
+    plugins: int,
+    plugin_kb: int = 16,
+    settings: dict[str, typing.Any] | None = None,
+    seed: int = 0,
+) -> Organizer:
+    """
+    Returns an Organizer over a tree of plugins in root, writing the tree
+    first unless it was already written with the same parameters.
+
+    Every tenth plugin is inactive and every fiftieth has no records. Every
+    seventh is listed as dirty in the masterlist with its real CRC, and
+    every thirteenth as clean. Mods hold one to three plugins and a few
+    come from the data and overwrite directories. Point the LOCALAPPDATA
+    environment variable at root / "AppData" so the tool finds the
+    masterlist.
+    """
+    root = Path(root).absolute()
+    params = {"plugins": plugins, "plugin_kb": plugin_kb, "seed": seed}
+    manifest = root / "synthetic.json"
+    try:
+        with open(manifest, "r", encoding="utf-8") as file:
+            layout = json.load(file)
+        if layout["params"] != params:
+            layout = None
+    except (OSError, ValueError, KeyError):
+        layout = None
+
+    if layout is None:
+        layout = write_tree(root, plugins, plugin_kb, seed)
+        layout["params"] = params
+        with open(manifest, "w", encoding="utf-8") as file:
+            json.dump(layout, file)
+
+    organizer = Organizer(root, layout["mods"], settings or {})
+    for name, origin, state, hasNoRecords in layout["plugins"]:
+        organizer.plugin_list.add(
+            name, origin, mobase.PluginState(state), hasNoRecords
+        )
+    return organizer
+
+
+def write_tree(root: Path, plugins: int, plugin_kb: int, seed: int) -> dict:
+    rng = random.Random(seed)
+    data = root / "game" / "Data"
+    for directory in (data, root / "overwrite", root / "documents", root / "mods"):
+        os.makedirs(directory, exist_ok=True)
+
+    layout = {"mods": list[str](), "plugins": list[list]()}
+    masterlist = list[str]()
+
+    def write(directory: Path, name: str) -> int:
+        content = rng.randbytes(plugin_kb * 1024)
+        with open(directory / name, "wb") as file:
+            file.write(content)
+        return binascii.crc32(content)
+
+    def add(name: str, origin: str, directory: Path, i: int) -> None:
+        crc = write(directory, name)
+        state = mobase.PluginState.INACTIVE if i % 10 == 9 else mobase.PluginState.ACTIVE
+        layout["plugins"].append([name, origin, int(state), i % 50 == 49])
+        if i % 7 == 0:
+            masterlist.append(
+                f"  - name: '{name}'\n"
+                f"    dirty:\n"
+                f"      - crc: 0x{crc:08X}\n"
+                f"        util: 'SSEEdit v4.1.5'\n"
+                f"        itm: {rng.randint(1, 200)}\n"
+                f"        udr: {rng.randint(0, 20)}\n"
+            )
+        elif i % 13 == 0:
+            masterlist.append(
+                f"  - name: '{name}'\n"
+                f"    clean:\n"
+                f"      - crc: 0x{crc:08X}\n"
+                f"        util: 'SSEEdit v4.1.5'\n"
+            )
+
+    i = 0
+    for name in PRIMARY + DLC + CC:
+        if i < plugins:
+            add(name, "data", data, i)
+            i += 1
+
+    mod = 0
+    while i < plugins:
+        if i % 97 == 0:
+            add(f"Overwrite {i:05d}.esp", "overwrite", root / "overwrite", i)
+            i += 1
+            continue
+
+        name = f"Mod {mod:05d}"
+        directory = root / "mods" / name
+        os.makedirs(directory, exist_ok=True)
+        # Mods also hold other files next to their plugins.
+        (directory / "meta.ini").write_text("[General]\n")
+        os.makedirs(directory / "meshes", exist_ok=True)
+        layout["mods"].append(name)
+        for _ in range(min(rng.randint(1, 3), plugins - i)):
+            add(f"Plugin {i:05d}.esp", name, directory, i)
+            i += 1
+        mod += 1
+
+    loot = root / "AppData" / "LOOT" / "games" / LOOT_FOLDER
+    os.makedirs(loot, exist_ok=True)
+    with open(loot / "masterlist.yaml", "w", encoding="utf-8") as file:
+        file.write("bash_tags: []\nglobals: []\nplugins:\n")
+        file.writelines(masterlist)
+    return layout
@@ -0,0 +1,224 @@
+# Created by GoriRed
+# Version: 1.2
+# License: CC-BY-NC
+# https://github.com/tkoopman/MO2-Batch-Plugin-Cleaner
+#
+# Checks that cleaning plugins in xEdit sessions run by the batch script
+# gives the same results as cleaning each with -QuickAutoClean.
+#
+# Copies the plugins into two work folders, linking their masters, and
+# cleans one copy of each plugin on its own with -QuickAutoClean and the
+# other grouped the way the xedit_batch_size setting groups them. Then
+# compares the ITM, UDR and deleted navmesh counts logged and the CRCs of
+# the cleaned plugins. Needs a real xEdit, run it outside MO2 on plugins
+# from a Data folder the game reads. The Data folder is not changed.
+#
+# Usage: python tools/xedit_batch_parity.py --xedit <SSEEdit.exe> --game SkyrimSE
+#            --data <Data> [--batch-size 4] [--work <dir>] [--timeout 600]
+#            <plugin> [<plugin> ...]
+
+import argparse
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+STUBS = Path(__file__).resolve().parent / "stubs"
+sys.path[:0] = [str(ROOT), str(STUBS)]
+
+from mo2_batch_plugin_cleaner import xedit_batch  # noqa: E402
+from mo2_batch_plugin_cleaner.cleaning_data import LootData, crc32  # noqa: E402
+from mo2_batch_plugin_cleaner.tool import gameInfo  # noqa: E402
+
+# The arguments the plugin starts xEdit with, see plugin.launchOptions.
+ARGS = ["-IKnowWhatImDoing", "-autoexit", "-autoload"]
+
+
+def load_order(data: Path, game: str, plugins: list[str]) -> list[str]:
+    """
+    Returns the plugins and all their masters, each after its masters.
+    """
+    order = list[str]()
+    seen = set[str]()
+
+    def visit(name: str) -> None:
+        if name.casefold() in seen:
+            return
+        seen.add(name.casefold())
+        masters = xedit_batch.plugin_masters(data / name, game)
+        if masters is None:
+            raise SystemExit(f'"{data / name}" is not a plugin')
+        for master in masters:
+            visit(master)
+        order.append(name)
+
+    for name in plugins:
+        visit(name)
+    return order
+
+
+def prepare(data: Path, work: Path, order: list[str], plugins: list[str]) -> None:
+    """
+    Copies the plugins to clean into work and links their masters, or copies
+    them where links can't be made.
+    """
+    work.mkdir(parents=True)
+    cleaned = {name.casefold() for name in plugins}
+    for name in order:
+        if name.casefold() not in cleaned:
+            try:
+                os.link(data / name, work / name)
+                continue
+            except OSError:
+                pass
+        shutil.copy2(data / name, work / name)
+
+
+def run(args: list[str], timeout: int) -> int:
+    print(" ".join(args))
+    try:
+        return subprocess.run(args, timeout=timeout).returncode
+    except subprocess.TimeoutExpired:
+        print(f"xEdit did not exit within {timeout} seconds")
+        return -1
+
+
+def result(
+    work: Path, name: str, crc: crc32, logFile: Path, batch: bool
+) -> tuple[int, int, int, crc32] | None:
+    """
+    Returns the ITM, UDR and NAV counts logged for a plugin and the CRC of
+    the cleaned plugin, or None if nothing was logged for it.
+    """
+    cleaned = crc32.from_file(work / name)
+    logged = LootData.from_xEdit_log(logFile)
+    if not logged or name not in logged or crc not in logged[name]:
+        return None
+    data = logged[name][crc]
+    if batch and data.is_auto_cleanable() and cleaned != crc:
+        # As the plugin does after a session, see xedit_batch.complete_log().
+        xedit_batch.complete_log(logFile, cleaned, data.nav)
+    return data.itm, data.udr, data.nav, cleaned
+
+
+def clean_single(xedit: str, game: str, work: Path, name: str, timeout: int) -> Path:
+    logFile = work / f"{name}.log"
+    plugins = work / f"{name}.txt"
+    masters = load_order(work, game, [name])[:-1]
+    plugins.write_text(xedit_batch.plugins_txt(game, masters, [name]), "utf-8")
+    run(
+        [
+            xedit,
+            *ARGS,
+            "-QuickAutoClean",
+            gameInfo[game]["xEditSwitch"],
+            f"-D:{work}",
+            f"-P:{plugins}",
+            f"-R:{logFile}",
+            name,
+        ],
+        timeout,
+    )
+    return logFile
+
+
+def clean_batch(
+    xedit: str,
+    game: str,
+    work: Path,
+    group: list[str],
+    crcs: dict[str, crc32],
+    timeout: int,
+) -> None:
+    stem = work / f"batch_{group[0]}"
+    script = Path(f"{stem}.pas")
+    plugins = Path(f"{stem}.txt")
+    masters = [
+        name
+        for name in load_order(work, game, group)
+        if name.casefold() not in {member.casefold() for member in group}
+    ]
+    script.write_text(
+        xedit_batch.script(
+            [(name, crcs[name], str(work / f"{name}.log")) for name in group]
+        ),
+        "utf-8-sig",
+    )
+    plugins.write_text(xedit_batch.plugins_txt(game, masters, group), "utf-8")
+    exitCode = run(
+        [
+            xedit,
+            *ARGS,
+            gameInfo[game]["xEditSwitch"],
+            f"-D:{work}",
+            f"-script:{script}",
+            f"-P:{plugins}",
+            f"-R:{stem}.log",
+        ],
+        timeout,
+    )
+    if exitCode:
+        print(f"xEdit session cleaning {', '.join(group)} exited with {exitCode}")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--xedit", required=True)
+    parser.add_argument("--game", required=True, choices=sorted(gameInfo))
+    parser.add_argument("--data", required=True, type=Path)
+    parser.add_argument("--batch-size", type=int, default=4)
+    parser.add_argument("--work", type=Path)
+    parser.add_argument("--timeout", type=int, default=600)
+    parser.add_argument("plugins", nargs="+")
+    args = parser.parse_args()
+
+    game = args.game
+    order = load_order(args.data, game, args.plugins)
+    crcs = {name: crc32.from_file(args.data / name) for name in args.plugins}
+    work = Path(tempfile.mkdtemp(prefix="xedit_batch_parity_", dir=args.work))
+    print(f'Working in "{work}"')
+
+    single = work / "single"
+    prepare(args.data, single, order, args.plugins)
+    for name in args.plugins:
+        clean_single(args.xedit, game, single, name, args.timeout)
+
+    batch = work / "batch"
+    prepare(args.data, batch, order, args.plugins)
+    candidates = [
+        (name, xedit_batch.plugin_masters(batch / name, game) or [])
+        for name in args.plugins
+    ]
+    masters = dict(candidates)
+    groups = xedit_batch.group_by_masters(
+        candidates,
+        args.batch_size,
+        lambda name: xedit_batch.plugin_overrides(batch / name, game, masters[name]),
+    )
+    for group in groups:
+        if len(group) == 1:
+            clean_single(args.xedit, game, batch, group[0], args.timeout)
+        else:
+            clean_batch(args.xedit, game, batch, group, crcs, args.timeout)
+    print(f"{len(groups)} groups: {[group for group in groups if len(group) > 1]}")
+
+    failed = 0
+    for name in args.plugins:
+        expected = result(single, name, crcs[name], single / f"{name}.log", False)
+        actual = result(batch, name, crcs[name], batch / f"{name}.log", True)
+        if expected is None or actual != expected:
+            failed += 1
+            print(f"{name}: single {expected}, batch {actual}")
+        else:
+            itm, udr, nav, cleaned = expected
+            print(f"{name}: ITM {itm} UDR {udr} NAV {nav} CRC {cleaned}, identical")
+
+    print(f"{len(args.plugins)} plugins, {failed} differ")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,123 @@
+# Created by GoriRed
+# Version: 1.2
+# License: CC-BY-NC
+# https://github.com/tkoopman/MO2-Batch-Plugin-Cleaner
+#
+# Benchmarks loading a LOOT masterlist with and without YAML marks.
+#
+# Loads the masterlist the way LootData does, from a memory-mapped file,
+# with BaseLoader, which creates a Mark for the start and end of every
+# token, event and node, and with MarklessBaseLoader, which creates none.
+# Reports the best wall time of the runs, then the peak memory traced by
+# tracemalloc and the Marks created in one more run of each, as tracing
+# slows the load down. Without --masterlist a synthetic one is written.
+#
+# Usage: python tools/yaml_marks_bench.py [--masterlist <file>] [--entries 20000]
+#            [--repeat 3]
+
+import argparse
+import mmap
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any
+
+ROOT = Path(__file__).resolve().parent.parent
+STUBS = Path(__file__).resolve().parent / "stubs"
+sys.path[:0] = [str(ROOT / "mo2_batch_plugin_cleaner" / "lib"), str(ROOT), str(STUBS)]
+
+import yaml  # noqa: E402
+import yaml.error  # noqa: E402
+from yaml.loader import BaseLoader, MarklessBaseLoader  # noqa: E402
+
+LOADERS = (("BaseLoader", BaseLoader), ("MarklessBaseLoader", MarklessBaseLoader))
+
+
+def write_masterlist(filename: Path, entries: int) -> None:
+    with open(filename, "w", encoding="utf-8") as file:
+        file.write(
+            "prelude:\n  common:\n    - &quickClean\n"
+            "      util: '[SSEEdit v4.1.5](https://github.com/TES5Edit/TES5Edit)'\n"
+            "bash_tags: []\nglobals: []\nplugins:\n"
+        )
+        for i in range(entries):
+            file.write(
+                f"  - name: 'Plugin {i:05d}.esp'\n"
+                f"    url: [ 'https://www.nexusmods.com/skyrimspecialedition/mods/{i}/' ]\n"
+                f"    tag: [ Delev, Relev, -Names ]\n"
+                f"    dirty:\n"
+                f"      - <<: *quickClean\n"
+                f"        crc: 0x{i * 2654435761 % 2**32:08X}\n"
+                f"        itm: {i % 200}\n"
+                f"        udr: {i % 20}\n"
+            )
+
+
+def load(filename: Path, loader: Any) -> Any:
+    with open(filename, "rb") as file, mmap.mmap(
+        file.fileno(), 0, access=mmap.ACCESS_READ
+    ) as data:
+        return yaml.load(data, Loader=loader)
+
+
+def count_marks(filename: Path, loader: Any) -> int:
+    count = 0
+    init = yaml.error.Mark.__init__
+
+    def counted(self: Any, *args: Any) -> None:
+        nonlocal count
+        count += 1
+        init(self, *args)
+
+    yaml.error.Mark.__init__ = counted  # type: ignore
+    try:
+        load(filename, loader)
+    finally:
+        yaml.error.Mark.__init__ = init  # type: ignore
+    return count
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--masterlist", type=Path)
+    parser.add_argument("--entries", type=int, default=20000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        filename = args.masterlist
+        if filename is None:
+            filename = Path(tmp) / "masterlist.yaml"
+            write_masterlist(filename, args.entries)
+        print(f'"{filename}": {filename.stat().st_size / 1e6:.1f} MB')
+
+        results = []
+        for name, loader in LOADERS:
+            times = []
+            for _ in range(args.repeat):
+                start = time.perf_counter()
+                data = load(filename, loader)
+                times.append(time.perf_counter() - start)
+            results.append(data)
+
+            tracemalloc.start()
+            load(filename, loader)
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+
+            marks = count_marks(filename, loader)
+            print(
+                f"{name:20} {min(times):7.2f} s  peak {peak / 1e6:7.1f} MB  "
+                f"{marks:9} marks"
+            )
+
+    if results[0] != results[1]:
+        print("The loaders returned different data")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
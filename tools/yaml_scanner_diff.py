@@ -0,0 +1,216 @@
+# Created by GoriRed
+# Version: 1.2
+# License: CC-BY-NC
+# https://github.com/tkoopman/MO2-Batch-Plugin-Cleaner
+#
+# Checks the regex fast paths in the bundled YAML scanner against the
+# character by character scanner they replaced.
+#
+# Every document in tools/yaml_corpus, plus a few generated ones, is read as
+# str, bytes (UTF-8, UTF-8 with BOM, UTF-16 LE/BE), a memory-mapped file and
+# streams returning 1 to 1000 characters or bytes per read. For each it
+# compares the tokens and events, with their values, styles and marks, and
+# any error raised. The reference scanner is the same scanner with
+# Reader.match_run always matching nothing, which leaves only the original
+# loops, and Reader.forward_run being Reader.forward.
+#
+# Usage: python tools/yaml_scanner_diff.py [--corpus <dir>] [--masterlist N]
+
+import argparse
+import codecs
+import io
+import mmap
+import sys
+import tempfile
+from pathlib import Path
+from typing import Any, Callable
+
+ROOT = Path(__file__).resolve().parent.parent
+STUBS = Path(__file__).resolve().parent / "stubs"
+sys.path[:0] = [str(ROOT / "mo2_batch_plugin_cleaner" / "lib"), str(ROOT), str(STUBS)]
+
+import yaml  # noqa: E402
+from yaml.loader import BaseLoader  # noqa: E402
+from yaml.reader import Reader  # noqa: E402
+
+CORPUS = Path(__file__).resolve().parent / "yaml_corpus"
+CHUNKS = (1, 2, 3, 7, 64, 1000)
+
+
+class ReferenceLoader(BaseLoader):
+    """
+    BaseLoader without the fast paths.
+    """
+
+    def match_run(self, pattern: Any) -> int:
+        return 0
+
+    def forward_run(self, length: int) -> None:
+        Reader.forward(self, length)
+
+
+class chunked:
+    """
+    A stream returning at most size characters or bytes per read, so runs
+    end at the end of a partially filled buffer.
+    """
+
+    def __init__(self, data: str | bytes, size: int) -> None:
+        self.stream = io.StringIO(data) if isinstance(data, str) else io.BytesIO(data)
+        self.size = size
+        self.name = f"<chunked {size}>"
+
+    def read(self, size: int = -1) -> str | bytes:
+        return self.stream.read(min(size, self.size) if size >= 0 else self.size)
+
+
+def mark(value: Any) -> Any:
+    if value is None:
+        return None
+    return (value.index, value.line, value.column)
+
+
+def describe(item: Any) -> tuple:
+    fields = []
+    for cls in type(item).__mro__:
+        for name in getattr(cls, "__slots__", ()):
+            if name in ("start_mark", "end_mark"):
+                continue
+            value = getattr(item, name, None)
+            fields.append((name, repr(value)))
+    return (
+        type(item).__name__,
+        tuple(sorted(fields)),
+        mark(getattr(item, "start_mark", None)),
+        mark(getattr(item, "end_mark", None)),
+    )
+
+
+def stream_of(loader: type, stream: Any, events: bool) -> list[tuple]:
+    result = list[tuple]()
+    instance = loader(stream)
+    try:
+        if events:
+            while instance.check_event():
+                result.append(describe(instance.get_event()))
+        else:
+            while instance.check_token():
+                result.append(describe(instance.get_token()))
+    except yaml.YAMLError as e:
+        result.append(("error", type(e).__name__, str(e)))
+    finally:
+        instance.dispose()
+    return result
+
+
+def inputs(text: str, tmp: Path) -> list[tuple[str, Callable[[], Any]]]:
+    """
+    Returns the ways the document is read, each with a function returning a
+    new stream of it.
+    """
+    utf8 = text.encode("utf-8")
+    result: list[tuple[str, Callable[[], Any]]] = [
+        ("str", lambda: text),
+        ("utf-8", lambda: utf8),
+        ("utf-8 BOM", lambda: codecs.BOM_UTF8 + utf8),
+        ("utf-16-le", lambda: codecs.BOM_UTF16_LE + text.encode("utf-16-le")),
+        ("utf-16-be", lambda: codecs.BOM_UTF16_BE + text.encode("utf-16-be")),
+    ]
+    for size in CHUNKS:
+        result.append((f"str/{size}", lambda size=size: chunked(text, size)))
+        result.append((f"utf-8/{size}", lambda size=size: chunked(utf8, size)))
+
+    if utf8:
+        # mmap can't map an empty file.
+        mapped = tmp / f"{abs(hash(text))}.yaml"
+        mapped.write_bytes(utf8)
+
+        def open_mapped() -> mmap.mmap:
+            with open(mapped, "rb") as file:
+                return mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        result.append(("mmap", open_mapped))
+    return result
+
+
+def generated(masterlist: int) -> list[tuple[str, str]]:
+    long_plain = "x" * 5000
+    long_quoted = "it''s " * 1000
+    documents = [
+        ("empty", ""),
+        ("no trailing newline", "key: value"),
+        ("long plain", f"key: {long_plain} {long_plain}\n"),
+        ("long quoted", f"key: '{long_quoted}'\n"),
+        ("long comment", f"# {long_plain}\nkey: value # {long_plain}\n"),
+        ("CRLF", "a: 1\r\nb:\r\n  - 'x\r\n    y'\r\n  - z\r\n"),
+        ("NEL and LS", "a: one\x85b: two\u2028c: 'x\u2029y'\n"),
+        ("BOM inside", "a: x\ufeffy\nb: 'q\ufeffr'\n"),
+        ("colons", "a:b: c\n'k': v:w\n? x:\n: [a:, :b, ::]\n"),
+    ]
+    if masterlist:
+        entries = ["plugins:\n"]
+        for i in range(masterlist):
+            entries.append(
+                f"  - name: 'Plugin {i:05} Résumé.esp'\n"
+                f"    dirty:\n"
+                f"      - <<: *quickClean\n"
+                f"        crc: 0x{i * 2654435761 % 2**32:08X}\n"
+                f"        itm: {i % 17}\n"
+                f"        udr: {i % 5}\n"
+                f"    msg: [ {{ type: say, content: \"Plugin {i}: \\\"see\\\" the page\" }} ]\n"
+            )
+        prelude = "prelude:\n  common:\n    - &quickClean\n      util: 'SSEEdit'\n"
+        documents.append((f"masterlist of {masterlist}", prelude + "".join(entries)))
+    return documents
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--corpus", type=Path, default=CORPUS)
+    parser.add_argument(
+        "--masterlist",
+        type=int,
+        default=200,
+        help="entries in the generated masterlist, 0 to skip it",
+    )
+    args = parser.parse_args()
+
+    documents = [
+        (path.name, path.read_text(encoding="utf-8"))
+        for path in sorted(args.corpus.glob("*.yaml"))
+    ]
+    documents += generated(args.masterlist)
+
+    failed = 0
+    compared = 0
+    with tempfile.TemporaryDirectory() as tmp:
+        for name, text in documents:
+            tokens = stream_of(ReferenceLoader, text, False)
+            events = stream_of(ReferenceLoader, text, True)
+            for how, stream in inputs(text, Path(tmp)):
+                for as_events in (False, True):
+                    compared += 1
+                    actual = stream_of(BaseLoader, stream(), as_events)
+                    reference = stream_of(ReferenceLoader, stream(), as_events)
+                    kind = "events" if as_events else "tokens"
+                    if actual != reference:
+                        failed += 1
+                        first = next(
+                            (
+                                i
+                                for i, (a, r) in enumerate(zip(actual, reference))
+                                if a != r
+                            ),
+                            min(len(actual), len(reference)),
+                        )
+                        print(f"{name} ({how}): {kind} differ at {first}")
+                        print(f"  fast:      {actual[first : first + 1]}")
+                        print(f"  reference: {reference[first : first + 1]}")
+            print(f"{name}: {len(tokens)} tokens, {len(events)} events")
+
+    print(f"{compared} streams compared, {failed} differ")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())